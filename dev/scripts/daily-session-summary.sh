@@ -107,51 +107,45 @@ get_git_summary() {
     echo ""
 }
 
-# Function to get chat conversations summary (as subsection)
-get_chat_summary() {
-    local chat_parser="$REPO_DIR/dev/scripts/parse-chat-sessions.py"
+# Function to render parsed chat conversations as a subsection
+# Optional second argument: note shown when there are no conversations
+render_chat_summary() {
+    local chat_content="$1"
+    local empty_note="${2:-No chat conversations found for today}"
     
-    # Check if chat parser exists and is executable
-    if [ ! -x "$chat_parser" ]; then
-        echo "### 💬 Chat Conversations"
-        echo ""
-        echo "*Chat parser not available or not executable*"
-        echo ""
-        return
-    fi
-    
-    # Try to parse target date's chat sessions
-    local chat_content
-    chat_content=$(python3 "$chat_parser" --date "$TARGET_DATE" 2>/dev/null)
-    
-    if [ $? -eq 0 ] && [ -n "$chat_content" ]; then
+    if [ -n "$chat_content" ]; then
         # Replace the main header with a subsection header
         echo "$chat_content" | sed 's/^## 💬 Chat Conversations/### 💬 Chat Conversations/'
         echo ""
     else
         echo "### 💬 Chat Conversations"
         echo ""
-        echo "*No chat conversations found for today*"
+        echo "*$empty_note*"
         echo ""
     fi
 }
 
-# Function to get structured insights from chat
-get_chat_insights() {
+# Function to parse target date's chat sessions once, as JSON with the requested sections
+# Optional first argument: comma-separated sections (default: summary,insights)
+get_chat_bundle() {
     local chat_parser="$REPO_DIR/dev/scripts/parse-chat-sessions.py"
+    local sections="${1:-summary,insights}"
     
     # Check if chat parser exists and is executable
     if [ ! -x "$chat_parser" ]; then
         return 1
     fi
     
-    # Try to get structured insights from target date's chat sessions
-    python3 "$chat_parser" --date "$TARGET_DATE" --format insights 2>/dev/null
+    python3 "$chat_parser" --date "$TARGET_DATE" --format bundle --sections "$sections" 2>/dev/null
 }
 
 # Function to populate session sections with chat insights
+# Second argument: chat summary markdown already parsed from the bundle
+# Optional third argument: note shown in place of the conversations when there are none
 populate_sections_with_insights() {
     local insights_json="$1"
+    local chat_content="$2"
+    local empty_note="$3"
     
     if [ -z "$insights_json" ] || [ "$insights_json" = "null" ]; then
         # No insights available, return default template
@@ -173,7 +167,9 @@ populate_sections_with_insights() {
 
 ## 💭 Notes
 - *Add any additional context or observations*
+
 EOF
+        render_chat_summary "$chat_content" "$empty_note" | tail -n +2  # Skip the first line which is the header
         return
     fi
     
@@ -235,16 +231,23 @@ EOF
     echo ""
     
     # Add chat conversations under Session Activity
-    get_chat_summary | tail -n +2  # Skip the first line which is the header
+    render_chat_summary "$chat_content" "$empty_note" | tail -n +2  # Skip the first line which is the header
 }
 
 # Function to create active session summary
 create_active_summary() {
     log "${GREEN}📝 Creating active session summary...${NC}"
     
-    # Get chat insights for structured sections
-    local insights_json
-    insights_json=$(get_chat_insights)
+    # Parse chat sessions once for both the structured sections and the conversation list
+    # If the parse fails, fall back to the template placeholders rather than parsing again
+    local chat_bundle insights_json="" chat_content="" empty_note=""
+    if chat_bundle=$(get_chat_bundle); then
+        insights_json=$(echo "$chat_bundle" | jq -c '.insights // empty' 2>/dev/null) || insights_json=""
+        chat_content=$(echo "$chat_bundle" | jq -r '.summary // empty' 2>/dev/null) || chat_content=""
+    else
+        log "${YELLOW}⚠️  Chat parsing failed for $TARGET_DATE; using the template placeholders${NC}"
+        empty_note="Chat parsing failed; conversations not included"
+    fi
     
     cat > "$DELTA_FILE" << EOF
 # Session Summary - $TODAY
@@ -261,7 +264,7 @@ $(get_git_summary)
 ## 🔄 Session Activity
 *This summary was auto-generated. Manual updates can be added below.*
 
-$(populate_sections_with_insights "$insights_json")
+$(populate_sections_with_insights "$insights_json" "$chat_content" "$empty_note")
 
 ---
 *Auto-generated on $TODAY at $(date '+%H:%M:%S'). Edit this file to add manual session details.*
@@ -286,8 +289,15 @@ update_existing_summary() {
     # Add updated git activity
     get_git_summary >> "$temp_file"
     
-    # Add updated chat summary
-    get_chat_summary >> "$temp_file"
+    # Add updated chat summary, parsed once like a new summary
+    local chat_bundle chat_content="" empty_note=""
+    if chat_bundle=$(get_chat_bundle summary); then
+        chat_content=$(echo "$chat_bundle" | jq -r '.summary // empty' 2>/dev/null) || chat_content=""
+    else
+        log "${YELLOW}⚠️  Chat parsing failed for $TARGET_DATE; leaving conversations out${NC}"
+        empty_note="Chat parsing failed; conversations not included"
+    fi
+    render_chat_summary "$chat_content" "$empty_note" >> "$temp_file"
     
     # Add everything after chat activity section (if it exists)
     sed -n '/## 🔄 Session Activity/,$p' "$DELTA_FILE" >> "$temp_file"
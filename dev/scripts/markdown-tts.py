@@ -11,29 +11,846 @@ import hashlib
 import argparse
 import re
 import glob
+import time
+import random
+import threading
+import fcntl
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from google.cloud import texttospeech
 import subprocess
+import difflib
+import shutil
+import struct
+import socket
+import socketserver
+
+# google.cloud.texttospeech pulls in grpc and protobuf, which dominates startup;
+# it is imported by load_texttospeech() only when synthesis or voice listing needs it
+_texttospeech = None
+
+# Bump when the cache key layout changes; older files are evicted on prune
+CACHE_KEY_VERSION = 2
+
+# File extension for each Google TTS audio encoding
+AUDIO_EXTENSIONS = {
+    "MP3": ".mp3",
+    "LINEAR16": ".wav",
+    "MULAW": ".wav",
+    "ALAW": ".wav",
+    "OGG_OPUS": ".ogg",
+    "PCM": ".pcm"
+}
+
+# Fixed buffer used when streaming audio between files
+COPY_BUFFER_SIZE = 64 * 1024
+
+# Errors worth retrying: rate limits, deadlines and server-side failures. Google API
+# errors render as "<HTTP status> <message>", so the status prefix identifies them.
+RETRYABLE_ERROR_NAMES = {
+    "TooManyRequests", "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded",
+    "InternalServerError", "GatewayTimeout", "BadGateway", "Aborted"
+}
+RETRYABLE_STATUS = re.compile(r"^(?:429|500|502|503|504)\b")
+
+# ffmpeg loudnorm prints its first-pass measurements as a JSON object on stderr
+LOUDNORM_JSON = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}")
+
+# ffmpeg encoder arguments for normalized output, by file extension
+NORMALIZED_CODECS = {
+    ".mp3": ["-c:a", "libmp3lame", "-q:a", "2"],
+    ".wav": ["-c:a", "pcm_s16le"],
+    ".ogg": ["-c:a", "libopus"]
+}
+
+# Postprocess settings that change normalized audio (and so its cache key)
+NORMALIZE_SETTINGS = ("target_lufs", "true_peak_db", "loudness_range", "trim_silence", "silence_threshold_db")
+
+# Generated files (audio, indexes, socket) live here; TTS_CACHE_DIR moves them, e.g. for tests
+CACHE_ROOT = Path(os.environ.get("TTS_CACHE_DIR", "dev/cache"))
+
+# Unix socket the resident TTS server listens on (see --serve)
+DEFAULT_SOCKET_PATH = str(CACHE_ROOT / "tts.sock")
+
+# Players that can read MP3 from stdin for streaming playback, in order of preference
+STREAM_PLAYERS = [
+    ["mpv", "--no-video", "--really-quiet", "-"],
+    ["mpg123", "-q", "-"],
+    ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"]
+]
+
+# MPEG audio Layer III bitrates (kbps) by header index
+MP3_BITRATES_MPEG1 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+MP3_BITRATES_MPEG2 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+
+# Sample rates by header version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+MP3_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000]
+}
+
+
+# Every markdown construct the TTS cleaner handles, matched in one left-to-right pass.
+# Line-level constructs are anchored on the newline that starts their line, so every
+# alternative begins with a literal character and the regex engine can skip ahead
+# to candidate positions instead of trying each alternative at every offset.
+MARKDOWN_TOKENS = re.compile(r"""
+      \n[ \t]*```(?P<fence>(?s:.*?)\n[ \t]*```[^\n]*)
+    | \n[ \t]*(?:-{3,}|\*{3,}|_{3,})[ \t]*$(?P<rule>)
+    | \n[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)+\|?[ \t]*$(?P<table_separator>)
+    | \n[ \t]*\|(?P<table_row>[^\n]*)\|[ \t]*$
+    | \n[ \t]*\#{1,6}[ \t]+(?P<header>)
+    | \n[ \t]*[-*+>][ \t]+(?P<bullet>)
+    | \n(?P<blank>[ \t]*(?:\n[ \t]*)*)(?=\n)
+    | ```(?P<inline_fence>[^\n]*?)```
+    | !\[(?P<image>[^\]\n]*)\]\([^)\n]*\)
+    | \[(?P<link>[^\]\n]*)\]\([^)\n]*\)
+    | `(?P<code>[^`\n]*)`
+    | \*\*\*(?P<bold_italic>[^\n]*?)\*\*\*
+    | ___(?P<underscore_bold_italic>[^\n]*?)___
+    | \*\*(?P<bold>[^\n]*?)\*\*
+    | \*(?P<italic>[^\n]*?)\*
+""", re.MULTILINE | re.VERBOSE)
+
+# Indentation, trailing spaces and runs of spaces/tabs inside spoken text
+SPOKEN_WHITESPACE = re.compile(r"[ \t]*\n[ \t]*|[ \t]{2,}|\t")
+
+# A speaker-tagged line of dialogue: "**Glove:** text", "**Glove**: text" or, for
+# speakers named in the config, plain "Glove: text" / "GLOVE: text" as pdftotext emits
+DIALOGUE_LINE = re.compile(r"""
+    ^[ \t]*(?:[-*>][ \t]+)?
+    (?:\*\*(?P<tagged>[^*:\n]{1,40}?)(?::\*\*|\*\*:)
+      | (?P<plain>[A-Za-z][\w'. -]{0,39}?):)
+    [ \t]*(?P<line>\S.*)$
+""", re.VERBOSE)
+
+# Profile fields that name a character, e.g. "**Name**: Principal Watch"
+CHARACTER_NAME_FIELD = re.compile(r"^\*\*(?:Name|Also Known As|Nickname)s?\*\*:[ \t]*(?P<names>[^\n]+)", re.MULTILINE)
+
+# Boundaries tried in turn when packing text into chunks: sentences, then
+# clauses, then words. Pieces still too large after words are split by bytes.
+TEXT_BREAKS = (
+    re.compile(r"(?<=[.!?])\s+"),
+    re.compile(r"(?<=[,;:])\s+"),
+    re.compile(r"\s+")
+)
+
+def load_texttospeech():
+    """Import the Google Cloud TTS client library on first use"""
+    global _texttospeech
+    if _texttospeech is None:
+        from google.cloud import texttospeech
+        _texttospeech = texttospeech
+    return _texttospeech
+
+
+def voice_family(name):
+    """Voice family from a voice name, e.g. en-US-Neural2-D -> Neural2, en-US-Chirp3-HD-Puck -> Chirp3-HD"""
+    parts = name.split("-")
+    return "-".join(parts[2:-1]) if len(parts) > 3 else ""
+
+
+def filter_voices(voices, language=None, gender=None, family=None):
+    """Filter catalogue entries by language code prefix, gender and voice family prefix"""
+    language = language.lower() if language else None
+    gender = gender.upper() if gender else None
+    family = family.lower() if family else None
+    return [
+        voice for voice in voices
+        if (not language or any(code.lower().startswith(language) for code in voice["language_codes"]))
+        and (not gender or voice["ssml_gender"] == gender)
+        and (not family or voice_family(voice["name"]).lower().startswith(family))
+    ]
+
+
+def ssml_escape(text):
+    """Escape the characters SSML treats as markup (xml.sax.saxutils drags in urllib)"""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def split_utf8(text, max_bytes):
+    """Yield pieces of text of at most max_bytes UTF-8 bytes without splitting a character"""
+    data = text.encode('utf-8')
+    start = 0
+    while start < len(data):
+        end = min(start + max_bytes, len(data))
+        # Back up over continuation bytes (10xxxxxx) to a character boundary
+        while end > start and end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        if end == start:
+            # A single character wider than max_bytes; emit it whole
+            end = start + 1
+            while end < len(data) and (data[end] & 0xC0) == 0x80:
+                end += 1
+        yield data[start:end].decode('utf-8')
+        start = end
+
+
+def parse_mp3_frame_header(header):
+    """Decode a 4-byte MPEG Layer III frame header, returning None if invalid"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    
+    version_bits = (header[1] >> 3) & 0x03
+    layer_bits = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version_bits == 1 or layer_bits != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    
+    mpeg1 = version_bits == 3
+    mono = (header[3] >> 6) == 3
+    bitrate = (MP3_BITRATES_MPEG1 if mpeg1 else MP3_BITRATES_MPEG2)[bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version_bits][rate_index]
+    padding = (header[2] >> 1) & 0x01
+    
+    return {
+        "mpeg1": mpeg1,
+        "mono": mono,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "frame_length": (144 if mpeg1 else 72) * bitrate // sample_rate + padding,
+        "side_info_size": (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    }
+
+
+def mp3_audio_range(path):
+    """Find the byte range of MPEG audio frames, skipping ID3 tags and Xing/Info/VBRI frames"""
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        start, end = 0, file_size
+        
+        # Leading ID3v2 tags (there may be more than one)
+        while True:
+            f.seek(start)
+            tag = f.read(10)
+            if len(tag) < 10 or tag[:3] != b"ID3":
+                break
+            tag_size = (tag[6] << 21) | (tag[7] << 14) | (tag[8] << 7) | tag[9]
+            footer = 10 if tag[5] & 0x10 else 0
+            start += 10 + tag_size + footer
+        
+        # Trailing ID3v1 tag
+        if end - start >= 128:
+            f.seek(end - 128)
+            if f.read(3) == b"TAG":
+                end -= 128
+        
+        # A leading Xing/Info/VBRI frame describes only this chunk, so drop it
+        f.seek(start)
+        first_frame = f.read(64)
+        info = parse_mp3_frame_header(first_frame)
+        if info:
+            xing_offset = 4 + info["side_info_size"]
+            if (first_frame[xing_offset:xing_offset + 4] in (b"Xing", b"Info")
+                    or first_frame[36:40] == b"VBRI"):
+                start += info["frame_length"]
+    
+    return start, max(start, end)
+
+
+def wav_audio_range(path):
+    """Find the fmt chunk and data byte range of a RIFF/WAVE file"""
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"{Path(path).name} is not a WAV file")
+        
+        fmt = None
+        position = 12
+        while position + 8 <= file_size:
+            f.seek(position)
+            chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"{Path(path).name} has no fmt chunk before its data")
+                # Streamed WAVs may carry a placeholder size, so clamp to the file
+                data_size = min(chunk_size, file_size - position - 8)
+                return fmt, position + 8, data_size
+            position += 8 + chunk_size + (chunk_size & 1)
+    
+    raise ValueError(f"{Path(path).name} has no data chunk")
+
+
+def audio_sample_rate(path):
+    """Sample rate of an MP3 or WAV file, or None for other formats"""
+    path = Path(path)
+    if path.suffix == ".mp3":
+        start, end = mp3_audio_range(path)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            info = parse_mp3_frame_header(f.read(4))
+        return info["sample_rate"] if info else None
+    if path.suffix == ".wav":
+        fmt, _, _ = wav_audio_range(path)
+        return struct.unpack("<I", fmt[4:8])[0]
+    return None
+
+
+def mp3_silence(reference_header, milliseconds):
+    """Silent MPEG frames matching a reference frame header, lasting about milliseconds"""
+    header = bytes([reference_header[0], reference_header[1], reference_header[2] & ~0x02, reference_header[3]])
+    info = parse_mp3_frame_header(header)
+    samples_per_frame = 1152 if info["mpeg1"] else 576
+    frames = round(milliseconds / 1000 * info["sample_rate"] / samples_per_frame)
+    # All-zero side information decodes as silence
+    return (header + bytes(info["frame_length"] - 4)) * frames
+
+
+def copy_byte_range(source, destination, start, length):
+    """Stream a byte range from a file into an open output through a fixed buffer"""
+    with open(source, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = f.read(min(COPY_BUFFER_SIZE, remaining))
+            if not block:
+                break
+            destination.write(block)
+            remaining -= len(block)
+
+
+class AudioCache:
+    """Index-backed audio cache with size-bounded LRU eviction"""
+    
+    INDEX_NAME = "index.json"
+    
+    def __init__(self, cache_dir, max_size_mb=None, max_entries=None):
+        self.cache_dir = Path(cache_dir)
+        self.index_file = self.cache_dir / self.INDEX_NAME
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.max_entries = max_entries
+        self.lock = threading.RLock()
+        self.entries = self._load_index()
+    
+    def _load_index(self):
+        """Load the index, rebuilding it if files changed behind our back"""
+        try:
+            with open(self.index_file, 'r') as f:
+                entries = json.load(f).get("entries", {})
+            # Files added or removed outside TTSReader bump the directory mtime
+            if self.cache_dir.stat().st_mtime <= self.index_file.stat().st_mtime + 1:
+                return entries
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            entries = {}
+        return self._rebuild_index(entries)
+    
+    def _rebuild_index(self, previous):
+        """Scan the cache directory once, keeping known access times"""
+        entries = {}
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file() or not entry.name.startswith("tts-") or entry.name.endswith(".tmp"):
+                continue
+            st = entry.stat()
+            known = previous.get(entry.name, {})
+            entries[entry.name] = {
+                **known,
+                "size": st.st_size,
+                "last_access": known.get("last_access", st.st_mtime),
+                "created": known.get("created", st.st_mtime)
+            }
+        return entries
+    
+    @staticmethod
+    def is_current(name):
+        """Check whether a cached filename uses the current key version"""
+        return name.startswith(f"tts-v{CACHE_KEY_VERSION}-")
+    
+    def contains(self, path):
+        """Check the index for a cached file without touching the filesystem"""
+        with self.lock:
+            return Path(path).name in self.entries
+    
+    def touch(self, path):
+        """Mark a cached file as recently used"""
+        with self.lock:
+            entry = self.entries.get(Path(path).name)
+            if entry:
+                entry["last_access"] = time.time()
+    
+    def add(self, path, **metadata):
+        """Record a newly written file in the index"""
+        path = Path(path)
+        now = time.time()
+        with self.lock:
+            self.entries[path.name] = {
+                **metadata,
+                "size": path.stat().st_size,
+                "last_access": now,
+                "created": now
+            }
+    
+    def total_size(self):
+        """Total bytes tracked by the index"""
+        with self.lock:
+            return sum(entry["size"] for entry in self.entries.values())
+    
+    def prune(self, max_bytes=None, max_entries=None, protect=()):
+        """Evict stale-version files, then least recently used files until the cache fits"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_entries = self.max_entries if max_entries is None else max_entries
+        protected = {Path(p).name for p in protect}
+        
+        removed, freed = 0, 0
+        with self.lock:
+            total = self.total_size()
+            count = len(self.entries)
+            # Entries from older key versions can never be hit again, so they go first
+            eviction_order = sorted(
+                self.entries,
+                key=lambda n: (self.is_current(n), self.entries[n]["last_access"])
+            )
+            for name in eviction_order:
+                over_size = max_bytes is not None and total > max_bytes
+                over_count = max_entries is not None and count > max_entries
+                if not (over_size or over_count or not self.is_current(name)):
+                    break
+                if name in protected:
+                    continue
+                size = self.entries.pop(name)["size"]
+                try:
+                    (self.cache_dir / name).unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                count -= 1
+                removed += 1
+                freed += size
+        return removed, freed
+    
+    def save(self):
+        """Write the index atomically"""
+        with self.lock:
+            temp_file = self.index_file.with_name(f"{self.INDEX_NAME}.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump({"version": 1, "entries": self.entries}, f)
+            os.replace(temp_file, self.index_file)
+    
+    def stats(self):
+        """Summarize cache contents for reporting"""
+        with self.lock:
+            kinds = {}
+            for entry in self.entries.values():
+                kind = entry.get("kind", "unknown")
+                kinds[kind] = kinds.get(kind, 0) + 1
+            access_times = [entry["last_access"] for entry in self.entries.values()]
+            return {
+                "entries": len(self.entries),
+                "total_bytes": self.total_size(),
+                "kinds": kinds,
+                "legacy": sum(1 for name in self.entries if not self.is_current(name)),
+                "oldest_access": min(access_times) if access_times else None,
+                "newest_access": max(access_times) if access_times else None,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries
+            }
+
+
+class CharacterIndex:
+    """Persistent name/alias to profile path map, rebuilt when character directories change"""
+    
+    VERSION = 1
+    
+    def __init__(self, index_file, root="content/characters"):
+        self.index_file = Path(index_file)
+        self.root = Path(root)
+        self.data = self._load()
+    
+    def _load(self):
+        """Load the index, rebuilding it if any indexed directory has changed"""
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION and data.get("root") == str(self.root) and self._is_fresh(data):
+                return data
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            pass
+        data = self._build()
+        self._save(data)
+        return data
+    
+    @staticmethod
+    def _is_fresh(data):
+        """Files added, removed or renamed bump the mtime of their directory"""
+        for directory, mtime in data["directories"].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+    
+    def _build(self):
+        """Walk the character directories once and index every profile"""
+        directories = {}
+        profiles = []
+        for directory, subdirs, files in os.walk(self.root):
+            subdirs.sort()
+            directories[directory] = os.stat(directory).st_mtime_ns
+            for filename in sorted(files):
+                if filename.endswith(".md"):
+                    profiles.append(os.path.join(directory, filename))
+        
+        # Shallower paths claim shared aliases first, as the old scoring preferred
+        profiles.sort(key=lambda path: (path.count(os.sep), path))
+        characters = []
+        aliases = {}
+        for path in profiles:
+            names = [Path(path).stem]
+            for name in self._profile_names(path):
+                if name.lower().replace(" ", "-") not in (known.lower() for known in names):
+                    names.append(name)
+            characters.append({"name": Path(path).stem, "path": path, "aliases": names})
+            for name in names:
+                for alias in {name.lower(), name.lower().replace("-", " "), name.lower().replace(" ", "-")}:
+                    aliases.setdefault(alias, path)
+        
+        # Exact file names always win over names mentioned inside other profiles
+        for character in characters:
+            aliases[character["name"].lower()] = character["path"]
+        
+        return {
+            "version": self.VERSION,
+            "root": str(self.root),
+            "directories": directories,
+            "characters": characters,
+            "aliases": aliases
+        }
+    
+    @staticmethod
+    def _profile_names(path):
+        """Read character names from the profile's header fields"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                header = f.read(4096)
+        except (OSError, UnicodeDecodeError):
+            return []
+        names = []
+        for match in CHARACTER_NAME_FIELD.finditer(header):
+            for name in match.group("names").split(","):
+                name = name.strip(' "')
+                # Skip template placeholders such as "[Character Name]"
+                if name and not name.startswith("["):
+                    names.append(name)
+        return names
+    
+    def _save(self, data):
+        """Write the index atomically, skipping read-only locations"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.index_file.with_name(f"{self.index_file.name}.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_file, self.index_file)
+        except OSError:
+            pass
+    
+    def characters(self):
+        """Indexed character profiles as (name, path) pairs sorted by path"""
+        return sorted(((c["name"], c["path"]) for c in self.data["characters"]), key=lambda item: item[1])
+    
+    def lookup(self, query):
+        """Resolve a name by exact alias, then prefix, substring and fuzzy matching"""
+        aliases = self.data["aliases"]
+        query = query.strip().lower()
+        if not query:
+            return None
+        
+        for key in (query, query.replace(" ", "-"), query.replace("-", " ")):
+            if key in aliases:
+                return aliases[key]
+        
+        # Aliases are few enough to scan in memory; ties go to the shortest alias
+        for matches in (
+            [alias for alias in aliases if alias.startswith(query)],
+            [alias for alias in aliases if query in alias]
+        ):
+            if matches:
+                return aliases[min(matches, key=lambda alias: (len(alias), alias))]
+        
+        close = difflib.get_close_matches(query, aliases.keys(), n=1, cutoff=0.75)
+        return aliases[close[0]] if close else None
+
+
+class TTSBackend:
+    """Speech engine interface: turn text or SSML into encoded audio bytes"""
+    
+    name = "base"
+    
+    def synthesize(self, text, voice, audio_config, ssml=False):
+        """Return audio bytes in audio_config["audio_encoding"] for one request"""
+        raise NotImplementedError
+
+
+class GoogleTTSBackend(TTSBackend):
+    """Google Cloud Text-to-Speech"""
+    
+    name = "google"
+    
+    def __init__(self, client=None):
+        self.client = client or load_texttospeech().TextToSpeechClient()
+    
+    def synthesize(self, text, voice, audio_config, ssml=False):
+        texttospeech = load_texttospeech()
+        synthesis_input = texttospeech.SynthesisInput(ssml=text) if ssml else texttospeech.SynthesisInput(text=text)
+        
+        voice_params = texttospeech.VoiceSelectionParams(
+            language_code=voice["language_code"],
+            name=voice["name"],
+            ssml_gender=getattr(texttospeech.SsmlVoiceGender, voice["ssml_gender"])
+        )
+        
+        audio_params = texttospeech.AudioConfig(
+            audio_encoding=getattr(texttospeech.AudioEncoding, audio_config["audio_encoding"]),
+            speaking_rate=audio_config["speaking_rate"],
+            pitch=audio_config["pitch"]
+        )
+        
+        response = self.client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice_params,
+            audio_config=audio_params
+        )
+        return response.audio_content
+
+
+class LocalTTSBackend(TTSBackend):
+    """Deterministic offline engine producing silent audio sized like real speech
+    
+    Duration follows text length and speaking rate, so chunking, caching,
+    concurrency and concatenation see realistic byte counts without a network.
+    """
+    
+    name = "local"
+    
+    # 96-byte MPEG-2 Layer III frame: 24 kHz, 32 kbps, mono, 576 samples (24 ms)
+    MP3_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC0]) + bytes(92)
+    MP3_FRAME_SECONDS = 576 / 24000
+    WAV_SAMPLE_RATE = 24000
+    
+    def __init__(self, latency=0.0, characters_per_second=15.0):
+        self.latency = latency
+        self.characters_per_second = characters_per_second
+    
+    def duration(self, text, audio_config):
+        """Seconds of speech for the text at the configured speaking rate"""
+        spoken = re.sub(r"<[^>]+>", "", text)  # SSML markup is not spoken
+        rate = float(audio_config.get("speaking_rate", 1.0)) or 1.0
+        return max(0.1, len(spoken) / self.characters_per_second / rate)
+    
+    def synthesize(self, text, voice, audio_config, ssml=False):
+        if self.latency:
+            time.sleep(self.latency)
+        
+        duration = self.duration(text, audio_config)
+        encoding = audio_config["audio_encoding"]
+        if encoding == "MP3":
+            return self.MP3_FRAME * max(1, round(duration / self.MP3_FRAME_SECONDS))
+        if encoding == "LINEAR16":
+            return self.wav(bytes(2 * int(duration * self.WAV_SAMPLE_RATE)), self.WAV_SAMPLE_RATE)
+        raise ValueError(f"Local backend cannot produce {encoding} audio (use MP3 or LINEAR16)")
+    
+    @staticmethod
+    def wav(samples, sample_rate):
+        """Wrap 16-bit mono PCM samples in a RIFF/WAVE header"""
+        fmt = struct.pack("<HHIIHH", 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        return (b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(samples)) + b"WAVE"
+                + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+                + b"data" + struct.pack("<I", len(samples)) + samples)
+
+
+class EspeakTTSBackend(LocalTTSBackend):
+    """Offline speech through an espeak-ng subprocess (LINEAR16 output only)"""
+    
+    name = "espeak"
+    
+    def synthesize(self, text, voice, audio_config, ssml=False):
+        if audio_config["audio_encoding"] != "LINEAR16":
+            raise ValueError("espeak backend produces WAV only - set audio_encoding to LINEAR16")
+        
+        words_per_minute = int(175 * float(audio_config.get("speaking_rate", 1.0)))
+        cmd = ["espeak-ng", "--stdout", "-v", voice["language_code"].lower(), "-s", str(words_per_minute)]
+        if ssml:
+            cmd.append("-m")
+        result = subprocess.run(cmd + ["--", text], capture_output=True, check=True)
+        return result.stdout
+
+
+# Engines selectable with --backend
+TTS_BACKENDS = {
+    "google": GoogleTTSBackend,
+    "local": LocalTTSBackend,
+    "espeak": EspeakTTSBackend
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate"""
+    
+    def __init__(self, per_minute, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+    
+    def acquire(self, amount=1):
+        """Take amount tokens, blocking until they have accrued, and return seconds waited
+        
+        A shortfall is taken as debt, so requests larger than the bucket still
+        pay in full and later callers queue behind the debt.
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            # Tolerance stops float rounding from sleeping for vanishing delays
+            delay = -self.tokens / self.rate if self.tokens < -1e-6 else 0.0
+        if delay:
+            self.sleep(delay)
+        return delay
+
+
+class QuotaLedger:
+    """Month-by-month record of characters and requests sent to the API, shared across runs"""
+    
+    def __init__(self, ledger_file):
+        self.ledger_file = Path(ledger_file)
+        self.lock = threading.Lock()
+    
+    def _read(self):
+        try:
+            with open(self.ledger_file, 'r') as f:
+                return json.load(f).get("months", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return {}
+    
+    def record(self, characters, requests=1):
+        """Add usage to the current month, merging with what other processes recorded"""
+        month = time.strftime("%Y-%m")
+        self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = self.ledger_file.with_name(f"{self.ledger_file.name}.lock")
+        # The thread lock serializes this process; flock serializes processes sharing the ledger
+        with self.lock, open(lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            months = self._read()
+            usage = months.setdefault(month, {"characters": 0, "requests": 0})
+            usage["characters"] += characters
+            usage["requests"] += requests
+            
+            temp_file = self.ledger_file.with_name(f"{self.ledger_file.name}.{os.getpid()}.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump({"months": months}, f, indent=2)
+            os.replace(temp_file, self.ledger_file)
+    
+    def month_to_date(self, month=None):
+        """Usage for a month (default: the current one)"""
+        return self._read().get(month or time.strftime("%Y-%m"), {"characters": 0, "requests": 0})
+
+
+class RequestScheduler:
+    """Paces API requests under per-minute quotas and retries transient errors with jittered backoff"""
+    
+    # Keep this share of each per-minute quota as burst capacity; the refill rate
+    # gets the rest, so no 60-second window can exceed the quota
+    BURST_SHARE = 0.1
+    MAX_BACKOFF = 60.0
+    
+    def __init__(self, quota, synthesis, ledger, clock=time.monotonic, sleep=time.sleep):
+        self.max_retries = synthesis.get("max_retries", 0)
+        self.retry_backoff = synthesis.get("retry_backoff", 1.0)
+        self.ledger = ledger
+        self.sleep = sleep
+        self.requests = self._bucket(quota["requests_per_minute"], clock, sleep)
+        self.characters = self._bucket(quota["characters_per_minute"], clock, sleep)
+        self.throttled = 0.0  # Seconds spent waiting for quota
+        self.lock = threading.Lock()
+    
+    def _bucket(self, limit, clock, sleep):
+        if limit < 1:
+            raise ValueError(f"per-minute quota must be at least 1, got {limit}")
+        burst = limit * self.BURST_SHARE
+        return TokenBucket(limit - burst, burst, clock, sleep)
+    
+    @staticmethod
+    def is_retryable(error):
+        """Rate limits, timeouts and 5xx errors are retried; bad requests fail fast"""
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+            return True
+        return bool(RETRYABLE_STATUS.match(str(error)))
+    
+    def run(self, request, characters, metered=True):
+        """Call request() within quota, retrying retryable errors; metered calls go to the ledger"""
+        for attempt in range(self.max_retries + 1):
+            if metered:
+                waited = self.requests.acquire(1) + self.characters.acquire(characters)
+                if waited:
+                    with self.lock:
+                        self.throttled += waited
+            try:
+                result = request()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    raise
+                # Full jitter keeps concurrent workers from retrying in lockstep
+                delay = random.uniform(0, min(self.MAX_BACKOFF, self.retry_backoff * (2 ** attempt)))
+                print(f"⚠️  Speech request failed ({e}), retrying in {delay:.1f}s...")
+                self.sleep(delay)
+                continue
+            if metered:
+                self.ledger.record(characters)
+            return result
+
 
 class TTSReader:
-    def __init__(self, config_file="dev/config/tts-config.json", init_client=True):
-        self.config = self.load_config(config_file)
-        self.cache_dir = Path("dev/cache/audio-cache")
-        self.cache_dir.mkdir(exist_ok=True)
+    def __init__(self, config_file="dev/config/tts-config.json", init_client=True, validate_voices=True, backend=None):
+        self.voices_file = CACHE_ROOT / "voices.json"
+        self.config = self.load_config(config_file, validate_voices)
+        self.cache_dir = CACHE_ROOT / "audio-cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache = None
+        self._character_index = None
+        self._scheduler = None
+        self._scheduler_lock = threading.Lock()
+        self.time_to_first_audio = None  # Seconds until a streamed read began playing
+        
+        # Per-run synthesis counters (shared across worker threads)
+        self.stats = {
+            "api_calls": 0,
+            "chunk_cache_hits": 0,
+            "document_cache_hits": 0,
+            "characters_synthesized": 0,
+            "audio_bytes": 0,
+            "normalized": 0,
+            "normalize_cache_hits": 0
+        }
+        self._stats_lock = threading.Lock()
+        
+        # An explicit backend (e.g. LocalTTSBackend) replaces the Google client
+        self.backend = backend
+        self._google_backend = None
         
         # Initialize Google Cloud TTS client only if needed
         self.client = None
-        if init_client:
+        if init_client and backend is None:
             try:
-                self.client = texttospeech.TextToSpeechClient()
+                self.client = load_texttospeech().TextToSpeechClient()
                 print("✅ Google Cloud TTS client initialized")
             except Exception as e:
                 print(f"❌ Error initializing TTS client: {e}")
                 print("Make sure GOOGLE_APPLICATION_CREDENTIALS is set and valid")
                 sys.exit(1)
     
-    def load_config(self, config_file):
-        """Load TTS configuration from JSON file"""
+    def load_config(self, config_file, validate_voices=True):
+        """Load TTS configuration from JSON file, checking voice names against the voice cache"""
         default_config = {
             "voice": {
                 "language_code": "en-US",
@@ -48,7 +865,39 @@ class TTSReader:
             "playback": {
                 "auto_play": True,
                 "save_audio": True,
-                "auto_open_editor": True
+                "auto_open_editor": True,
+                "stream": False
+            },
+            "synthesis": {
+                "max_workers": 4,
+                "max_retries": 3,
+                "retry_backoff": 1.0
+            },
+            "cache": {
+                "max_size_mb": 500,
+                "max_entries": 5000
+            },
+            "dialogue": {
+                "enabled": False,
+                "speaker_voices": {},
+                "turn_pause_ms": 300
+            },
+            "voices": {
+                "cache_ttl_hours": 168
+            },
+            "quota": {
+                "requests_per_minute": 1000,
+                "characters_per_minute": 150000,
+                "monthly_free_characters": 1000000
+            },
+            "postprocess": {
+                "normalize": False,
+                "target_lufs": -16.0,
+                "true_peak_db": -1.5,
+                "loudness_range": 11.0,
+                "trim_silence": True,
+                "silence_threshold_db": -50,
+                "chunk_pause_ms": 0
             }
         }
         
@@ -64,253 +913,850 @@ class TTSReader:
                         for subkey in default_config[key]:
                             if subkey not in config[key]:
                                 config[key][subkey] = default_config[key][subkey]
-                return config
         except FileNotFoundError:
             print(f"📁 Creating default config: {config_file}")
             Path(config_file).parent.mkdir(exist_ok=True)
             with open(config_file, 'w') as f:
                 json.dump(default_config, f, indent=2)
-            return default_config
+            config = default_config
+        
+        self.validate_quota(config)
+        if validate_voices:
+            self.validate_voice_names(config)
+        return config
     
-    def find_character_file(self, character_name):
-        """Find character file by name, searching common locations"""
-        # Convert to lowercase for case-insensitive matching
-        char_name = character_name.lower()
-        
-        # Search patterns for character files
-        search_patterns = [
-            f"content/characters/**/{char_name}.md",
-            f"content/characters/**/*{char_name}*.md",
-            f"**/{char_name}.md",
-            f"**/*{char_name}*.md"
+    def validate_quota(self, config):
+        """Exit if a per-minute quota could not pace any request"""
+        for key in ("requests_per_minute", "characters_per_minute"):
+            limit = config["quota"][key]
+            if isinstance(limit, bool) or not isinstance(limit, (int, float)) or limit < 1:
+                print(f"❌ Invalid quota in config: quota.{key} must be a number of at least 1, got {limit!r}")
+                sys.exit(1)
+    
+    def validate_voice_names(self, config):
+        """Exit if the config names a voice missing from the cached catalogue (never calls the API)"""
+        catalogue = self.read_voice_catalogue()
+        if not catalogue:
+            return
+        
+        known = {voice["name"] for voice in catalogue["voices"]}
+        names = [config["voice"]["name"]] + [
+            voice if isinstance(voice, str) else voice.get("name")
+            for voice in config["dialogue"]["speaker_voices"].values()
         ]
+        unknown = [name for name in names if name and name not in known]
+        if not unknown:
+            return
         
-        found_files = []
-        for pattern in search_patterns:
-            matches = glob.glob(pattern, recursive=True)
-            found_files.extend(matches)
+        for name in unknown:
+            print(f"❌ Unknown voice in config: {name}")
+            suggestions = difflib.get_close_matches(name, known, n=3)
+            if suggestions:
+                print(f"   Did you mean: {', '.join(suggestions)}?")
+        print("Run with --list-voices --refresh-voices if the voice catalogue is out of date")
+        sys.exit(1)
+    
+    def read_voice_catalogue(self):
+        """Load the cached voice catalogue, or None if it has never been fetched"""
+        try:
+            with open(self.voices_file, 'r') as f:
+                catalogue = json.load(f)
+            return catalogue if "voices" in catalogue else None
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return None
+    
+    def get_voice_catalogue(self, refresh=False):
+        """Voice catalogue from the local cache, fetched again once older than its TTL"""
+        catalogue = self.read_voice_catalogue()
+        ttl = self.config["voices"]["cache_ttl_hours"] * 3600
+        if catalogue and not refresh and time.time() - catalogue.get("fetched", 0) < ttl:
+            return catalogue["voices"]
         
-        # Remove duplicates and sort by relevance
-        found_files = list(set(found_files))
+        try:
+            client = self.client or load_texttospeech().TextToSpeechClient()
+            response = client.list_voices()
+        except Exception as e:
+            if not catalogue:
+                raise
+            fetched = time.strftime("%Y-%m-%d", time.localtime(catalogue.get("fetched", 0)))
+            print(f"⚠️  Could not refresh voices ({e}); using catalogue from {fetched}", file=sys.stderr)
+            return catalogue["voices"]
         
-        if not found_files:
-            return None
+        voices = [
+            {
+                "name": voice.name,
+                "language_codes": list(voice.language_codes),
+                "ssml_gender": voice.ssml_gender.name,
+                "natural_sample_rate_hertz": voice.natural_sample_rate_hertz
+            }
+            for voice in response.voices
+        ]
+        voices.sort(key=lambda voice: voice["name"])
         
-        # Prioritize exact matches and shorter paths
-        def file_score(filepath):
-            filename = Path(filepath).stem.lower()
-            score = 0
-            
-            # Exact filename match gets highest priority
-            if filename == char_name:
-                score += 100
-            
-            # Partial match in filename
-            elif char_name in filename:
-                score += 50
-            
-            # Prefer files in content/characters/ directory
-            if "content/characters/" in filepath:
-                score += 20
-            
-            # Prefer shorter paths (closer to root)
-            score -= filepath.count('/')
-            
-            return score
+        self.voices_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.voices_file.with_name(f"{self.voices_file.name}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"fetched": time.time(), "voices": voices}, f, indent=2)
+        os.replace(temp_file, self.voices_file)
+        # Status goes to stderr so --json output stays parseable
+        print(f"💾 Cached {len(voices):,} voices in {self.voices_file}", file=sys.stderr)
+        return voices
+    
+    def list_voices(self, language="en", gender=None, family=None, as_json=False, refresh=False):
+        """Print voices from the cached catalogue matching the filters"""
+        voices = filter_voices(self.get_voice_catalogue(refresh), language, gender, family)
         
-        # Sort by score (highest first)
-        found_files.sort(key=file_score, reverse=True)
+        if as_json:
+            print(json.dumps(voices, indent=2))
+            return voices
         
-        return found_files[0]  # Return best match
+        filters = ", ".join(f"{label}={value}" for label, value in
+                            (("language", language), ("gender", gender), ("family", family)) if value)
+        print(f"\n🎙️  Available Voices ({filters or 'all'}): {len(voices):,}")
+        print("=" * 50)
+        for voice in voices:
+            print(f"{voice['name']:<32} {voice['language_codes'][0]:<8} {voice['ssml_gender']}")
+        return voices
+    
+    @property
+    def engine(self):
+        """Backend used for synthesis: the chosen backend, else the Google client if set"""
+        if self.backend:
+            return self.backend
+        if not self.client:
+            return None
+        if self._google_backend is None or self._google_backend.client is not self.client:
+            self._google_backend = GoogleTTSBackend(self.client)
+        return self._google_backend
+    
+    @property
+    def scheduler(self):
+        """Request scheduler shared by every worker thread, with its ledger in the cache directory"""
+        # Workers reach this first, so build under a lock or each would get its own buckets
+        with self._scheduler_lock:
+            if self._scheduler is None or self._scheduler.ledger.ledger_file.parent != self.cache_dir:
+                ledger = QuotaLedger(self.cache_dir / "quota-ledger.json")
+                self._scheduler = RequestScheduler(self.config["quota"], self.config["synthesis"], ledger)
+            return self._scheduler
+    
+    @property
+    def character_index(self):
+        """Character index, loaded once and rebuilt only when profiles change"""
+        if self._character_index is None:
+            self._character_index = CharacterIndex(CACHE_ROOT / "character-index.json")
+        return self._character_index
+    
+    def find_character_file(self, character_name):
+        """Find character file by name or alias using the character index"""
+        return self.character_index.lookup(character_name)
     
     def clean_markdown(self, text):
-        """Convert markdown to clean text suitable for TTS"""
-        # Remove image references
-        text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+        """Convert markdown to clean text suitable for TTS in a single pass"""
+        pieces = []
+        pending_newlines = 0  # Line breaks owed before the next spoken text
         
-        # Convert links to just the text
-        text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+        def emit(spoken):
+            nonlocal pending_newlines
+            if not spoken:
+                return
+            if "  " in spoken or "\t" in spoken or " \n" in spoken or "\n " in spoken:
+                spoken = SPOKEN_WHITESPACE.sub(lambda m: "\n" if "\n" in m.group() else " ", spoken)
+            if spoken.startswith("\n"):
+                pending_newlines = max(pending_newlines, 1)
+                spoken = spoken[1:]
+            if pending_newlines:
+                spoken = spoken.lstrip(" \t")
+                if not spoken:
+                    return
+                if pieces:
+                    pieces[-1] = pieces[-1].rstrip(" \t\n")
+                    pieces.append("\n" * pending_newlines)
+                pending_newlines = 0
+            if spoken:
+                pieces.append(spoken)
         
-        # Remove headers but keep the text
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+        text = "\n" + text  # Lets first-line constructs match on their leading newline
+        position = 0
+        for match in MARKDOWN_TOKENS.finditer(text):
+            spoken = text[position:match.start()]
+            position = match.end()
+            
+            kind = match.lastgroup
+            if kind == "code":
+                emit(spoken + match.group("code"))
+            elif kind in ("link", "bold_italic", "underscore_bold_italic", "bold", "italic"):
+                # Inner text may carry further inline markup
+                emit(spoken + self._clean_inline(match.group(kind)))
+            else:
+                emit(spoken)
+                if kind == "blank":
+                    pending_newlines = 2
+                elif kind in ("header", "bullet"):
+                    pending_newlines = max(pending_newlines, 1)
+                elif kind == "table_row":
+                    # Read table cells as a comma-separated phrase on their own line
+                    cells = [self._clean_inline(cell) for cell in match.group("table_row").split("|")]
+                    emit("\n" + ", ".join(cell for cell in cells if cell))
+                # fence, inline_fence, rule, table_separator and image tokens produce no speech
+        
+        emit(text[position:])
+        return "".join(pieces).strip()
+    
+    def _clean_inline(self, text):
+        """Clean a fragment that may or may not contain inline markup"""
+        if "*" in text or "`" in text or "[" in text:
+            return self.clean_markdown(text)
+        return text.strip()
+    
+    def parse_dialogue(self, text):
+        """Split a script into (speaker, spoken text) passages; narration has speaker None"""
+        known = {name.lower(): name for name in self.config["dialogue"]["speaker_voices"]}
+        passages = []
+        speaker, lines = None, []
         
-        # Remove bold/italic markup
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.*?)\*', r'\1', text)
+        def flush():
+            spoken = self.clean_markdown("\n".join(lines))
+            if spoken:
+                passages.append((speaker, spoken))
         
-        # Remove code blocks and inline code
-        text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-        text = re.sub(r'`([^`]*)`', r'\1', text)
+        for raw_line in text.splitlines():
+            match = DIALOGUE_LINE.match(raw_line)
+            name = None
+            if match:
+                name = match.group("tagged") or known.get(match.group("plain").strip().lower())
+            
+            if name:
+                flush()
+                speaker, lines = name.strip(), [match.group("line")]
+            elif not raw_line.strip():
+                # A blank line ends a speech; what follows is narration
+                if speaker:
+                    flush()
+                    speaker, lines = None, []
+                else:
+                    lines.append(raw_line)
+            else:
+                # Wrapped dialogue (e.g. from pdftotext) continues the current speaker
+                lines.append(raw_line)
         
-        # Remove horizontal rules
-        text = re.sub(r'^---+$', '', text, flags=re.MULTILINE)
+        flush()
+        return passages
+    
+    def voice_for_speaker(self, speaker):
+        """Voice parameters for a speaker, using the configured voice for narration"""
+        voices = {name.lower(): voice for name, voice in self.config["dialogue"]["speaker_voices"].items()}
+        override = voices.get((speaker or "narrator").lower())
+        voice = dict(self.config["voice"])
+        if override is None:
+            return voice
         
-        # Clean up extra whitespace
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
+        if isinstance(override, str):
+            override = {"name": override}
+        voice.update(override)
+        # A bare voice name implies its language and leaves gender to the voice
+        if "language_code" not in override:
+            voice["language_code"] = "-".join(voice["name"].split("-")[:2])
+        if "ssml_gender" not in override:
+            voice["ssml_gender"] = "SSML_VOICE_GENDER_UNSPECIFIED"
+        return voice
+    
+    def build_dialogue_requests(self, passages, max_bytes=4500):
+        """Group consecutive passages by voice into SSML requests under the byte limit"""
+        closing = f'<break time="{int(self.config["dialogue"]["turn_pause_ms"])}ms"/></speak>'
+        empty_size = len("<speak>") + len(closing)
+        requests = []
+        current_voice, paragraphs, size = None, [], empty_size
         
-        # Remove table formatting
-        text = re.sub(r'\|[^|\n]*\|', '', text)
+        for speaker, spoken in passages:
+            voice = self.voice_for_speaker(speaker)
+            if voice != current_voice:
+                if paragraphs:
+                    requests.append(("<speak>" + "".join(paragraphs) + closing, current_voice))
+                current_voice, paragraphs, size = voice, [], empty_size
+            
+            # Leave room for the <speak>, <p> and <break> markup around each piece
+            for piece in self.iter_text_chunks(spoken, max_bytes - 64):
+                paragraph = f"<p>{ssml_escape(piece)}</p>"
+                paragraph_bytes = len(paragraph.encode('utf-8'))
+                if paragraphs and size + paragraph_bytes > max_bytes:
+                    requests.append(("<speak>" + "".join(paragraphs) + closing, current_voice))
+                    paragraphs, size = [], empty_size
+                paragraphs.append(paragraph)
+                size += paragraph_bytes
         
-        return text.strip()
+        if paragraphs:
+            requests.append(("<speak>" + "".join(paragraphs) + closing, current_voice))
+        return requests
     
     def split_text_into_chunks(self, text, max_bytes=4500):
         """Split text into chunks that fit within TTS byte limit"""
-        chunks = []
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        current_chunk = ""
-        for sentence in sentences:
-            # Check if adding this sentence would exceed the limit
-            test_chunk = current_chunk + (" " if current_chunk else "") + sentence
-            if len(test_chunk.encode('utf-8')) > max_bytes and current_chunk:
-                # Save current chunk and start new one
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-            else:
-                current_chunk = test_chunk
-        
-        # Add the last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        return list(self.iter_text_chunks(text, max_bytes))
+    
+    def iter_text_chunks(self, text, max_bytes=4500):
+        """Yield chunks that fit within the TTS byte limit as they are packed"""
+        return self._pack_text(text, max_bytes, 0)
+    
+    def _pack_text(self, text, max_bytes, level):
+        """Greedily pack pieces split at TEXT_BREAKS[level], splitting oversized pieces finer"""
+        parts = []
+        size = 0  # UTF-8 bytes in " ".join(parts)
+        for piece in TEXT_BREAKS[level].split(text):
+            piece = piece.strip()
+            if not piece:
+                continue
+            piece_bytes = len(piece.encode('utf-8'))
+            
+            if piece_bytes > max_bytes:
+                if parts:
+                    yield " ".join(parts)
+                    parts, size = [], 0
+                if level + 1 < len(TEXT_BREAKS):
+                    yield from self._pack_text(piece, max_bytes, level + 1)
+                else:
+                    yield from split_utf8(piece, max_bytes)
+                continue
             
-        return chunks
+            joined = size + piece_bytes + (1 if parts else 0)
+            if joined > max_bytes:
+                yield " ".join(parts)
+                parts, joined = [], piece_bytes
+            parts.append(piece)
+            size = joined
+        
+        if parts:
+            yield " ".join(parts)
+    
+    def get_cache_key(self, text, voice_name=None, voice=None, ssml=False, combined=False):
+        """Hash the text and every synthesis parameter into a versioned cache key"""
+        voice = dict(voice or self.config["voice"])
+        if voice_name:
+            voice["name"] = voice_name
+        
+        # Normalize numbers so 1 and 1.0 in the config produce the same key
+        audio_config = {
+            key: float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+            for key, value in self.config["audio_config"].items()
+        }
+        
+        fields = {
+            "version": CACHE_KEY_VERSION,
+            "text": text,
+            "voice": voice,
+            "audio_config": audio_config
+        }
+        if ssml:
+            fields["input"] = "ssml"
+        # Pauses are inserted when chunks are combined, so only combined audio depends on them
+        pause_ms = self.config["postprocess"]["chunk_pause_ms"]
+        if combined and pause_ms:
+            fields["chunk_pause_ms"] = pause_ms
+        # Offline engines must never satisfy lookups for real speech (or vice versa)
+        if self.backend and self.backend.name != "google":
+            fields["backend"] = self.backend.name
+        
+        canonical = json.dumps(
+            fields,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=32).hexdigest()
+    
+    def get_audio_extension(self):
+        """File extension matching the configured audio encoding"""
+        return AUDIO_EXTENSIONS.get(self.config["audio_config"]["audio_encoding"], ".audio")
     
     def get_cache_filename(self, text, voice_name):
-        """Generate cache filename based on content and voice"""
-        content_hash = hashlib.md5(f"{text}{voice_name}".encode()).hexdigest()[:12]
-        return self.cache_dir / f"tts-{content_hash}.mp3"
+        """Generate cache filename based on content, voice and audio settings"""
+        cache_key = self.get_cache_key(text, voice_name, combined=True)
+        return self.cache_dir / f"tts-v{CACHE_KEY_VERSION}-{cache_key}{self.get_audio_extension()}"
     
-    def synthesize_speech(self, text, voice_name=None):
-        """Convert text to speech using Google Cloud TTS"""
-        if not self.client:
+    def get_chunk_cache_filename(self, text, voice=None, ssml=False):
+        """Generate per-chunk cache filename from text, voice and audio settings"""
+        cache_key = self.get_cache_key(text, voice=voice, ssml=ssml)
+        return self.cache_dir / f"tts-v{CACHE_KEY_VERSION}-chunk-{cache_key}{self.get_audio_extension()}"
+    
+    def get_scene_cache_filename(self, requests):
+        """Generate a cache filename for a dialogue scene from its SSML requests"""
+        script = json.dumps(requests, sort_keys=True, ensure_ascii=False)
+        cache_key = self.get_cache_key(script, ssml=True, combined=True)
+        return self.cache_dir / f"tts-v{CACHE_KEY_VERSION}-scene-{cache_key}{self.get_audio_extension()}"
+    
+    @property
+    def cache(self):
+        """Audio cache index for the current cache directory"""
+        if self._cache is None or self._cache.cache_dir != self.cache_dir:
+            self._cache = AudioCache(
+                self.cache_dir,
+                max_size_mb=self.config["cache"].get("max_size_mb"),
+                max_entries=self.config["cache"].get("max_entries")
+            )
+        return self._cache
+    
+    def _count(self, stat, amount=1):
+        """Increment a synthesis counter from any worker thread"""
+        with self._stats_lock:
+            self.stats[stat] += amount
+    
+    def synthesize_speech(self, text, voice_name=None, voice=None):
+        """Convert text to speech using Google Cloud TTS
+        
+        voice_name changes the configured voice; voice overrides it for this call
+        only, so concurrent callers (e.g. the socket server) can use different voices.
+        """
+        if not self.engine:
             print("❌ TTS client not initialized - call TTSReader(init_client=True)")
             return None
             
         if voice_name:
             self.config["voice"]["name"] = voice_name
+        voice = voice or self.config["voice"]
         
         # Check cache first
-        cache_file = self.get_cache_filename(text, self.config["voice"]["name"])
-        if cache_file.exists():
+        cache = self.cache
+        cache_file = self.get_cache_filename(text, voice["name"])
+        if cache.contains(cache_file):
             print(f"🎵 Using cached audio: {cache_file.name}")
-            return cache_file
+            self._count("document_cache_hits")
+            cache.touch(cache_file)
+            cache.save()
+            return self.postprocess_audio(cache_file)
+        
+        audio_file = self._synthesize_uncached(text, cache_file, voice)
         
+        # Keep the cache bounded, never evicting the file we just produced
+        if audio_file:
+            removed, freed = cache.prune(protect=[audio_file])
+            if removed:
+                print(f"🧹 Evicted {removed} cached files ({freed / 1024 / 1024:.1f} MB)")
+        cache.save()
+        return self.postprocess_audio(audio_file)
+    
+    def _synthesize_uncached(self, text, cache_file, voice=None):
+        """Synthesize text that has no cached document audio"""
         # Check if text is too long and needs chunking
         text_bytes = len(text.encode('utf-8'))
         if text_bytes > 4500:  # Leave some safety margin
             print(f"📊 Text too long ({text_bytes:,} bytes), splitting into chunks...")
-            chunks = self.split_text_into_chunks(text)
-            print(f"📊 Split into {len(chunks)} chunks")
             
-            # Process each chunk and combine audio
-            chunk_files = []
-            for i, chunk in enumerate(chunks, 1):
-                print(f"🎙️  Processing chunk {i}/{len(chunks)} ({len(chunk.encode('utf-8')):,} bytes)...")
-                chunk_file = self.synthesize_single_chunk(chunk, f"{i:03d}")
-                if chunk_file:
-                    chunk_files.append(chunk_file)
-                else:
-                    print(f"❌ Failed to process chunk {i}")
-                    return None
+            # Chunks are submitted for synthesis as soon as they are packed
+            chunks = self.iter_text_chunks(text)
+            if voice:
+                chunks = ((chunk, {"voice": voice}) for chunk in chunks)
+            chunk_files = self.synthesize_chunks(chunks)
             
-            # Combine chunks into final audio file
+            # Combine chunks into final audio file (chunk files stay cached
+            # so later edits only re-synthesize the chunks that changed)
             if chunk_files:
                 combined_file = self.combine_audio_chunks(chunk_files, cache_file)
-                # Clean up temporary chunk files
-                for chunk_file in chunk_files:
-                    try:
-                        chunk_file.unlink()
-                    except:
-                        pass
+                if combined_file:
+                    self.cache.add(combined_file, kind="document", voice=(voice or self.config["voice"])["name"])
                 return combined_file
             else:
                 return None
         else:
             # Text is short enough, process normally
-            return self.synthesize_single_chunk(text)
+            return self.synthesize_single_chunk(text, voice=voice)
     
-    def synthesize_single_chunk(self, text, chunk_suffix=""):
-        """Synthesize a single text chunk"""
-        # Prepare the request
-        synthesis_input = texttospeech.SynthesisInput(text=text)
+    def synthesize_chunks(self, chunks, on_chunk=None):
+        """Synthesize chunks concurrently, returning chunk files in input order
         
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=self.config["voice"]["language_code"],
-            name=self.config["voice"]["name"],
-            ssml_gender=getattr(texttospeech.SsmlVoiceGender, self.config["voice"]["ssml_gender"])
-        )
+        on_chunk, if given, is called with each chunk file in order as soon as
+        it and every chunk before it are ready.
+        """
+        max_workers = max(1, int(self.config["synthesis"].get("max_workers", 1)))
+        print(f"🎙️  Synthesizing chunks with up to {max_workers} workers...")
+        hits_before = self.stats["chunk_cache_hits"]
         
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=getattr(texttospeech.AudioEncoding, self.config["audio_config"]["audio_encoding"]),
-            speaking_rate=self.config["audio_config"]["speaking_rate"],
-            pitch=self.config["audio_config"]["pitch"]
-        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # chunks may be a generator; each chunk is submitted as it is produced
+            # A chunk is either text or a (text, options) pair for synthesize_single_chunk
+            futures = [
+                executor.submit(self.synthesize_single_chunk, chunk, f"{i:03d}")
+                if isinstance(chunk, str) else
+                executor.submit(self.synthesize_single_chunk, chunk[0], f"{i:03d}", **chunk[1])
+                for i, chunk in enumerate(chunks, 1)
+            ]
+            print(f"📊 Split into {len(futures)} chunks")
+            
+            # Collect results in submission order so audio stays in sequence
+            chunk_files = []
+            for i, future in enumerate(futures, 1):
+                chunk_file = future.result()
+                if not chunk_file:
+                    print(f"❌ Failed to process chunk {i}")
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                chunk_files.append(chunk_file)
+                if on_chunk:
+                    on_chunk(chunk_file)
+        
+        reused = self.stats["chunk_cache_hits"] - hits_before
+        if reused:
+            print(f"♻️  Reused {reused}/{len(futures)} cached chunks")
+        return chunk_files
+    
+    def synthesize_single_chunk(self, text, chunk_suffix="", voice=None, ssml=False):
+        """Synthesize a single text or SSML chunk, optionally with a voice other than the configured one"""
+        voice = voice or self.config["voice"]
         
-        # Generate cache filename
+        # Chunks are cached by content so unchanged text never hits the API
         if chunk_suffix:
-            content_hash = hashlib.md5(f"{text}{self.config['voice']['name']}".encode()).hexdigest()[:8]
-            cache_file = self.cache_dir / f"tts-chunk-{chunk_suffix}-{content_hash}.mp3"
+            cache_file = self.get_chunk_cache_filename(text, voice, ssml)
+            if self.cache.contains(cache_file):
+                self._count("chunk_cache_hits")
+                self.cache.touch(cache_file)
+                return cache_file
         else:
-            cache_file = self.get_cache_filename(text, self.config["voice"]["name"])
+            cache_file = self.get_cache_filename(text, voice["name"])
+        
+        engine = self.engine
+        def request():
+            self._count("api_calls")
+            return engine.synthesize(text, voice, self.config["audio_config"], ssml)
+        
+        # Paced under the API quotas, with transient failures retried
+        try:
+            audio_content = self.scheduler.run(request, len(text), metered=engine.name == "google")
+        except Exception as e:
+            print(f"❌ Error generating speech: {e}")
+            return None
         
         try:
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
+            # Save audio atomically so an interrupted write never leaves a
+            # truncated file behind in the cache
+            temp_file = cache_file.with_name(f"{cache_file.name}.{threading.get_ident()}.tmp")
+            with open(temp_file, "wb") as out:
+                out.write(audio_content)
+            os.replace(temp_file, cache_file)
+            self._count("characters_synthesized", len(text))
+            self._count("audio_bytes", len(audio_content))
+            self.cache.add(
+                cache_file,
+                kind="chunk" if chunk_suffix else "document",
+                voice=voice["name"],
+                characters=len(text)
             )
             
-            # Save audio
-            with open(cache_file, "wb") as out:
-                out.write(response.audio_content)
-            
             if not chunk_suffix:
                 print(f"✅ Audio generated: {cache_file.name}")
             return cache_file
             
         except Exception as e:
-            print(f"❌ Error generating speech: {e}")
+            print(f"❌ Error saving audio: {e}")
             return None
     
     def combine_audio_chunks(self, chunk_files, output_file):
-        """Combine multiple audio chunks into a single file"""
+        """Combine multiple audio chunks into a single file without loading them into memory"""
+        output_file = Path(output_file)
+        temp_file = output_file.with_name(f"{output_file.name}.{threading.get_ident()}.tmp")
+        
         try:
-            # Try to use ffmpeg for combining
-            if subprocess.run(['which', 'ffmpeg'], capture_output=True).returncode == 0:
-                print("🔗 Combining audio chunks with ffmpeg...")
-                
-                # Create input list for ffmpeg
-                input_list = self.cache_dir / "input_list.txt"
-                with open(input_list, "w") as f:
-                    for chunk_file in chunk_files:
-                        f.write(f"file '{chunk_file.absolute()}'\n")
-                
-                # Combine with ffmpeg
-                result = subprocess.run([
-                    'ffmpeg', '-f', 'concat', '-safe', '0', '-i', str(input_list),
-                    '-c', 'copy', str(output_file), '-y'
-                ], capture_output=True, text=True)
-                
-                input_list.unlink()  # Clean up
-                
-                if result.returncode == 0:
-                    print(f"✅ Combined audio saved: {output_file.name}")
-                    return output_file
+            print(f"🔗 Combining {len(chunk_files)} audio chunks...")
+            with open(temp_file, 'wb') as out:
+                if output_file.suffix == ".mp3":
+                    self._write_mp3_chunks(chunk_files, out)
+                elif output_file.suffix == ".wav":
+                    self._write_wav_chunks(chunk_files, out)
                 else:
-                    print(f"❌ ffmpeg error: {result.stderr}")
-                    return None
-            else:
-                # Fallback: just use the first chunk
-                print("⚠️  ffmpeg not found, using first chunk only")
-                first_chunk = chunk_files[0]
-                import shutil
-                shutil.copy2(first_chunk, output_file)
-                return output_file
-                
+                    # Raw PCM and chained Ogg streams concatenate byte for byte
+                    for chunk_file in chunk_files:
+                        copy_byte_range(chunk_file, out, 0, Path(chunk_file).stat().st_size)
+            
+            os.replace(temp_file, output_file)
+            print(f"✅ Combined audio saved: {output_file.name}")
+            return output_file
+            
         except Exception as e:
             print(f"❌ Error combining audio: {e}")
+            try:
+                temp_file.unlink()
+            except FileNotFoundError:
+                pass
+            return None
+    
+    def _write_mp3_chunks(self, chunk_files, out):
+        """Stream MP3 frames from each chunk, dropping per-chunk tags and VBR headers"""
+        for i, chunk_file in enumerate(chunk_files):
+            start, end = mp3_audio_range(chunk_file)
+            if i:
+                out.write(self._mp3_pause(chunk_file, start))
+            copy_byte_range(chunk_file, out, start, end - start)
+    
+    def _mp3_pause(self, chunk_file, start):
+        """Silent frames to insert before an MP3 chunk, matching its first frame"""
+        pause_ms = self.config["postprocess"]["chunk_pause_ms"]
+        if not pause_ms:
+            return b""
+        with open(chunk_file, 'rb') as f:
+            f.seek(start)
+            header = f.read(4)
+        return mp3_silence(header, pause_ms) if parse_mp3_frame_header(header) else b""
+    
+    def _write_wav_chunks(self, chunk_files, out):
+        """Stream WAV sample data from each chunk under one rewritten RIFF header"""
+        fmt, _, _ = wav_audio_range(chunk_files[0])
+        fmt_padding = b"\x00" * (len(fmt) & 1)
+        
+        # Sizes are placeholders until all sample data has been written
+        out.write(b"RIFF" + struct.pack("<I", 0) + b"WAVE")
+        out.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt + fmt_padding)
+        out.write(b"data" + struct.pack("<I", 0))
+        
+        # Silence between chunks, rounded to whole sample frames (fmt: channels, rate, byte rate, block align)
+        _, _, sample_rate, _, block_align = struct.unpack("<HHIIH", fmt[:14])
+        pause_ms = self.config["postprocess"]["chunk_pause_ms"]
+        pause = bytes(int(sample_rate * pause_ms / 1000) * block_align)
+        
+        data_size = 0
+        for i, chunk_file in enumerate(chunk_files):
+            chunk_fmt, start, length = wav_audio_range(chunk_file)
+            if chunk_fmt != fmt:
+                raise ValueError(f"{Path(chunk_file).name} has a different WAV format")
+            if i and pause:
+                out.write(pause)
+                data_size += len(pause)
+            copy_byte_range(chunk_file, out, start, length)
+            data_size += length
+        
+        if data_size & 1:
+            out.write(b"\x00")
+        
+        # RIFF size counts everything after its own field: "WAVE", fmt chunk, data chunk
+        riff_header_size = 4 + 8 + len(fmt) + len(fmt_padding) + 8
+        out.seek(4)
+        out.write(struct.pack("<I", riff_header_size + data_size + (data_size & 1)))
+        out.seek(8 + riff_header_size - 4)
+        out.write(struct.pack("<I", data_size))
+    
+    def get_normalized_cache_filename(self, audio_file):
+        """Generate a cache filename from the input audio bytes and loudness settings"""
+        settings = {key: self.config["postprocess"][key] for key in NORMALIZE_SETTINGS}
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        with open(audio_file, 'rb') as f:
+            for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b""):
+                digest.update(block)
+        return self.cache_dir / f"tts-v{CACHE_KEY_VERSION}-norm-{digest.hexdigest()}{Path(audio_file).suffix}"
+    
+    def loudness_filters(self, measured=None):
+        """Build the ffmpeg filter graph: optional silence trim, then EBU R128 loudnorm"""
+        settings = self.config["postprocess"]
+        filters = []
+        if settings["trim_silence"]:
+            # silenceremove only trims the start, so trim, reverse, trim again and reverse back
+            trim = f"silenceremove=start_periods=1:start_threshold={settings['silence_threshold_db']}dB"
+            filters += [trim, "areverse", trim, "areverse"]
+        
+        loudnorm = f"loudnorm=I={settings['target_lufs']}:TP={settings['true_peak_db']}:LRA={settings['loudness_range']}"
+        if measured:
+            loudnorm += (
+                f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+                f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+                f":offset={measured['target_offset']}:linear=true"
+            )
+        else:
+            loudnorm += ":print_format=json"
+        filters.append(loudnorm)
+        return ",".join(filters)
+    
+    @staticmethod
+    def parse_loudnorm_stats(stderr):
+        """Extract the loudnorm measurement JSON from ffmpeg's stderr"""
+        match = LOUDNORM_JSON.search(stderr)
+        if not match:
+            raise ValueError("ffmpeg did not report loudness measurements")
+        return json.loads(match.group(0))
+    
+    def normalize_audio(self, audio_file, output_file=None):
+        """Loudness-normalize audio with a two-pass ffmpeg loudnorm, caching the result
+        
+        Returns the normalized file, or the input unchanged if ffmpeg is unavailable
+        or fails. output_file, if given, receives a copy of the normalized audio.
+        """
+        audio_file = Path(audio_file)
+        suffix = audio_file.suffix
+        if suffix not in NORMALIZED_CODECS:
+            print(f"⚠️  Cannot normalize {suffix or 'extensionless'} audio: {audio_file.name}")
+            return audio_file
+        
+        cache = self.cache
+        normalized = self.get_normalized_cache_filename(audio_file)
+        if cache.contains(normalized):
+            self._count("normalize_cache_hits")
+            cache.touch(normalized)
+        else:
+            ffmpeg = shutil.which("ffmpeg")
+            if not ffmpeg:
+                print("⚠️  ffmpeg not found - skipping loudness normalization")
+                return audio_file
+            
+            # Resampling is only needed by loudnorm internally; keep the input rate
+            sample_rate = audio_sample_rate(audio_file)
+            rate_args = ["-ar", str(sample_rate)] if sample_rate else []
+            temp_file = normalized.with_name(normalized.name + ".tmp")
+            try:
+                measure = subprocess.run(
+                    [ffmpeg, "-hide_banner", "-nostats", "-i", str(audio_file),
+                     "-af", self.loudness_filters(), "-f", "null", "-"],
+                    capture_output=True, text=True, check=True
+                )
+                measured = self.parse_loudnorm_stats(measure.stderr)
+                subprocess.run(
+                    [ffmpeg, "-hide_banner", "-nostats", "-loglevel", "error", "-y", "-i", str(audio_file),
+                     "-af", self.loudness_filters(measured), *rate_args, *NORMALIZED_CODECS[suffix],
+                     "-f", suffix.lstrip("."), str(temp_file)],
+                    capture_output=True, text=True, check=True
+                )
+            except subprocess.CalledProcessError as e:
+                temp_file.unlink(missing_ok=True)
+                reason = e.stderr.strip().splitlines()[-1] if e.stderr and e.stderr.strip() else f"exit status {e.returncode}"
+                print(f"❌ Loudness normalization failed for {audio_file.name}: {reason}")
+                return audio_file
+            except ValueError as e:
+                print(f"❌ Loudness normalization failed for {audio_file.name}: {e}")
+                return audio_file
+            
+            os.replace(temp_file, normalized)
+            cache.add(normalized, kind="normalized", source=audio_file.name)
+            self._count("normalized")
+            print(f"🔊 Normalized {audio_file.name} from {float(measured['input_i']):.1f} to {self.config['postprocess']['target_lufs']} LUFS")
+        cache.save()
+        
+        if output_file:
+            shutil.copyfile(normalized, output_file)
+            return Path(output_file)
+        return normalized
+    
+    def postprocess_audio(self, audio_file):
+        """Apply the configured postprocess stage to synthesized audio"""
+        if not audio_file or not self.config["postprocess"]["normalize"]:
+            return audio_file
+        return self.normalize_audio(audio_file)
+    
+    def synthesize_dialogue(self, text):
+        """Synthesize a speaker-tagged script as one scene track with a voice per character"""
+        if not self.engine:
+            print("❌ TTS client not initialized - call TTSReader(init_client=True)")
+            return None
+        
+        passages = self.parse_dialogue(text)
+        if not passages:
+            print("❌ No readable dialogue found")
             return None
+        
+        speakers = sorted({speaker for speaker, _ in passages if speaker})
+        unmapped = [speaker for speaker in speakers if self.voice_for_speaker(speaker) == self.config["voice"]]
+        requests = self.build_dialogue_requests(passages)
+        print(f"🎭 {len(passages)} passages from {len(speakers)} speakers in {len(requests)} SSML requests")
+        if unmapped:
+            print(f"⚠️  No voice configured for {', '.join(unmapped)} - using {self.config['voice']['name']}")
+        
+        cache = self.cache
+        scene_file = self.get_scene_cache_filename(requests)
+        if cache.contains(scene_file):
+            print(f"🎵 Using cached scene: {scene_file.name}")
+            self._count("document_cache_hits")
+            cache.touch(scene_file)
+            cache.save()
+            return self.postprocess_audio(scene_file)
+        
+        chunk_files = self.synthesize_chunks([(ssml, {"voice": voice, "ssml": True}) for ssml, voice in requests])
+        scene = self.combine_audio_chunks(chunk_files, scene_file) if chunk_files else None
+        if scene:
+            cache.add(scene, kind="scene", speakers=speakers)
+            removed, freed = cache.prune(protect=[scene])
+            if removed:
+                print(f"🧹 Evicted {removed} cached files ({freed / 1024 / 1024:.1f} MB)")
+        cache.save()
+        return self.postprocess_audio(scene)
+    
+    def stream_speech(self, text, voice_name=None):
+        """Play text while it is synthesized, starting with the first chunk"""
+        if not self.engine:
+            print("❌ TTS client not initialized - call TTSReader(init_client=True)")
+            return False
+        
+        if voice_name:
+            self.config["voice"]["name"] = voice_name
+        
+        cache = self.cache
+        cache_file = self.get_cache_filename(text, self.config["voice"]["name"])
+        if cache.contains(cache_file):
+            print(f"🎵 Using cached audio: {cache_file.name}")
+            self._count("document_cache_hits")
+            cache.touch(cache_file)
+            cache.save()
+            self.time_to_first_audio = 0.0
+            return self.play_audio(cache_file)
+        
+        # MP3 frames can be concatenated on the fly; other encodings need a full file
+        player = self._open_stream_player() if self.get_audio_extension() == ".mp3" else None
+        if not player:
+            print("⚠️  Streaming playback unavailable - synthesizing the whole document first")
+            return self.play_audio(self.synthesize_speech(text))
+        
+        started = time.monotonic()
+        self.time_to_first_audio = None
+        temp_file = cache_file.with_name(cache_file.name + ".tmp")
+        fed = []
+        
+        def feed(chunk_file):
+            # The combined file is written in the same pass that feeds the player
+            start, end = mp3_audio_range(chunk_file)
+            pause = self._mp3_pause(chunk_file, start) if fed else b""
+            fed.append(chunk_file)
+            out.write(pause)
+            copy_byte_range(chunk_file, out, start, end - start)
+            if player.stdin.closed:
+                return
+            try:
+                player.stdin.write(pause)
+                copy_byte_range(chunk_file, player.stdin, start, end - start)
+                player.stdin.flush()
+            except (BrokenPipeError, OSError):
+                # Player was closed; keep building the cached file
+                player.stdin.close()
+                return
+            if self.time_to_first_audio is None:
+                self.time_to_first_audio = time.monotonic() - started
+                print(f"⏱️  First audio after {self.time_to_first_audio:.2f}s")
+        
+        try:
+            with open(temp_file, 'wb') as out:
+                chunk_files = self.synthesize_chunks(self.iter_text_chunks(text), on_chunk=feed)
+        finally:
+            if not player.stdin.closed:
+                try:
+                    player.stdin.close()
+                except BrokenPipeError:
+                    pass
+        
+        if not chunk_files:
+            temp_file.unlink(missing_ok=True)
+            player.terminate()
+            return False
+        
+        os.replace(temp_file, cache_file)
+        cache.add(cache_file, kind="document", voice=self.config["voice"]["name"])
+        removed, freed = cache.prune(protect=[cache_file])
+        if removed:
+            print(f"🧹 Evicted {removed} cached files ({freed / 1024 / 1024:.1f} MB)")
+        cache.save()
+        print(f"💾 Cached combined audio: {cache_file.name}")
+        
+        player.wait()
+        print("✅ Playback completed")
+        return True
+    
+    def _open_stream_player(self):
+        """Start the first available player that reads MP3 from stdin"""
+        for cmd in STREAM_PLAYERS:
+            if subprocess.run(['which', cmd[0]], capture_output=True).returncode == 0:
+                print(f"🔊 Streaming to {cmd[0]} as chunks are synthesized...")
+                return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        return None
     
     def play_audio(self, audio_file):
         """Play audio file using MPV with interactive controls"""
@@ -449,6 +1895,139 @@ class TTSReader:
             print(f"❌ Error opening file in editor: {e}")
             return False
     
+    def discover_batch_files(self, spec):
+        """Expand a directory or glob pattern into a sorted list of markdown files"""
+        path = Path(spec)
+        if path.is_dir():
+            candidates = path.rglob("*.md")
+        else:
+            candidates = (Path(match) for match in glob.glob(spec, recursive=True))
+        return sorted({f for f in candidates if f.suffix == ".md" and f.is_file()})
+    
+    def synthesize_batch(self, file_paths):
+        """Synthesize many markdown files with one client and one shared worker pool"""
+        if not self.engine:
+            print("❌ TTS client not initialized - call TTSReader(init_client=True)")
+            return None
+        
+        start_time = time.time()
+        stats_before = dict(self.stats)
+        cache = self.cache
+        results = {}
+        
+        # Read and clean every file once, grouping files with identical text
+        documents = {}
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    clean_text = self.clean_markdown(f.read())
+            except Exception as e:
+                print(f"❌ Error reading {file_path}: {e}")
+                results[str(file_path)] = None
+                continue
+            
+            if not clean_text.strip():
+                print(f"⚠️  No readable text in {file_path}, skipping")
+                results[str(file_path)] = None
+                continue
+            
+            cache_file = self.get_cache_filename(clean_text, self.config["voice"]["name"])
+            document = documents.setdefault(cache_file, {"text": clean_text, "files": []})
+            document["files"].append(str(file_path))
+        
+        print(f"📚 Batch: {len(file_paths)} files, {len(documents)} unique documents")
+        
+        # Documents already rendered need no work at all
+        pending = {}
+        for cache_file, document in documents.items():
+            if cache.contains(cache_file):
+                self._count("document_cache_hits")
+                cache.touch(cache_file)
+                document["audio"] = cache_file
+            else:
+                pending[cache_file] = document
+        
+        # Schedule every remaining document or chunk on a single pool,
+        # sharing identical chunks between documents
+        max_workers = max(1, int(self.config["synthesis"].get("max_workers", 1)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chunk_futures = {}
+            for document in pending.values():
+                text = document["text"]
+                if len(text.encode('utf-8')) > 4500:
+                    document["chunked"] = True
+                    document["futures"] = []
+                    for i, chunk in enumerate(self.iter_text_chunks(text), 1):
+                        if chunk not in chunk_futures:
+                            chunk_futures[chunk] = executor.submit(self.synthesize_single_chunk, chunk, f"{i:03d}")
+                        document["futures"].append(chunk_futures[chunk])
+                else:
+                    document["chunked"] = False
+                    document["futures"] = [executor.submit(self.synthesize_single_chunk, text)]
+            
+            for cache_file, document in pending.items():
+                audio_files = [future.result() for future in document["futures"]]
+                if not all(audio_files):
+                    print(f"❌ Failed to synthesize {document['files'][0]}")
+                    document["audio"] = None
+                elif document["chunked"]:
+                    document["audio"] = self.combine_audio_chunks(audio_files, cache_file)
+                    if document["audio"]:
+                        cache.add(document["audio"], kind="document", voice=self.config["voice"]["name"])
+                else:
+                    document["audio"] = audio_files[0]
+        
+        # Normalize each unique document once, running ffmpeg processes side by side
+        if self.config["postprocess"]["normalize"]:
+            rendered = [document for document in documents.values() if document["audio"]]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                normalized = executor.map(self.normalize_audio, [document["audio"] for document in rendered])
+                for document, audio in zip(rendered, normalized):
+                    document["audio"] = audio
+        
+        for document in documents.values():
+            for file_path in document["files"]:
+                results[file_path] = document["audio"]
+        
+        cache.prune(protect=[audio for audio in results.values() if audio])
+        cache.save()
+        
+        self.print_batch_summary(results, len(documents), stats_before, time.time() - start_time)
+        return results
+    
+    def print_batch_summary(self, results, unique_documents, stats_before, elapsed):
+        """Print end-of-run statistics for a batch render"""
+        delta = {key: self.stats[key] - stats_before.get(key, 0) for key in self.stats}
+        failed = sum(1 for audio in results.values() if not audio)
+        
+        print("\n📊 Batch Summary:")
+        print("=" * 30)
+        print(f"  Files: {len(results):,} ({unique_documents:,} unique documents)")
+        print(f"  Document cache hits: {delta['document_cache_hits']:,}")
+        print(f"  Chunk cache hits: {delta['chunk_cache_hits']:,}")
+        print(f"  API calls: {delta['api_calls']:,}")
+        print(f"  Characters synthesized: {delta['characters_synthesized']:,}")
+        print(f"  Audio generated: {delta['audio_bytes'] / 1024 / 1024:.1f} MB")
+        print(f"  Failed: {failed:,}")
+        print(f"  Elapsed: {elapsed:.1f}s")
+        if self._scheduler and self._scheduler.throttled:
+            print(f"  Waiting for quota: {self._scheduler.throttled:.1f}s")
+    
+    def print_quota_usage(self):
+        """Print month-to-date API usage from the quota ledger"""
+        quota = self.config["quota"]
+        usage = self.scheduler.ledger.month_to_date()
+        free = quota["monthly_free_characters"]
+        
+        print("\n📈 API Quota:")
+        print("=" * 30)
+        print(f"  Month to date ({time.strftime('%Y-%m')}): {usage['characters']:,} characters in {usage['requests']:,} requests")
+        if free:
+            remaining = free - usage["characters"]
+            status = f"{remaining:,} remaining" if remaining >= 0 else f"{-remaining:,} over - billed usage"
+            print(f"  Free tier: {free:,} characters ({status})")
+        print(f"  Rate limits: {quota['requests_per_minute']:,} requests/min, {quota['characters_per_minute']:,} characters/min")
+    
     def read_character(self, character_name, voice_name=None):
         """Read a character by name (auto-discovers file)"""
         file_path = self.find_character_file(character_name)
@@ -464,16 +2043,36 @@ class TTSReader:
     
     def list_available_characters(self):
         """List all available character files"""
-        char_files = glob.glob("content/characters/**/*.md", recursive=True)
+        characters = self.character_index.characters()
         
-        if not char_files:
+        if not characters:
             print("  No character files found")
             return
         
-        for file_path in sorted(char_files):
-            char_name = Path(file_path).stem
+        for char_name, file_path in characters:
             print(f"  {char_name} ({file_path})")
     
+    def print_cache_stats(self):
+        """Print audio cache usage from the index"""
+        stats = self.cache.stats()
+        print("\n🗄️  Audio Cache:")
+        print("=" * 30)
+        print(f"  Location: {self.cache_dir}")
+        print(f"  Entries: {stats['entries']:,}")
+        for kind, count in sorted(stats["kinds"].items()):
+            print(f"    {kind}: {count:,}")
+        if stats["legacy"]:
+            print(f"  Outdated key version: {stats['legacy']:,} (removed by --cache-prune)")
+        print(f"  Size: {stats['total_bytes'] / 1024 / 1024:.1f} MB")
+        if stats["max_bytes"]:
+            print(f"  Size limit: {stats['max_bytes'] / 1024 / 1024:.1f} MB")
+        if stats["max_entries"]:
+            print(f"  Entry limit: {stats['max_entries']:,}")
+        if stats["oldest_access"]:
+            oldest = time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["oldest_access"]))
+            newest = time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["newest_access"]))
+            print(f"  Last access: {oldest} (oldest) → {newest} (newest)")
+    
     def read_file(self, file_path, voice_name=None):
         """Read a markdown file aloud"""
         file_path = Path(file_path)
@@ -496,6 +2095,10 @@ class TTSReader:
             print(f"❌ Error reading file: {e}")
             return False
         
+        # Dialogue scripts are voiced per speaker from the raw text
+        if self.config["dialogue"].get("enabled", False):
+            return self.read_dialogue(raw_text)
+        
         # Clean markdown
         clean_text = self.clean_markdown(raw_text)
         
@@ -505,14 +2108,20 @@ class TTSReader:
         
         print(f"📊 Processed text length: {len(clean_text):,} characters")
         
-        # If no TTS client (test mode), just show the processed text
-        if not self.client:
+        # If no TTS backend (test mode), just show the processed text
+        if not self.engine:
             print("🧪 Test mode - showing first 200 characters of processed text:")
             print("-" * 50)
             print(clean_text[:200] + "..." if len(clean_text) > 200 else clean_text)
             print("-" * 50)
             return True
         
+        # Stream playback while later chunks are still being synthesized
+        # Normalization needs the whole file, so it takes precedence over streaming
+        streaming = self.config["playback"].get("stream", False) and not self.config["postprocess"]["normalize"]
+        if self.config["playback"]["auto_play"] and streaming:
+            return self.stream_speech(clean_text, voice_name)
+        
         # Generate speech
         audio_file = self.synthesize_speech(clean_text, voice_name)
         
@@ -526,6 +2135,150 @@ class TTSReader:
             print(f"🎵 Audio saved: {audio_file}")
             return True
 
+    def read_dialogue(self, raw_text):
+        """Voice a speaker-tagged script and play the assembled scene"""
+        # If no TTS backend (test mode), show how the script will be voiced
+        if not self.engine:
+            passages = self.parse_dialogue(raw_text)
+            print(f"🧪 Test mode - {len(passages)} passages:")
+            print("-" * 50)
+            for speaker, spoken in passages:
+                voice = self.voice_for_speaker(speaker)
+                print(f"{speaker or 'Narrator'} ({voice['name']}): {spoken[:60]}")
+            print("-" * 50)
+            return True
+        
+        scene = self.synthesize_dialogue(raw_text)
+        if not scene:
+            return False
+        
+        if self.config["playback"]["auto_play"]:
+            return self.play_audio(scene)
+        print(f"🎵 Scene saved: {scene}")
+        return True
+
+class TTSRequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON requests on one client connection"""
+    
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+
+class TTSServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Resident server keeping one warm TTS client and cache index for many CLI calls"""
+    
+    daemon_threads = True
+    
+    def __init__(self, socket_path, tts):
+        self.socket_path = Path(socket_path)
+        self.tts = tts
+        self.in_flight = {}  # Cache file -> Future shared by identical concurrent requests
+        self.in_flight_lock = threading.Lock()
+        self.requests_served = 0
+        
+        if self.socket_path.exists():
+            if server_is_running(self.socket_path):
+                raise RuntimeError(f"A TTS server is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # Left behind by a server that did not shut down cleanly
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.socket_path), TTSRequestHandler)
+    
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+    
+    def synthesize(self, text, voice_name=None):
+        """Synthesize text, sharing one synthesis between identical in-flight requests"""
+        voice = dict(self.tts.config["voice"])
+        if voice_name:
+            voice["name"] = voice_name
+        key = self.tts.get_cache_filename(text, voice["name"])
+        
+        with self.in_flight_lock:
+            future = self.in_flight.get(key)
+            shared = future is not None
+            if not shared:
+                future = self.in_flight[key] = Future()
+        
+        if shared:
+            return future.result(), True
+        
+        try:
+            future.set_result(self.tts.synthesize_speech(text, voice=voice))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self.in_flight_lock:
+                del self.in_flight[key]
+        return future.result(), False
+    
+    def dispatch(self, request):
+        """Handle one request: ping, synthesize, read or shutdown"""
+        op = request.get("op")
+        with self.in_flight_lock:
+            self.requests_served += 1
+        
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "requests": self.requests_served, "stats": dict(self.tts.stats)}
+        
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        
+        if op == "read":
+            source = request["input"]
+            if not Path(source).is_file():
+                source = self.tts.find_character_file(source)
+                if not source:
+                    return {"ok": False, "error": f"Character '{request['input']}' not found"}
+            with open(source, 'r', encoding='utf-8') as f:
+                text = self.tts.clean_markdown(f.read())
+        elif op == "synthesize":
+            text = request["text"]
+        else:
+            return {"ok": False, "error": f"Unknown op: {op}"}
+        
+        if not text.strip():
+            return {"ok": False, "error": "No readable text"}
+        audio_file, shared = self.synthesize(text, request.get("voice"))
+        if not audio_file:
+            return {"ok": False, "error": "Synthesis failed"}
+        
+        response = {"ok": True, "audio": str(Path(audio_file).resolve()), "shared": shared}
+        if op == "read":
+            response["source"] = str(source)
+        return response
+
+
+def send_server_request(socket_path, request, timeout=None):
+    """Send one JSON request to a running TTS server and return its response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        with sock.makefile('rb') as responses:
+            line = responses.readline()
+    if not line:
+        raise ConnectionError("TTS server closed the connection")
+    return json.loads(line)
+
+
+def server_is_running(socket_path):
+    """Check whether a TTS server answers on the socket"""
+    try:
+        return send_server_request(socket_path, {"op": "ping"}, timeout=2).get("ok", False)
+    except (OSError, ValueError):
+        return False
+
+
 def main():
     parser = argparse.ArgumentParser(description="Read markdown files using Google Cloud TTS")
     parser.add_argument("input", nargs='?', help="Character name or markdown file path to read")
@@ -533,30 +2286,48 @@ def main():
     parser.add_argument("--no-play", action="store_true", help="Don't auto-play audio")
     parser.add_argument("--no-editor", action="store_true", help="Don't auto-open file in editor")
     parser.add_argument("--list-voices", action="store_true", help="List available voices")
+    parser.add_argument("--language", default="en", help="Language code prefix for --list-voices (default: en)")
+    parser.add_argument("--gender", help="Voice gender for --list-voices (MALE, FEMALE, NEUTRAL)")
+    parser.add_argument("--family", help="Voice family for --list-voices (e.g. Neural2, Studio, Chirp3-HD)")
+    parser.add_argument("--json", action="store_true", help="Print --list-voices results as JSON")
+    parser.add_argument("--refresh-voices", action="store_true", help="Fetch the voice catalogue again instead of using the cache")
     parser.add_argument("--test-mode", action="store_true", help="Test mode - process text but don't use TTS")
     parser.add_argument("--list-characters", action="store_true", help="List available characters")
+    parser.add_argument("--workers", type=int, help="Maximum concurrent synthesis requests for long documents")
+    parser.add_argument("--cache-stats", action="store_true", help="Show audio cache usage")
+    parser.add_argument("--batch", metavar="GLOB_OR_DIR", help="Synthesize every markdown file under a directory or matching a glob")
+    parser.add_argument("--cache-prune", action="store_true", help="Evict least recently used audio to fit cache limits")
+    parser.add_argument("--quota", action="store_true", help="Show month-to-date API usage from the quota ledger")
+    parser.add_argument("--stream", action="store_true", help="Start playback as soon as the first chunk is synthesized")
+    parser.add_argument("--dialogue", action="store_true", help="Voice speaker-tagged lines with per-character voices from the config")
+    parser.add_argument("--serve", action="store_true", help="Run a resident TTS server on a Unix socket")
+    parser.add_argument("--via-server", action="store_true", help="Send the read request to a running --serve process")
+    parser.add_argument("--stop-server", action="store_true", help="Shut down a running --serve process")
+    parser.add_argument("--backend", choices=sorted(TTS_BACKENDS), default="google", help="Speech engine: google, local (offline silent audio) or espeak")
+    parser.add_argument("--normalize", action="store_true", help="Loudness-normalize synthesized audio (requires ffmpeg)")
+    parser.add_argument("--normalize-audio", nargs="+", metavar="AUDIO", help="Loudness-normalize existing audio files (e.g. recorded scenes)")
+    parser.add_argument("--output-dir", help="Directory for --normalize-audio output (default: next to each input)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help=f"Unix socket for --serve/--via-server (default: {DEFAULT_SOCKET_PATH})")
     
     args = parser.parse_args()
     
+    # Offline engines need no Google client; google keeps the lazily created client
+    backend = None
+    if args.backend != "google" and not args.test_mode:
+        if args.backend == "espeak" and subprocess.run(['which', 'espeak-ng'], capture_output=True).returncode != 0:
+            print("❌ espeak-ng not found - install it or use --backend local")
+            sys.exit(1)
+        backend = TTS_BACKENDS[args.backend]()
+    
     if args.list_voices:
-        # List available voices
+        # Listing voices must work even when the configured voice is wrong
+        tts = TTSReader(init_client=False, validate_voices=False)
         try:
-            client = texttospeech.TextToSpeechClient()
-            voices = client.list_voices()
-            
-            print("\n🎙️  Available Voices (English):")
-            print("=" * 50)
-            
-            for voice in voices.voices:
-                if voice.language_codes[0].startswith('en-'):
-                    print(f"Name: {voice.name}")
-                    print(f"Language: {voice.language_codes[0]}")
-                    print(f"Gender: {voice.ssml_gender.name}")
-                    print("-" * 30)
+            tts.list_voices(args.language, args.gender, args.family, args.json, args.refresh_voices)
         except Exception as e:
             print(f"❌ Error listing voices: {e}")
         return
-
+    
     if args.list_characters:
         print("\n📚 Available Characters:")
         print("=" * 30)
@@ -564,13 +2335,131 @@ def main():
         tts.list_available_characters()
         return
     
+    if args.quota:
+        TTSReader(init_client=False).print_quota_usage()
+        return
+    
+    if args.cache_stats or args.cache_prune:
+        tts = TTSReader(init_client=False)  # Cache maintenance never calls the API
+        if args.cache_prune:
+            removed, freed = tts.cache.prune()
+            tts.cache.save()
+            print(f"🧹 Evicted {removed} cached files ({freed / 1024 / 1024:.1f} MB)")
+        if args.cache_stats:
+            tts.print_cache_stats()
+        return
+    
+    if args.normalize_audio:
+        tts = TTSReader(init_client=False)  # Normalization runs ffmpeg locally
+        output_dir = Path(args.output_dir) if args.output_dir else None
+        if output_dir:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        failed = 0
+        for audio_path in map(Path, args.normalize_audio):
+            if not audio_path.is_file():
+                print(f"❌ Audio file not found: {audio_path}")
+                failed += 1
+                continue
+            output_file = (output_dir or audio_path.parent) / f"{audio_path.stem}-normalized{audio_path.suffix}"
+            result = tts.normalize_audio(audio_path, output_file)
+            if result == audio_path:
+                failed += 1
+            else:
+                print(f"  {audio_path} → 🎵 {result}")
+        if failed:
+            sys.exit(1)
+        return
+    
+    if args.serve:
+        tts = TTSReader(init_client=True, backend=backend)
+        if args.workers:
+            tts.config["synthesis"]["max_workers"] = args.workers
+        if args.normalize:
+            tts.config["postprocess"]["normalize"] = True
+        try:
+            server = TTSServer(args.socket, tts)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"🛰️  TTS server listening on {args.socket} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        print(f"👋 TTS server stopped after {server.requests_served:,} requests")
+        return
+    
+    if args.stop_server:
+        try:
+            send_server_request(args.socket, {"op": "shutdown"}, timeout=5)
+            print(f"👋 Stopped TTS server on {args.socket}")
+        except OSError as e:
+            print(f"❌ No TTS server on {args.socket}: {e}")
+            sys.exit(1)
+        return
+    
+    if args.batch:
+        tts = TTSReader(init_client=not args.test_mode, backend=backend)
+        if args.voice:
+            tts.config["voice"]["name"] = args.voice
+        if args.workers:
+            tts.config["synthesis"]["max_workers"] = args.workers
+        if args.normalize:
+            tts.config["postprocess"]["normalize"] = True
+        
+        file_paths = tts.discover_batch_files(args.batch)
+        if not file_paths:
+            print(f"❌ No markdown files found for: {args.batch}")
+            sys.exit(1)
+        
+        if args.test_mode:
+            print(f"🧪 Test mode - would synthesize {len(file_paths)} files:")
+            for file_path in file_paths:
+                print(f"  {file_path}")
+            return
+        
+        results = tts.synthesize_batch(file_paths)
+        for file_path, audio_file in results.items():
+            status = f"🎵 {audio_file}" if audio_file else "❌ failed"
+            print(f"  {file_path} → {status}")
+        if not all(results.values()):
+            sys.exit(1)
+        return
+    
     # Check if input is provided when not using list commands
     if not args.input:
-        parser.error("input is required when not using --list-voices or --list-characters")
+        parser.error("input is required when not using --list-voices, --list-characters, --batch, server or cache commands")
+    
+    if args.via_server:
+        # Thin client: the server synthesizes, playback stays in this terminal
+        tts = TTSReader(init_client=False)
+        source = Path(args.input)
+        request = {"op": "read", "input": str(source.resolve()) if source.is_file() else args.input}
+        if args.voice:
+            request["voice"] = args.voice
+        try:
+            response = send_server_request(args.socket, request)
+        except OSError as e:
+            print(f"❌ No TTS server on {args.socket} ({e}) - start one with --serve")
+            sys.exit(1)
+        if not response.get("ok"):
+            print(f"❌ Reading failed: {response.get('error')}")
+            sys.exit(1)
+        
+        print(f"📖 Read: {response['source']}{' (shared in-flight synthesis)' if response['shared'] else ''}")
+        if not args.no_editor and tts.config["playback"].get("auto_open_editor", True):
+            tts.open_in_editor(Path(response["source"]))
+        if args.no_play or not tts.config["playback"]["auto_play"]:
+            print(f"🎵 Audio saved: {response['audio']}")
+        elif not tts.play_audio(Path(response["audio"])):
+            sys.exit(1)
+        return
 
     # Initialize TTS reader (with client for actual TTS operations)
     init_client = not args.test_mode  # Skip TTS client in test mode
-    tts = TTSReader(init_client=init_client)
+    tts = TTSReader(init_client=init_client, backend=backend)
     
     # Override auto-play if requested
     if args.no_play:
@@ -580,6 +2469,19 @@ def main():
     if args.no_editor:
         tts.config["playback"]["auto_open_editor"] = False
     
+    # Override synthesis concurrency if requested
+    if args.workers:
+        tts.config["synthesis"]["max_workers"] = args.workers
+    
+    if args.stream:
+        tts.config["playback"]["stream"] = True
+    
+    if args.dialogue:
+        tts.config["dialogue"]["enabled"] = True
+    
+    if args.normalize:
+        tts.config["postprocess"]["normalize"] = True
+    
     # Determine if input is a file path or character name
     input_path = Path(args.input)
     
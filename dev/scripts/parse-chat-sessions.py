@@ -6,12 +6,148 @@ This script extracts chat conversations from VS Code's stored chat sessions
 and formats them for inclusion in daily session summaries.
 """
 
+import hashlib
 import json
+import re
+import sqlite3
 import sys
 import os
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Sidecar index of per-file request timestamp ranges, so old sessions are never reopened
+SESSION_INDEX_FILE = Path(__file__).resolve().parent.parent / "cache" / "chat-session-index.json"
+SESSION_INDEX_VERSION = 1
+
+# Per-conversation insight candidates, one file per day, keyed by request ID and content hash
+INSIGHT_CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "chat-insights"
+
+# Append-only SQLite store of every parsed conversation, with a full-text index
+CHAT_STORE_FILE = Path(__file__).resolve().parent.parent / "cache" / "chat-history.db"
+CHAT_STORE_VERSION = 1
+
+# Sections a --format bundle document can carry, named after the single formats
+OUTPUT_FORMATS = ('summary', 'insights', 'json')
+
+# Session Activity headings and placeholders, matching daily-session-summary.sh
+SESSION_SECTIONS = [
+    ('tasks_worked_on', "### Tasks Worked On", "- [ ] *Add tasks worked on today*"),
+    ('decisions_made', "### Decisions Made", "- *Add key decisions made during the session*"),
+    ('problems_solved', "### Problems Solved", "- *Add problems encountered and how they were resolved*"),
+    ('ideas_discussed', "### Ideas Discussed", "- *Add new ideas or approaches discussed*"),
+    ('for_next_session', "### ⏭️ For Next Session", "- *Add goals and action items for next session*"),
+    ('notes', "### 💭 Notes", "- *Add any additional context or observations*"),
+]
+
+# Session files are read in blocks of this many characters rather than loaded whole
+STREAM_BLOCK_SIZE = 256 * 1024
+
+# Below this much session data, worker start-up costs more than parallel parsing saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+# Insight categories, in output order: patterns are tried in order, each capturing
+# one candidate; limit caps the items kept and bounds how far the text is scanned
+INSIGHT_RULES = {
+    'tasks_worked_on': {
+        'limit': 5, 'min_length': 20, 'max_length': 120, 'skip_markdown': True,
+        'patterns': [
+            # Implementation patterns with complete sentences or meaningful phrases
+            r"(?:implement(?:ed|ing)?|creat(?:ed|ing)?|build(?:ing|t)?|develop(?:ed|ing)?)\s+([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))",
+            r"(?:work(?:ed|ing)?|add(?:ed|ing)?|fix(?:ed|ing)?)\s+(?:on\s+)?([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))",
+            r"(?:enhanc(?:ed|ing)?|updat(?:ed|ing)?|improv(?:ed|ing)?)\s+([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))",
+            r"(?:set\s+up|configur(?:ed|ing)?|establish(?:ed|ing)?)\s+([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))"
+        ]
+    },
+    'decisions_made': {
+        'limit': 3, 'min_length': 20, 'max_length': 150, 'skip_markdown': True,
+        'patterns': [
+            r"(?:decided?|chose|went\s+with)\s+(?:to\s+)?([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))",
+            r"(?:option|approach|choice)\s+\d*[:.]\s*([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))",
+            r"(?:strategy|plan|direction)[:.]\s*([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))",
+            r"(?:let's|we'll|we\s+should)\s+(?:use|go\s+with|implement)\s+([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))"
+        ]
+    },
+    'problems_solved': {
+        'limit': 3, 'min_length': 15, 'max_length': 150, 'skip_markdown': False,
+        'patterns': [
+            r"(?:issue|problem|error|bug)[:.]\s*([^.!?\n]{15,150}[.!?]?)",
+            r"(?:fixed|solved|resolved|addressed)\s+(?:the\s+)?([^.!?\n]{15,150}[.!?]?)",
+            r"(?:hanging|failing|not\s+working)[:.]\s*([^.!?\n]{15,150}[.!?]?)",
+            r"(?:challenge|difficulty|trouble)[:.]\s*([^.!?\n]{15,150}[.!?]?)"
+        ]
+    },
+    'ideas_discussed': {
+        'limit': 4, 'min_length': 15, 'max_length': 180, 'skip_markdown': False,
+        'patterns': [
+            r"(?:idea|concept|thought)[:.]\s*([^.!?\n]{15,180}[.!?]?)",
+            r"(?:approach|strategy|method)[:.]\s*([^.!?\n]{15,180}[.!?]?)",
+            r"(?:could|might|maybe)\s+(?:we\s+)?([^.!?\n]{15,180}[.!?]?)",
+            r"(?:consider|suggest|recommend)\s+([^.!?\n]{15,180}[.!?]?)",
+            r"(?:what\s+if|how\s+about)\s+([^.!?\n]{15,180}[.!?]?)"
+        ]
+    },
+    'for_next_session': {
+        'limit': 3, 'min_length': 15, 'max_length': 150, 'skip_markdown': False,
+        'patterns': [
+            r"(?:next|later|continue)\s+(?:we\s+)?(?:should\s+|will\s+|need\s+to\s+)?([^.!?\n]{15,150}[.!?]?)",
+            r"(?:need\s+to|should|plan\s+to)\s+([^.!?\n]{15,150}[.!?]?)",
+            r"(?:todo|action\s+item)[:.]\s*([^.!?\n]{15,150}[.!?]?)",
+            r"(?:for\s+next\s+session|tomorrow|future)[:.]\s*([^.!?\n]{15,150}[.!?]?)"
+        ]
+    }
+}
+
+# Patterns are lowercase, so they run without IGNORECASE against case-folded text
+for _rule in INSIGHT_RULES.values():
+    _rule['compiled'] = [re.compile(pattern) for pattern in _rule['patterns']]
+
+# Technical themes worth a note whenever they come up
+CONTEXT_PATTERNS = [
+    (re.compile(pattern), note) for pattern, note in [
+        (r"git\s+commit.*hang", "Git commit hanging issue identified and addressed"),
+        (r"multi-?line.*(?:command|issue|problem)", "Multi-line command execution challenges discussed"),
+        (r"automation.*(?:improve|implement|enhance)", "Automation improvements implemented"),
+        (r"vs\s*code.*(?:chat|copilot|integration)", "VS Code/Copilot integration work"),
+        (r"(?:folder|directory).*(?:structure|organization)", "Project structure and organization improvements"),
+        (r"workflow.*(?:create|establish|document)", "Workflow documentation and processes established"),
+        (r"(?:sync|backup).*(?:google\s*drive|git)", "Sync and backup processes implemented"),
+        (r"(?:series\s*bible|character.*profile)", "Creative project development and character work")
+    ]
+]
+
+# Characters of the following conversations read when scanning across a seam: a match
+# only runs into the next conversation through the whitespace after its keyword, so it
+# reads at most one capture (and its closing punctuation) of it
+SEAM_CHARS = 256
+
+# Position of each category's candidates in cached conversation records
+CATEGORY_INDEX = {category: position for position, category in enumerate(INSIGHT_RULES)}
+
+# Literal terms behind the last two notes, which may appear in different conversations
+NOTE_TERMS = ('parse-chat-sessions', 'heartbeat', 'automation')
+
+MARKDOWN_ARTIFACTS = ('```', '##', '**', '- [')
+WHITESPACE = re.compile(r'\s+')
+
+# Changing any rule, or the layout of cached records, invalidates cached insight candidates
+INSIGHT_CACHE_LAYOUT = 2
+INSIGHT_RULES_VERSION = hashlib.blake2b(json.dumps([
+    INSIGHT_CACHE_LAYOUT,
+    {category: {key: value for key, value in rule.items() if key != 'compiled'}
+     for category, rule in INSIGHT_RULES.items()},
+    [(pattern.pattern, note) for pattern, note in CONTEXT_PATTERNS],
+    NOTE_TERMS
+]).encode('utf-8'), digest_size=8).hexdigest()
+
+# Streaming scanner tokens
+NON_WHITESPACE = re.compile(r'\S')
+STRING_CHARS = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+STRUCTURAL_CHARS = re.compile(r'["\[\]{}]')
+SCALAR_CHARS = re.compile(r'[^\s,\]}]*')
 
 
 def find_workspace_chat_dir():
@@ -24,6 +160,200 @@ def find_workspace_chat_dir():
     return None
 
 
+class JsonStream:
+    """
+    Incremental reader over a JSON document that keeps only a small window in memory.
+    
+    Values the caller does not need are skipped without being decoded, so large
+    embedded responses and tool outputs never become Python objects.
+    """
+    
+    def __init__(self, f, block_size=STREAM_BLOCK_SIZE):
+        self.f = f
+        self.block_size = block_size
+        self.buf = ""
+        self.pos = 0
+        self.mark = None  # Start of a value being captured; kept across refills
+    
+    def fill(self):
+        """Drop consumed text and append the next block; False at end of file."""
+        block = self.f.read(self.block_size)
+        if not block:
+            return False
+        cut = self.pos if self.mark is None else min(self.pos, self.mark)
+        self.buf = self.buf[cut:] + block
+        self.pos -= cut
+        if self.mark is not None:
+            self.mark -= cut
+        return True
+    
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            match = NON_WHITESPACE.search(self.buf, self.pos)
+            if match:
+                self.pos = match.start()
+                return match.group()
+            self.pos = len(self.buf)
+            if not self.fill():
+                return ""
+    
+    def expect(self, char):
+        """Consume one structural character, failing on anything else."""
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in JSON stream")
+        self.pos += 1
+    
+    def skip_string(self):
+        """Consume a string, starting at its opening quote."""
+        self.pos += 1
+        while True:
+            end = STRING_CHARS.match(self.buf, self.pos).end()
+            if end < len(self.buf) and self.buf[end] == '"':
+                self.pos = end + 1
+                return
+            # Stopped at the end of the window (possibly mid-escape): read on
+            self.pos = end
+            if not self.fill():
+                raise ValueError("unterminated string in JSON stream")
+    
+    def skip_value(self):
+        """Consume any value without decoding it."""
+        char = self.peek()
+        if char == '"':
+            self.skip_string()
+        elif char in ('[', '{'):
+            depth = 0
+            while True:
+                match = STRUCTURAL_CHARS.search(self.buf, self.pos)
+                if not match:
+                    self.pos = len(self.buf)
+                    if not self.fill():
+                        raise ValueError("unexpected end of JSON stream")
+                    continue
+                self.pos = match.start()
+                if match.group() == '"':
+                    self.skip_string()
+                    continue
+                self.pos += 1
+                depth += 1 if match.group() in '[{' else -1
+                if depth == 0:
+                    return
+        elif char:
+            while True:
+                end = SCALAR_CHARS.match(self.buf, self.pos).end()
+                if end < len(self.buf):
+                    self.pos = end
+                    return
+                self.pos = end
+                if not self.fill():
+                    return
+        else:
+            raise ValueError("unexpected end of JSON stream")
+    
+    def read_value(self):
+        """Consume and decode one value."""
+        self.peek()
+        self.mark = self.pos
+        try:
+            self.skip_value()
+            return json.loads(self.buf[self.mark:self.pos])
+        finally:
+            self.mark = None
+    
+    def iter_object(self):
+        """Yield each key of an object; the caller must consume its value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("expected object key in JSON stream")
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            self._end_item('}')
+            if self.buf[self.pos - 1] == '}':
+                return
+    
+    def iter_array(self):
+        """Yield once per array element; the caller must consume each element."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            self._end_item(']')
+            if self.buf[self.pos - 1] == ']':
+                return
+    
+    def _end_item(self, closing):
+        """Consume the comma or closing bracket after a container item."""
+        char = self.peek()
+        if char not in (',', closing):
+            raise ValueError(f"expected ',' or {closing!r} in JSON stream")
+        self.pos += 1
+
+
+def read_fields(stream, fields):
+    """Read the named fields of an object, skipping everything else."""
+    values = {}
+    for key in stream.iter_object():
+        if key in fields:
+            values[key] = stream.read_value()
+        else:
+            stream.skip_value()
+    return values
+
+
+def read_session_request(stream):
+    """Read the parts of one request that summaries use."""
+    request = {}
+    for key in stream.iter_object():
+        if key in ('timestamp', 'requestId'):
+            request[key] = stream.read_value()
+        elif key == 'message' and stream.peek() == '{':
+            request['message'] = read_fields(stream, ('text',))
+        elif key == 'response' and stream.peek() == '[':
+            parts = []
+            for _ in stream.iter_array():
+                if stream.peek() == '{':
+                    parts.append(read_fields(stream, ('value',)))
+                else:
+                    stream.skip_value()
+            request['response'] = parts
+        elif key in ('message', 'response'):
+            # Unusual shapes are small; keep them for the caller's fallbacks
+            request[key] = stream.read_value()
+        else:
+            stream.skip_value()
+    return request
+
+
+def iter_session_requests(session_file, block_size=STREAM_BLOCK_SIZE):
+    """
+    Stream the requests of a chat session file one at a time.
+    
+    Only timestamp, requestId, message.text and response[*].value are decoded.
+    
+    Raises:
+        ValueError: If the file is not valid session JSON
+    """
+    with open(session_file, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f, block_size)
+        for key in stream.iter_object():
+            if key != 'requests' or stream.peek() != '[':
+                stream.skip_value()
+                continue
+            for _ in stream.iter_array():
+                if stream.peek() == '{':
+                    yield read_session_request(stream)
+                else:
+                    stream.skip_value()
+
+
 def parse_chat_session(session_file, target_date=None):
     """
     Parse a single chat session file and extract conversations from target date.
@@ -36,19 +366,18 @@ def parse_chat_session(session_file, target_date=None):
         List of conversation entries from the target date
     """
     try:
-        with open(session_file, 'r') as f:
-            session_data = json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        return list(iter_session_conversations(session_file, target_date))
+    except (ValueError, IOError) as e:
         print(f"Error reading {session_file}: {e}", file=sys.stderr)
         return []
 
-    conversations = []
-    requests = session_data.get('requests', [])
-    
+
+def iter_session_conversations(session_file, target_date=None):
+    """Yield conversation entries from a session file as its requests stream in."""
     # VS Code now provides individual timestamps for each request!
     # Filter conversations by their actual individual timestamps
     
-    for i, request in enumerate(requests):
+    for request in iter_session_requests(session_file):
         # Use the individual request timestamp (the key discovery!)
         individual_timestamp = request.get('timestamp', 0)
         
@@ -87,22 +416,91 @@ def parse_chat_session(session_file, target_date=None):
             response_text = str(response['value']).strip()
         
         if user_text:  # Only include if there's actual user content
-            conversations.append({
+            yield {
                 'timestamp': msg_date.isoformat(),
                 'user_message': user_text,
                 'copilot_response': response_text,
                 'request_id': request.get('requestId', '')
-            })
+            }
+
+
+def local_timezone_name():
+    """Identify the local timezone, since day buckets depend on it."""
+    return f"{'/'.join(time.tzname)}{time.timezone:+d}"
+
+
+def load_session_index(index_file):
+    """
+    Load the session index, discarding it if written by another version or timezone.
+    
+    Returns:
+        Dict mapping session file paths to their mtime, size and timestamp summary
+    """
+    try:
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
     
-    return conversations
+    if index.get('version') != SESSION_INDEX_VERSION or index.get('timezone') != local_timezone_name():
+        return {}
+    return index.get('files', {})
 
 
-def extract_daily_conversations(target_date=None):
+def write_json_atomic(data, path):
+    """Write a JSON cache file atomically, ignoring unwritable locations."""
+    path = Path(path)
+    temp_file = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # dumps uses the C encoder; dump would stream through the pure-Python one
+        with open(temp_file, 'w') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+        os.replace(temp_file, path)
+    except OSError as e:
+        print(f"Could not write {path}: {e}", file=sys.stderr)
+
+
+def save_session_index(files, index_file):
+    """Write the session index atomically."""
+    write_json_atomic({
+        'version': SESSION_INDEX_VERSION,
+        'timezone': local_timezone_name(),
+        'files': files
+    }, index_file)
+
+
+def summarize_session(conversations):
+    """
+    Summarize a session's conversations for the index.
+    
+    Returns:
+        Dict with min/max request timestamps (ms since epoch) and per-day counts
+    """
+    timestamps = []
+    day_counts = {}
+    for conv in conversations:
+        msg_date = datetime.fromisoformat(conv['timestamp'])
+        timestamps.append(int(msg_date.timestamp() * 1000))
+        day = msg_date.date().isoformat()
+        day_counts[day] = day_counts.get(day, 0) + 1
+    
+    return {
+        'min_ts': min(timestamps) if timestamps else None,
+        'max_ts': max(timestamps) if timestamps else None,
+        'day_counts': day_counts
+    }
+
+
+def extract_daily_conversations(target_date=None, chat_dir=None, index_file=SESSION_INDEX_FILE, jobs=1):
     """
     Extract all conversations from the target date.
     
     Args:
         target_date: datetime.date object (defaults to today)
+        chat_dir: Chat sessions directory (defaults to the workspace's)
+        index_file: Sidecar session index path (None to parse every file)
+        jobs: Worker processes for parsing session files
     
     Returns:
         List of all conversations from target date
@@ -110,26 +508,260 @@ def extract_daily_conversations(target_date=None):
     if target_date is None:
         target_date = datetime.now().date()
     
-    chat_dir = find_workspace_chat_dir()
+    return extract_range_conversations(target_date, target_date, chat_dir, index_file, jobs)[target_date]
+
+
+def extract_range_conversations(start_date, end_date, chat_dir=None, index_file=SESSION_INDEX_FILE, jobs=1):
+    """
+    Extract conversations for every date in a range, reading each session file at most once.
+    
+    Args:
+        start_date: First datetime.date of the range
+        end_date: Last datetime.date of the range (inclusive)
+        chat_dir: Chat sessions directory (defaults to the workspace's)
+        index_file: Sidecar session index path (None to parse every file)
+        jobs: Worker processes for parsing session files
+    
+    Returns:
+        Dict mapping each date in the range to its conversations, sorted by timestamp
+    """
+    days = {start_date + timedelta(days=offset): [] for offset in range((end_date - start_date).days + 1)}
+    
+    chat_dir = chat_dir or find_workspace_chat_dir()
     if not chat_dir:
         print("No chat sessions directory found for current workspace", file=sys.stderr)
-        return []
+        return days
+    
+    session_files = sorted(chat_dir.glob("*.json"))
+    # A single day is filtered while parsing; a range is bucketed afterwards
+    filter_date = start_date if start_date == end_date else None
+    
+    if index_file is None:
+        results = parse_session_files([(session_file, filter_date) for session_file in session_files], jobs)
+        return bucket_conversations(results, days)
+    
+    # Only files with requests inside the range are opened; new or changed
+    # files are parsed in full once to refresh their index entry
+    index = load_session_index(index_file)
+    files = {}
+    tasks = []
+    refreshed = []  # (index key, stat) for each task that re-parses a whole file
+    first_day, last_day = start_date.isoformat(), end_date.isoformat()
+    for session_file in session_files:
+        try:
+            stat = session_file.stat()
+        except OSError:
+            continue
+        
+        key = str(session_file.resolve())
+        entry = index.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            files[key] = entry
+            if any(first_day <= day <= last_day for day in entry['day_counts']):
+                tasks.append((session_file, filter_date))
+                refreshed.append(None)
+            continue
+        
+        tasks.append((session_file, None))
+        refreshed.append((key, stat))
+    
+    results = parse_session_files(tasks, jobs)
+    for conversations, refresh in zip(results, refreshed):
+        if refresh is not None:
+            key, stat = refresh
+            files[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, **summarize_session(conversations)}
+    
+    # Rewrite only when something changed (files added, modified or removed)
+    if files != index:
+        save_session_index(files, index_file)
+    
+    return bucket_conversations(results, days)
+
+
+def bucket_conversations(results, days):
+    """Sort parsed conversations into their local-date buckets, dropping dates outside days."""
+    for conversations in results:
+        for conv in conversations:
+            bucket = days.get(datetime.fromisoformat(conv['timestamp']).date())
+            if bucket is not None:
+                bucket.append(conv)
+    
+    for conversations in days.values():
+        conversations.sort(key=lambda x: x['timestamp'])
+    return days
+
+
+def parse_session_task(task):
+    """Parse one (session_file, target_date) task; module-level so workers can unpickle it."""
+    return parse_chat_session(*task)
+
+
+def parse_session_files(tasks, jobs=1):
+    """
+    Parse session files, spreading them over worker processes when worthwhile.
+    
+    Args:
+        tasks: List of (session_file, target_date) pairs
+        jobs: Maximum worker processes (1 parses in this process)
     
-    all_conversations = []
+    Returns:
+        List of conversation lists, in the same order as tasks
+    """
+    total_bytes = 0
+    for session_file, _ in tasks:
+        try:
+            total_bytes += os.path.getsize(session_file)
+        except OSError:
+            pass
     
-    # Process all session files
-    for session_file in chat_dir.glob("*.json"):
-        conversations = parse_chat_session(session_file, target_date)
-        all_conversations.extend(conversations)
+    if jobs <= 1 or len(tasks) < 2 or total_bytes < PARALLEL_MIN_BYTES:
+        return [parse_chat_session(*task) for task in tasks]
     
-    # Sort by timestamp
-    all_conversations.sort(key=lambda x: x['timestamp'])
+    # Several files per dispatch keeps IPC overhead low; map preserves order
+    workers = min(jobs, len(tasks))
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_session_task, tasks, chunksize=chunksize))
+
+
+def open_chat_store(store_file=CHAT_STORE_FILE):
+    """
+    Open the conversation store, creating it or rebuilding it for a new version or timezone.
     
-    return all_conversations
+    Returns:
+        sqlite3.Connection with conversations, conversations_fts and session_files tables
+    """
+    Path(store_file).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(store_file)
+    
+    # Days are stored in local time, so a timezone change invalidates them like the session index
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    if meta.get('version') != str(CHAT_STORE_VERSION) or meta.get('timezone') != local_timezone_name():
+        conn.executescript("""
+            DROP TABLE IF EXISTS conversations;
+            DROP TABLE IF EXISTS conversations_fts;
+            DROP TABLE IF EXISTS session_files;
+            CREATE TABLE conversations (
+                request_id TEXT PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                day TEXT NOT NULL,
+                user_message TEXT NOT NULL,
+                copilot_response TEXT NOT NULL,
+                session_file TEXT NOT NULL
+            );
+            CREATE INDEX conversations_day ON conversations (day);
+            CREATE VIRTUAL TABLE conversations_fts USING fts5(
+                request_id UNINDEXED, user_message, copilot_response
+            );
+            CREATE TABLE session_files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+        """)
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                         [('version', str(CHAT_STORE_VERSION)), ('timezone', local_timezone_name())])
+        conn.commit()
+    return conn
+
+
+def ingest_sessions(conn, chat_dir, jobs=1):
+    """
+    Add conversations from new or changed session files to the store.
+    
+    Rows are keyed by request ID and never deleted, so history outlives
+    session files that VS Code prunes; edited requests replace their row.
+    
+    Returns:
+        Tuple of (session files parsed, conversations written)
+    """
+    known = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute("SELECT * FROM session_files")}
+    tasks = []
+    stats = []
+    for session_file in sorted(chat_dir.glob("*.json")):
+        try:
+            stat = session_file.stat()
+        except OSError:
+            continue
+        key = str(session_file.resolve())
+        if known.get(key) != (stat.st_mtime_ns, stat.st_size):
+            tasks.append((session_file, None))
+            stats.append((key, stat.st_mtime_ns, stat.st_size))
+    
+    written = 0
+    with conn:
+        for conversations, (key, mtime_ns, size) in zip(parse_session_files(tasks, jobs), stats):
+            for conv in conversations:
+                # Requests without an ID are still unique within their file by timestamp
+                request_id = conv['request_id'] or f"{key}#{conv['timestamp']}"
+                conn.execute("DELETE FROM conversations_fts WHERE request_id = ?", (request_id,))
+                conn.execute("INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?, ?, ?)", (
+                    request_id, conv['timestamp'], conv['timestamp'][:10],
+                    conv['user_message'], conv['copilot_response'], key
+                ))
+                conn.execute("INSERT INTO conversations_fts VALUES (?, ?, ?)",
+                             (request_id, conv['user_message'], conv['copilot_response']))
+                written += 1
+            conn.execute("INSERT OR REPLACE INTO session_files VALUES (?, ?, ?)", (key, mtime_ns, size))
+    return len(tasks), written
+
+
+def search_conversations(conn, query, limit=20):
+    """
+    Full-text search of stored conversations, best matches first.
+    
+    Args:
+        query: SQLite FTS5 query (words, "phrases", prefix*, AND/OR/NOT)
+    
+    Returns:
+        List of conversation dicts with a highlighted snippet
+    """
+    rows = conn.execute("""
+        SELECT c.timestamp, c.request_id, c.session_file, c.user_message,
+               snippet(conversations_fts, -1, '**', '**', '...', 12)
+        FROM conversations_fts JOIN conversations c USING (request_id)
+        WHERE conversations_fts MATCH ?
+        ORDER BY rank LIMIT ?
+    """, (query, limit))
+    return [
+        {'timestamp': timestamp, 'request_id': request_id, 'session_file': session_file,
+         'user_message': user_message, 'snippet': snippet}
+        for timestamp, request_id, session_file, user_message, snippet in rows
+    ]
+
+
+def store_day_counts(conn, start_date=None, end_date=None):
+    """Count stored conversations per local date, optionally within a date range."""
+    first_day = start_date.isoformat() if start_date else ''
+    last_day = end_date.isoformat() if end_date else '9999-12-31'
+    return dict(conn.execute(
+        "SELECT day, COUNT(*) FROM conversations WHERE day BETWEEN ? AND ? GROUP BY day ORDER BY day",
+        (first_day, last_day)
+    ))
+
+
+def store_stats(conn):
+    """Summarize the store: conversation and session counts, time span and active days."""
+    conversations, first, last, days = conn.execute(
+        "SELECT COUNT(*), MIN(timestamp), MAX(timestamp), COUNT(DISTINCT day) FROM conversations"
+    ).fetchone()
+    session_files = conn.execute("SELECT COUNT(DISTINCT session_file) FROM conversations").fetchone()[0]
+    return {
+        'conversations': conversations,
+        'session_files': session_files,
+        'active_days': days,
+        'first': first,
+        'last': last
+    }
 
 
-def analyze_conversations_for_structure(conversations):
-    """Analyze conversations and extract structured insights for session sections."""
+def analyze_conversations_for_structure(conversations, cache_dir=None):
+    """
+    Analyze conversations and extract structured insights for session sections.
+    
+    Without cache_dir the day's combined text goes through extract_insights.
+    With it, conversations are scanned one at a time, each together with the
+    start of the next so that matches running across the seam are kept, and
+    only as far as the caps need; what was scanned is kept per day, so reruns
+    only scan new or edited conversations and the one before each of them.
+    """
     if not conversations:
         return {
             'tasks_worked_on': [],
@@ -140,206 +772,334 @@ def analyze_conversations_for_structure(conversations):
             'notes': []
         }
     
-    # Combine all conversation content for analysis
-    all_content = []
-    for conv in conversations:
-        all_content.append(f"User: {conv['user_message']}")
-        if conv['copilot_response']:
-            all_content.append(f"Assistant: {conv['copilot_response']}")
+    if not cache_dir:
+        return extract_insights('\n'.join(conversation_text(conv) for conv in conversations))
     
-    full_text = '\n'.join(all_content)
+    texts = [conversation_text(conv) for conv in conversations]
+    shards = {}  # day -> cached entries by request ID
+    candidates = []
+    for position, conv in enumerate(conversations):
+        request_id = conv.get('request_id')
+        digest = text_digest(texts[position])
+        # The start of the next conversation, and whether another follows it, which decides where "$" matches
+        following = '\n'.join(texts[position + 1:position + 2] + [text[:1] for text in texts[position + 2:position + 3]])
+        following = following[:SEAM_CHARS]
+        state = None
+        if request_id:
+            day = conv['timestamp'][:10]
+            if day not in shards:
+                shards[day] = load_insight_cache(cache_dir, day)
+            state = shards[day].get(request_id)
+            if state and state['hash'] != digest:
+                state = None
+        candidates.append(ConversationCandidates(conv, texts[position], digest, following, state))
     
     # Analyze content and categorize insights
-    insights = {
-        'tasks_worked_on': extract_tasks(full_text),
-        'decisions_made': extract_decisions(full_text),
-        'problems_solved': extract_problems_and_solutions(full_text),
-        'ideas_discussed': extract_ideas(full_text),
-        'for_next_session': extract_next_steps(full_text),
-        'notes': extract_notable_context(full_text)
-    }
+    insights = merge_candidates(candidates)
+    
+    # Each day's file keeps only that day's current conversations, rewritten when anything changed
+    for day, cached in shards.items():
+        on_day = [c for c in candidates if c.conv.get('request_id') and c.conv['timestamp'][:10] == day]
+        entries = {c.conv['request_id']: c.state for c in on_day}
+        if entries.keys() != cached.keys() or any(c.changed for c in on_day):
+            write_json_atomic({'version': INSIGHT_RULES_VERSION, 'entries': entries},
+                              Path(cache_dir) / f"{day}.json")
     
     return insights
 
 
-def extract_tasks(text):
-    """Extract tasks and implementation work from conversation."""
-    tasks = []
-    # Look for implementation patterns with complete sentences or meaningful phrases
-    patterns = [
-        r"(?:implement(?:ed|ing)?|creat(?:ed|ing)?|build(?:ing|t)?|develop(?:ed|ing)?)\s+([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))",
-        r"(?:work(?:ed|ing)?|add(?:ed|ing)?|fix(?:ed|ing)?)\s+(?:on\s+)?([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))",
-        r"(?:enhanc(?:ed|ing)?|updat(?:ed|ing)?|improv(?:ed|ing)?)\s+([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))",
-        r"(?:set\s+up|configur(?:ed|ing)?|establish(?:ed|ing)?)\s+([a-zA-Z][^.!?\n]{20,120}(?:[.!?]|$))"
-    ]
-    
-    import re
-    processed = set()  # Track processed tasks to avoid duplicates
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            task = match.group(1).strip()
-            # Clean up the task text
-            task = re.sub(r'\s+', ' ', task)  # Normalize whitespace
-            task = task.rstrip('.,;:')  # Remove trailing punctuation
-            
-            # Skip if too short, contains markdown artifacts, or already processed
-            if (20 <= len(task) <= 120 and 
-                task.lower() not in processed and
-                not any(artifact in task for artifact in ['```', '##', '**', '- ['])):
-                processed.add(task.lower())
-                tasks.append(f"- {task}")
+def conversation_text(conv):
+    """Render a conversation the way it appears in the day's combined text."""
+    text = f"User: {conv['user_message']}"
+    if conv['copilot_response']:
+        text += f"\nAssistant: {conv['copilot_response']}"
+    return text
+
+
+def text_digest(text):
+    """Hash the conversation content that insights are extracted from."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def load_insight_cache(cache_dir, day):
+    """Load a day's cached insight candidates, discarding them if the rules changed."""
+    try:
+        with open(Path(cache_dir) / f"{day}.json", 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
     
-    return tasks[:5]  # Limit to top 5 tasks
+    if cache.get('version') != INSIGHT_RULES_VERSION:
+        return {}
+    return cache.get('entries', {})
 
 
-def extract_decisions(text):
-    """Extract key decisions made during the session."""
-    decisions = []
-    patterns = [
-        r"(?:decided?|chose|went\s+with)\s+(?:to\s+)?([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))",
-        r"(?:option|approach|choice)\s+\d*[:.]\s*([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))",
-        r"(?:strategy|plan|direction)[:.]\s*([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))",
-        r"(?:let's|we'll|we\s+should)\s+(?:use|go\s+with|implement)\s+([a-zA-Z][^.!?\n]{20,150}(?:[.!?]|$))"
-    ]
+class ConversationCandidates:
+    """
+    Insight candidates of one conversation, scanned lazily as merge_candidates asks for them.
     
-    import re
-    processed = set()
+    Patterns run over the conversation followed by the start of the day's next
+    conversations, as in the day's combined text, so a match whose keyword ends
+    this conversation keeps the capture that opens the next one.
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            decision = match.group(1).strip()
-            # Clean up the decision text
-            decision = re.sub(r'\s+', ' ', decision)
-            decision = decision.rstrip('.,;:')
-            
-            if (20 <= len(decision) <= 150 and 
-                decision.lower() not in processed and
-                not any(artifact in decision for artifact in ['```', '##', '**', '- ['])):
-                processed.add(decision.lower())
-                decisions.append(f"- {decision}")
+    state is the JSON-ready record kept in the insight cache: a digest of the
+    following text scanned into; for each category, in INSIGHT_RULES order, an
+    [items, entry, exit] triple per pattern scanned so far, where entry is the
+    offset scanning started at (past any match run in from the previous
+    conversation) and exit the offset the next conversation starts at, or None
+    once the conversation alone filled the category's cap, as extract_insights
+    stops; bitmasks of the CONTEXT_PATTERNS checked and matched; and the
+    NOTE_TERMS present (None until checked).
+    """
     
-    return decisions[:3]  # Limit to top 3 decisions
-
-
-def extract_problems_and_solutions(text):
-    """Extract problems encountered and their solutions."""
-    problems = []
-    patterns = [
-        r"(?:issue|problem|error|bug)[:.]\s*([^.!?\n]{15,150}[.!?]?)",
-        r"(?:fixed|solved|resolved|addressed)\s+(?:the\s+)?([^.!?\n]{15,150}[.!?]?)",
-        r"(?:hanging|failing|not\s+working)[:.]\s*([^.!?\n]{15,150}[.!?]?)",
-        r"(?:challenge|difficulty|trouble)[:.]\s*([^.!?\n]{15,150}[.!?]?)"
-    ]
+    def __init__(self, conv, text, digest, following, state=None):
+        self.conv = conv
+        self.text = text
+        self.following = following
+        seam = text_digest(following) if following else ''
+        if state and state['seam'] != seam:
+            # Notes and terms never match across a seam, since every conversation opens with "User:"
+            state = dict(state, seam=seam, categories=[[] for _ in INSIGHT_RULES])
+            self.changed = True
+        else:
+            self.changed = state is None
+        self.state = state or {
+            'hash': digest,
+            'seam': seam,
+            'categories': [[] for _ in INSIGHT_RULES],
+            'notes': [0, 0],
+            'terms': None
+        }
+        self.folded = None
+        self.window = None
     
-    import re
-    processed = set()
+    def fold(self):
+        """Case-fold the conversation text on first use."""
+        if self.folded is None:
+            self.folded = fold_case(self.text)
+        return self.folded
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            problem = match.group(1).strip()
-            # Clean up the problem text
-            problem = re.sub(r'\s+', ' ', problem)
-            problem = problem.rstrip('.,;:')
-            
-            if 15 <= len(problem) <= 150 and problem.lower() not in processed:
-                processed.add(problem.lower())
-                problems.append(f"- {problem}")
+    def pattern(self, category, index, entry):
+        """Return the [items, entry, exit] triple of one category pattern, scanning it if needed."""
+        scanned = self.state['categories'][CATEGORY_INDEX[category]]
+        if len(scanned) > index and scanned[index][1] != entry:
+            # A different match ran in from the previous conversation; later patterns
+            # deduplicate against this one's items, so they are rescanned too
+            del scanned[index:]
+        if len(scanned) == index:  # merge_candidates asks for patterns in order
+            seen = {item.lower() for items, _, _ in scanned for item in items}
+            scanned.append(self.scan(INSIGHT_RULES[category], index, entry, seen))
+            self.changed = True
+        return scanned[index]
     
-    return problems[:3]  # Limit to top 3 problems
+    def scan(self, rule, index, entry, seen):
+        """Collect one pattern's new candidates until the conversation alone fills the cap."""
+        if len(seen) >= rule['limit']:
+            return [[], entry, None]
+        
+        if self.window is None:
+            text = self.text + '\n' + self.following if self.following else self.text
+            self.window = (text, self.fold() + '\n' + fold_case(self.following) if self.following else self.fold())
+        text, folded = self.window
+        
+        items, next_entry = [], 0
+        for match in rule['compiled'][index].finditer(folded, entry):
+            if match.start() > len(self.text):
+                break  # The next conversation's own matches
+            item = clean_candidate(text[match.start(1):match.end(1)], rule)
+            if match.end() > len(self.text):
+                next_entry = match.end() - len(self.text) - 1
+            if not item or item.lower() in seen:
+                continue
+            items.append(item)
+            seen.add(item.lower())
+            if len(seen) == rule['limit']:
+                return [items, entry, None]
+        return [items, entry, next_entry]
+    
+    def note(self, index):
+        """Whether CONTEXT_PATTERNS[index] matches this conversation, searching if needed."""
+        checked, matched = self.state['notes']
+        bit = 1 << index
+        if not checked & bit:
+            checked |= bit
+            if CONTEXT_PATTERNS[index][0].search(self.fold()):
+                matched |= bit
+            self.state['notes'] = [checked, matched]
+            self.changed = True
+        return bool(matched & bit)
+    
+    def terms(self):
+        """NOTE_TERMS occurring in this conversation."""
+        if self.state['terms'] is None:
+            folded = self.fold()
+            self.state['terms'] = [term for term in NOTE_TERMS if term in folded]
+            self.changed = True
+        return self.state['terms']
 
 
-def extract_ideas(text):
-    """Extract ideas and concepts discussed."""
-    ideas = []
-    patterns = [
-        r"(?:idea|concept|thought)[:.]\s*([^.!?\n]{15,180}[.!?]?)",
-        r"(?:approach|strategy|method)[:.]\s*([^.!?\n]{15,180}[.!?]?)",
-        r"(?:could|might|maybe)\s+(?:we\s+)?([^.!?\n]{15,180}[.!?]?)",
-        r"(?:consider|suggest|recommend)\s+([^.!?\n]{15,180}[.!?]?)",
-        r"(?:what\s+if|how\s+about)\s+([^.!?\n]{15,180}[.!?]?)"
-    ]
-    
-    import re
-    processed = set()
+def day_candidates(candidates, category, index):
+    """Yield one pattern's candidates across the day, scanning conversations only as consumed."""
+    entry = 0
+    for conversation in candidates:
+        items, _, entry = conversation.pattern(category, index, entry)
+        yield from items
+        if entry is None:
+            return  # This conversation alone filled the cap, so the merge is done
+
+
+def merge_candidates(candidates):
+    """Combine per-conversation candidates in pattern order, then day order, applying caps."""
+    insights = {}
+    for category, rule in INSIGHT_RULES.items():
+        found = []
+        processed = set()
+        items = (
+            item
+            for index in range(len(rule['compiled']))
+            for item in day_candidates(candidates, category, index)
+        )
+        for item in items:
+            if item.lower() not in processed:
+                processed.add(item.lower())
+                found.append(f"- {item}")
+                if len(found) == rule['limit']:
+                    break
+        insights[category] = found
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            idea = match.group(1).strip()
-            # Clean up the idea text
-            idea = re.sub(r'\s+', ' ', idea)
-            idea = idea.rstrip('.,;:')
-            
-            if 15 <= len(idea) <= 180 and idea.lower() not in processed:
-                processed.add(idea.lower())
-                ideas.append(f"- {idea}")
+    notes = []
+    for index, (_, note) in enumerate(CONTEXT_PATTERNS):
+        if any(conversation.note(index) for conversation in candidates):
+            notes.append(f"- {note}")
+            if len(notes) == 4:
+                break
+    if len(notes) < 4:
+        notes.extend(term_notes({term for conversation in candidates for term in conversation.terms()}))
+    insights['notes'] = notes[:4]
     
-    return ideas[:4]  # Limit to top 4 ideas
+    return insights
 
 
-def extract_next_steps(text):
-    """Extract next steps and action items."""
-    next_steps = []
-    patterns = [
-        r"(?:next|later|continue)\s+(?:we\s+)?(?:should\s+|will\s+|need\s+to\s+)?([^.!?\n]{15,150}[.!?]?)",
-        r"(?:need\s+to|should|plan\s+to)\s+([^.!?\n]{15,150}[.!?]?)",
-        r"(?:todo|action\s+item)[:.]\s*([^.!?\n]{15,150}[.!?]?)",
-        r"(?:for\s+next\s+session|tomorrow|future)[:.]\s*([^.!?\n]{15,150}[.!?]?)"
-    ]
-    
-    import re
-    processed = set()
+def term_notes(terms):
+    """Notes triggered by literal terms anywhere in the day."""
+    notes = []
+    if "parse-chat-sessions" in terms:
+        notes.append("- Chat session parsing and integration developed")
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            step = match.group(1).strip()
-            # Clean up the step text
-            step = re.sub(r'\s+', ' ', step)
-            step = step.rstrip('.,;:')
-            
-            if 15 <= len(step) <= 150 and step.lower() not in processed:
-                processed.add(step.lower())
-                next_steps.append(f"- {step}")
+    if "heartbeat" in terms and "automation" in terms:
+        notes.append("- Heartbeat logging for automation monitoring implemented")
+    return notes
+
+
+def clean_candidate(item, rule):
+    """Normalize a captured candidate, returning None if the rule rejects it."""
+    item = WHITESPACE.sub(' ', item.strip())  # Normalize whitespace
+    item = item.rstrip('.,;:')  # Remove trailing punctuation
     
-    return next_steps[:3]  # Limit to top 3 next steps
+    # Skip if wrong length or (optionally) containing markdown artifacts
+    if not rule['min_length'] <= len(item) <= rule['max_length']:
+        return None
+    if rule['skip_markdown'] and any(artifact in item for artifact in MARKDOWN_ARTIFACTS):
+        return None
+    return item
 
 
-def extract_notable_context(text):
-    """Extract notable context and observations."""
-    notes = []
+def fold_case(text):
+    """Lowercase text without changing its length, so match spans index the original."""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # 'İ' is the only character whose lowercase is two characters; like
+    # re.IGNORECASE, keep just the first
+    folded = text.replace('\u0130', 'i').lower()
+    if len(folded) == len(text):
+        return folded
+    for char in {char for char in set(text) if len(char.lower()) != 1}:
+        text = text.replace(char, char.lower()[0])
+    return text.lower()
+
+
+def extract_insights(text, categories=None):
+    """
+    Extract insight categories from conversation text.
     
-    # Look for specific technical patterns and key themes
-    context_patterns = [
-        (r"git\s+commit.*hang", "Git commit hanging issue identified and addressed"),
-        (r"multi-?line.*(?:command|issue|problem)", "Multi-line command execution challenges discussed"),
-        (r"automation.*(?:improve|implement|enhance)", "Automation improvements implemented"),
-        (r"vs\s*code.*(?:chat|copilot|integration)", "VS Code/Copilot integration work"),
-        (r"(?:folder|directory).*(?:structure|organization)", "Project structure and organization improvements"),
-        (r"workflow.*(?:create|establish|document)", "Workflow documentation and processes established"),
-        (r"(?:sync|backup).*(?:google\s*drive|git)", "Sync and backup processes implemented"),
-        (r"(?:series\s*bible|character.*profile)", "Creative project development and character work")
-    ]
+    Patterns are compiled once and matched against case-folded text. Within a
+    category, candidates are taken in pattern order and scanning stops as soon
+    as the category's cap is reached.
     
-    import re
-    for pattern, note in context_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            notes.append(f"- {note}")
+    Args:
+        text: Combined conversation text
+        categories: Category names to extract (None for all, including notes)
     
-    # Add any specific insights from the conversation content
-    if "parse-chat-sessions" in text.lower():
-        notes.append("- Chat session parsing and integration developed")
+    Returns:
+        Dict mapping category names to lists of "- item" strings
+    """
+    folded = fold_case(text)
+    insights = {}
     
-    if "heartbeat" in text.lower() and "automation" in text.lower():
-        notes.append("- Heartbeat logging for automation monitoring implemented")
+    for category, rule in INSIGHT_RULES.items():
+        if categories is not None and category not in categories:
+            continue
+        found = []
+        processed = set()  # Track processed items to avoid duplicates
+        for pattern in rule['compiled']:
+            for match in pattern.finditer(folded):
+                item = clean_candidate(text[match.start(1):match.end(1)], rule)
+                if item and item.lower() not in processed:
+                    processed.add(item.lower())
+                    found.append(f"- {item}")
+                    if len(found) == rule['limit']:
+                        break
+            if len(found) == rule['limit']:
+                break
+        insights[category] = found
+    
+    if categories is None or 'notes' in categories:
+        insights['notes'] = notable_context(folded)
+    
+    return insights
+
+
+def notable_context(folded):
+    """Match the notable context themes against case-folded text."""
+    notes = [f"- {note}" for pattern, note in CONTEXT_PATTERNS if pattern.search(folded)]
+    
+    # Add any specific insights from the conversation content
+    notes.extend(term_notes({term for term in NOTE_TERMS if term in folded}))
     
     return notes[:4]  # Limit to top 4 notes
 
 
+def extract_tasks(text):
+    """Extract tasks and implementation work from conversation."""
+    return extract_insights(text, ('tasks_worked_on',))['tasks_worked_on']
+
+
+def extract_decisions(text):
+    """Extract key decisions made during the session."""
+    return extract_insights(text, ('decisions_made',))['decisions_made']
+
+
+def extract_problems_and_solutions(text):
+    """Extract problems encountered and their solutions."""
+    return extract_insights(text, ('problems_solved',))['problems_solved']
+
+
+def extract_ideas(text):
+    """Extract ideas and concepts discussed."""
+    return extract_insights(text, ('ideas_discussed',))['ideas_discussed']
+
+
+def extract_next_steps(text):
+    """Extract next steps and action items."""
+    return extract_insights(text, ('for_next_session',))['for_next_session']
+
+
+def extract_notable_context(text):
+    """Extract notable context and observations."""
+    return notable_context(fold_case(text))
+
+
 def format_conversations_for_summary(conversations):
     """Format conversations for inclusion in daily summary."""
     if not conversations:
@@ -391,35 +1151,221 @@ def format_conversations_for_summary(conversations):
     return '\n'.join(formatted)
 
 
+def build_outputs(conversations, formats, cache_dir=None):
+    """
+    Render several output formats from one set of parsed conversations.
+    
+    Args:
+        conversations: Conversations from extract_daily_conversations
+        formats: Names from OUTPUT_FORMATS
+        cache_dir: Insight candidate cache directory (None to analyze from scratch)
+    
+    Returns:
+        Dict mapping each format to its markdown string or JSON-ready data
+    """
+    outputs = {}
+    for output_format in formats:
+        if output_format == 'json':
+            outputs['json'] = conversations
+        elif output_format == 'insights':
+            outputs['insights'] = analyze_conversations_for_structure(conversations, cache_dir)
+        else:
+            outputs['summary'] = format_conversations_for_summary(conversations)
+    return outputs
+
+
+def format_session_document(target_date, conversations, cache_dir=None):
+    """Render a day's session summary in the layout of daily-session-summary.sh, without git activity."""
+    outputs = build_outputs(conversations, ['insights', 'summary'], cache_dir)
+    now = datetime.now()
+    lines = [
+        f"# Session Summary - {target_date.isoformat()}",
+        "*Reconstructed from chat history*",
+        "",
+        "## 📅 Session Info",
+        f"- **Date**: {target_date.isoformat()}",
+        "- **Session Type**: Chat History Backfill",
+        f"- **Auto-Generated**: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "## 🔄 Session Activity",
+        "*This summary was auto-generated from chat history. Manual updates can be added below.*",
+        "",
+    ]
+    for key, heading, placeholder in SESSION_SECTIONS:
+        lines.append(heading)
+        lines.extend(outputs['insights'][key] or [placeholder])
+        lines.append("")
+    
+    # Chat list sits under Session Activity, as in the daily summary
+    lines.extend(outputs['summary'].replace("## 💬", "### 💬", 1).splitlines())
+    lines.extend([
+        "",
+        "---",
+        f"*Auto-generated on {now.strftime('%Y-%m-%d')} at {now.strftime('%H:%M:%S')}. "
+        "Edit this file to add manual session details.*",
+        "",
+    ])
+    return '\n'.join(lines)
+
+
+def write_session_documents(day_conversations, output_dir, cache_dir=None, overwrite=False):
+    """
+    Write YYYY-MM/YYYY-MM-DD-session.md for each day that has conversations.
+    
+    Existing files are left alone unless overwrite is set, since they may hold manual edits.
+    
+    Returns:
+        List of paths written
+    """
+    written = []
+    for target_date, conversations in sorted(day_conversations.items()):
+        if not conversations:
+            continue
+        session_file = Path(output_dir) / target_date.strftime('%Y-%m') / f"{target_date.isoformat()}-session.md"
+        if session_file.exists() and not overwrite:
+            print(f"Skipping existing {session_file}", file=sys.stderr)
+            continue
+        session_file.parent.mkdir(parents=True, exist_ok=True)
+        session_file.write_text(format_session_document(target_date, conversations, cache_dir), encoding='utf-8')
+        written.append(session_file)
+    return written
+
+
+def parse_date_argument(value, flag):
+    """Parse a YYYY-MM-DD command-line date, exiting with a message when invalid."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        print(f"Invalid {flag} format: {value}. Use YYYY-MM-DD", file=sys.stderr)
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Parse VS Code chat sessions for daily summaries')
     parser.add_argument('--date', type=str, help='Target date (YYYY-MM-DD), defaults to today')
-    parser.add_argument('--format', choices=['summary', 'json', 'insights'], default='summary', 
-                       help='Output format: summary (raw chat), json (data), insights (structured analysis)')
+    parser.add_argument('--format', choices=['summary', 'json', 'insights', 'bundle'], default='summary', 
+                       help='Output format: summary (raw chat), json (data), insights (structured analysis), '
+                            'bundle (one JSON document with the --sections outputs)')
+    parser.add_argument('--sections', default='summary,insights',
+                       help='Comma-separated outputs for --format bundle: summary, insights, json')
+    parser.add_argument('--no-index', action='store_true',
+                       help='Parse every session file instead of using the cached session index')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-analyze every conversation instead of using cached insight candidates')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Worker processes for parsing session files (0 = one per CPU)')
+    parser.add_argument('--from', dest='from_date', type=str,
+                       help='First date of a range (YYYY-MM-DD); output becomes a JSON object keyed by date')
+    parser.add_argument('--to', dest='to_date', type=str,
+                       help='Last date of a range (YYYY-MM-DD), defaults to today')
+    parser.add_argument('--output-dir', type=str,
+                       help='With --from, write YYYY-MM/YYYY-MM-DD-session.md files here instead of printing')
+    parser.add_argument('--overwrite', action='store_true',
+                       help='Replace existing session files in --output-dir')
+    store = parser.add_mutually_exclusive_group()
+    store.add_argument('--ingest', action='store_true',
+                       help='Add new or changed session files to the conversation store')
+    store.add_argument('--search', type=str, metavar='QUERY',
+                       help='Full-text search of the conversation store (SQLite FTS5 syntax)')
+    store.add_argument('--stats', action='store_true',
+                       help='Print conversation store totals')
+    store.add_argument('--day-counts', action='store_true',
+                       help='Print stored conversations per day, limited by --from/--to if given')
+    parser.add_argument('--limit', type=int, default=20,
+                       help='Maximum --search results')
     
     args = parser.parse_args()
     
+    if args.date and (args.from_date or args.to_date):
+        print("Use either --date or --from/--to, not both", file=sys.stderr)
+        sys.exit(1)
+    if args.to_date and not args.from_date:
+        print("--to requires --from", file=sys.stderr)
+        sys.exit(1)
+    if args.output_dir and (not args.from_date or args.ingest or args.search or args.stats or args.day_counts):
+        print("--output-dir requires --from and cannot be combined with store queries", file=sys.stderr)
+        sys.exit(1)
+    
     # Parse target date
-    target_date = None
+    target_date = datetime.now().date()
     if args.date:
+        target_date = parse_date_argument(args.date, 'date')
+    
+    sections = [section.strip() for section in args.sections.split(',') if section.strip()]
+    unknown = [section for section in sections if section not in OUTPUT_FORMATS]
+    if args.format == 'bundle' and (unknown or not sections):
+        print(f"Invalid --sections: {args.sections}. Choose from {', '.join(OUTPUT_FORMATS)}", file=sys.stderr)
+        sys.exit(1)
+    
+    index_file = None if args.no_index else SESSION_INDEX_FILE
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    cache_dir = None if args.no_cache else INSIGHT_CACHE_DIR
+    formats = sections if args.format == 'bundle' else [args.format]
+    
+    # Store queries first bring the store up to date, which only parses new or changed files
+    if args.ingest or args.search or args.stats or args.day_counts:
+        chat_dir = find_workspace_chat_dir()
+        conn = open_chat_store(CHAT_STORE_FILE)
         try:
-            target_date = datetime.strptime(args.date, '%Y-%m-%d').date()
-        except ValueError:
-            print(f"Invalid date format: {args.date}. Use YYYY-MM-DD", file=sys.stderr)
+            if chat_dir:
+                parsed, written = ingest_sessions(conn, chat_dir, jobs)
+            else:
+                print("No chat sessions directory found for current workspace", file=sys.stderr)
+                parsed, written = 0, 0
+            
+            if args.ingest:
+                print(f"Ingested {written} conversation(s) from {parsed} session file(s)")
+            elif args.search:
+                try:
+                    print(json.dumps(search_conversations(conn, args.search, args.limit), indent=2))
+                except sqlite3.OperationalError as e:
+                    print(f"Invalid search query: {e}", file=sys.stderr)
+                    sys.exit(1)
+            elif args.stats:
+                print(json.dumps(store_stats(conn), indent=2))
+            else:
+                start_date = parse_date_argument(args.from_date, '--from') if args.from_date else None
+                end_date = parse_date_argument(args.to_date, '--to') if args.to_date else None
+                print(json.dumps(store_day_counts(conn, start_date, end_date), indent=2))
+        finally:
+            conn.close()
+        return
+    
+    # Range mode parses each session file once and buckets requests by local date
+    if args.from_date:
+        start_date = parse_date_argument(args.from_date, '--from')
+        end_date = parse_date_argument(args.to_date, '--to') if args.to_date else target_date
+        if start_date > end_date:
+            print(f"--from {start_date} is after --to {end_date}", file=sys.stderr)
             sys.exit(1)
+        
+        day_conversations = extract_range_conversations(start_date, end_date, index_file=index_file, jobs=jobs)
+        if args.output_dir:
+            written = write_session_documents(day_conversations, args.output_dir, cache_dir, args.overwrite)
+            print(f"Wrote {len(written)} session file(s) to {args.output_dir}")
+            return
+        
+        days = {}
+        for day, conversations in day_conversations.items():
+            outputs = build_outputs(conversations, formats, cache_dir)
+            days[day.isoformat()] = outputs if args.format == 'bundle' else outputs[args.format]
+        print(json.dumps(days, indent=2))
+        return
     
     # Extract conversations
-    conversations = extract_daily_conversations(target_date)
-    
-    # Output in requested format
-    if args.format == 'json':
-        print(json.dumps(conversations, indent=2))
-    elif args.format == 'insights':
-        insights = analyze_conversations_for_structure(conversations)
-        print(json.dumps(insights, indent=2))
+    conversations = extract_daily_conversations(target_date, index_file=index_file, jobs=jobs)
+    
+    # Output in requested format; a bundle renders every section from this one parse
+    if args.format == 'bundle':
+        bundle = {'date': target_date.isoformat(), **build_outputs(conversations, sections, cache_dir)}
+        print(json.dumps(bundle, indent=2))
+        return
+    
+    output = build_outputs(conversations, formats, cache_dir)[args.format]
+    if args.format == 'summary':
+        print(output)
     else:
-        print(format_conversations_for_summary(conversations))
-
+        print(json.dumps(output, indent=2))
 
 if __name__ == '__main__':
     main()
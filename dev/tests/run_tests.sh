@@ -19,16 +19,28 @@ TOTAL_TESTS_RUN=0
 TOTAL_TESTS_PASSED=0
 TOTAL_TESTS_FAILED=0
 
-# Function to run a test suite
+# Output of the suite being run, to read its test count from
+SUITE_LOG=$(mktemp)
+trap 'rm -f "$SUITE_LOG"' EXIT
+
+# Function to run a test suite, setting SUITE_TESTS to the number of tests it reported
 run_test_suite() {
     local test_name="$1"
     local test_command="$2"
+    local status
     
     echo ""
     echo "🔍 Running $test_name..."
     echo "----------------------------------------"
     
-    if eval "$test_command"; then
+    eval "$test_command" 2>&1 | tee "$SUITE_LOG"
+    status=${PIPESTATUS[0]}
+    
+    # unittest reports "Ran N tests", the shell suites "Tests run: N"
+    SUITE_TESTS=$(grep -Eo 'Ran [0-9]+ tests?|Tests run: [0-9]+' "$SUITE_LOG" | grep -Eo '[0-9]+' | tail -1)
+    SUITE_TESTS=${SUITE_TESTS:-0}
+    
+    if [ "$status" -eq 0 ]; then
         echo -e "${GREEN}✅ $test_name PASSED${NC}"
         return 0
     else
@@ -50,26 +62,29 @@ fi
 
 # Run Python tests
 if run_test_suite "Parse Chat Sessions Tests" ".venv/bin/python dev/tests/test_parse_chat_sessions.py"; then
-    TOTAL_TESTS_PASSED=$((TOTAL_TESTS_PASSED + 12))
+    TOTAL_TESTS_PASSED=$((TOTAL_TESTS_PASSED + SUITE_TESTS))
 else
-    TOTAL_TESTS_FAILED=$((TOTAL_TESTS_FAILED + 12))
+    TOTAL_TESTS_FAILED=$((TOTAL_TESTS_FAILED + SUITE_TESTS))
 fi
-TOTAL_TESTS_RUN=$((TOTAL_TESTS_RUN + 12))
+TOTAL_TESTS_RUN=$((TOTAL_TESTS_RUN + SUITE_TESTS))
+PARSE_CHAT_TESTS=$SUITE_TESTS
 
 if run_test_suite "Markdown TTS Tests" ".venv/bin/python dev/tests/test_markdown_tts.py"; then
-    TOTAL_TESTS_PASSED=$((TOTAL_TESTS_PASSED + 25))
+    TOTAL_TESTS_PASSED=$((TOTAL_TESTS_PASSED + SUITE_TESTS))
 else
-    TOTAL_TESTS_FAILED=$((TOTAL_TESTS_FAILED + 25))
+    TOTAL_TESTS_FAILED=$((TOTAL_TESTS_FAILED + SUITE_TESTS))
 fi
-TOTAL_TESTS_RUN=$((TOTAL_TESTS_RUN + 25))
+TOTAL_TESTS_RUN=$((TOTAL_TESTS_RUN + SUITE_TESTS))
+MARKDOWN_TTS_TESTS=$SUITE_TESTS
 
 # Run Shell tests
 if run_test_suite "Daily Session Summary Tests" "./dev/tests/test_daily_session_summary.sh"; then
-    TOTAL_TESTS_PASSED=$((TOTAL_TESTS_PASSED + 8))
+    TOTAL_TESTS_PASSED=$((TOTAL_TESTS_PASSED + SUITE_TESTS))
 else
-    TOTAL_TESTS_FAILED=$((TOTAL_TESTS_FAILED + 8))
+    TOTAL_TESTS_FAILED=$((TOTAL_TESTS_FAILED + SUITE_TESTS))
 fi
-TOTAL_TESTS_RUN=$((TOTAL_TESTS_RUN + 8))
+TOTAL_TESTS_RUN=$((TOTAL_TESTS_RUN + SUITE_TESTS))
+DAILY_SUMMARY_TESTS=$SUITE_TESTS
 
 # Print final results
 echo ""
@@ -84,9 +99,9 @@ if [ $TOTAL_TESTS_FAILED -eq 0 ]; then
     echo -e "🎉 ${GREEN}ALL TESTS PASSED! Automation is ready for creative work.${NC}"
     echo ""
     echo "Your automation scripts are thoroughly tested and reliable:"
-    echo "  • parse-chat-sessions.py: 12 tests ✅"
-    echo "  • markdown-tts.py: 25 tests ✅"
-    echo "  • daily-session-summary.sh: 8 tests ✅"
+    echo "  • parse-chat-sessions.py: $PARSE_CHAT_TESTS tests ✅"
+    echo "  • markdown-tts.py: $MARKDOWN_TTS_TESTS tests ✅"
+    echo "  • daily-session-summary.sh: $DAILY_SUMMARY_TESTS tests ✅"
     echo ""
     echo "You can now focus on creative work with confidence! 🚀"
     exit 0
@@ -257,6 +257,76 @@ test_script_has_required_functions() {
     fi
 }
 
+test_chat_bundle_populates_sections() {
+    extract_functions
+    
+    # Stand-in for `parse-chat-sessions.py --format bundle` output
+    local chat_bundle='{"date": "2025-08-08", "summary": "## 💬 Chat Conversations (1 exchanges)\n\n### 1. Chat at 10:30", "insights": {"tasks_worked_on": ["- Added the bundle output format"], "notes": []}}'
+    local insights_json chat_content output
+    insights_json=$(echo "$chat_bundle" | jq -c '.insights // empty')
+    chat_content=$(echo "$chat_bundle" | jq -r '.summary // empty')
+    
+    # The parser must not run again when the summary is passed in
+    REPO_DIR="$TEST_DIR"
+    output=$(populate_sections_with_insights "$insights_json" "$chat_content")
+    
+    assert_contains "- Added the bundle output format" "$output" "Tasks should come from the bundle" &&
+        assert_contains "### 1. Chat at 10:30" "$output" "Conversations should come from the bundle" &&
+        assert_contains "- *Add key decisions made during the session*" "$output" "Empty sections keep placeholders"
+}
+
+test_chat_bundle_failure_parses_once() {
+    extract_functions
+    
+    # Stand-in parser that records each run and always fails
+    cat > dev/scripts/parse-chat-sessions.py << 'EOF'
+#!/usr/bin/env python3
+import sys
+with open('parser-runs.txt', 'a') as runs:
+    runs.write('run\n')
+sys.exit(1)
+EOF
+    chmod +x dev/scripts/parse-chat-sessions.py
+    
+    REPO_DIR="$TEST_DIR"
+    TARGET_DATE="2025-08-08"
+    TODAY="2025-08-08"
+    SUMMARY_DIR="$TEST_DIR/dev/logs/conversation-summaries"
+    DELTA_FILE="$TEST_DIR/delta.md"
+    local log_output
+    log_output=$(create_active_summary)
+    
+    assert_equals "1" "$(wc -l < parser-runs.txt | tr -d ' ')" "Parser should run once when the bundle fails" &&
+        assert_contains "Chat parsing failed" "$log_output" "Bundle failure should be logged" &&
+        assert_contains "*Chat parsing failed; conversations not included*" "$(cat "$DELTA_FILE")" "Summary should note the missing conversations" &&
+        assert_contains "- [ ] *Add tasks worked on today*" "$(cat "$DELTA_FILE")" "Sections fall back to placeholders"
+}
+
+test_update_summary_parses_bundle_once() {
+    extract_functions
+    
+    # Stand-in parser that records its arguments and prints a bundle
+    cat > dev/scripts/parse-chat-sessions.py << 'EOF'
+#!/usr/bin/env python3
+import json, sys
+with open('parser-runs.txt', 'a') as runs:
+    runs.write(' '.join(sys.argv[1:]) + '\n')
+print(json.dumps({'date': '2025-08-08', 'summary': '## 💬 Chat Conversations (1 exchanges)\n\n### 1. Chat at 10:30'}))
+EOF
+    chmod +x dev/scripts/parse-chat-sessions.py
+    
+    REPO_DIR="$TEST_DIR"
+    TARGET_DATE="2025-08-08"
+    DELTA_FILE="$TEST_DIR/delta.md"
+    printf '# Session Summary\n\n## 📊 Git Activity\nold\n\n## 🔄 Session Activity\n- kept notes\n' > "$DELTA_FILE"
+    update_existing_summary > /dev/null
+    
+    assert_equals "1" "$(wc -l < parser-runs.txt | tr -d ' ')" "Parser should run once when updating" &&
+        assert_contains "--format bundle --sections summary" "$(cat parser-runs.txt)" "Update should read the bundle" &&
+        assert_contains "### 1. Chat at 10:30" "$(cat "$DELTA_FILE")" "Conversations should come from the bundle" &&
+        assert_contains "- kept notes" "$(cat "$DELTA_FILE")" "Session activity should be kept"
+}
+
 # Run all tests
 main() {
     echo "🧪 Running daily-session-summary.sh unit tests..."
@@ -277,6 +347,9 @@ main() {
     run_test "Clean repo shows no activity" test_detect_activity_clean_repo
     run_test "Monthly directory creation" test_ensure_monthly_directory
     run_test "Git activity summary" test_git_activity_summary
+    run_test "Chat bundle populates sections" test_chat_bundle_populates_sections
+    run_test "Chat bundle failure parses once" test_chat_bundle_failure_parses_once
+    run_test "Update summary parses bundle once" test_update_summary_parses_bundle_once
     
     # Print results
     echo ""
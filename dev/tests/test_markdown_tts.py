@@ -4,10 +4,25 @@ Unit tests for markdown-tts.py
 
 Tests the critical functionality of the TTS system, including:
 - Configuration loading and merging
-- Character file discovery and scoring
+- Cached voice catalogue, filtering and config voice validation
+- Character file discovery via the persistent character index
 - Markdown cleaning and text processing
 - Text chunking for TTS limits
 - Cache filename generation
+- Concurrent chunk synthesis
+- Per-chunk audio caching
+- Cache index and LRU eviction
+- Versioned cache keys covering all synthesis parameters
+- Batch synthesis of whole directory trees
+- In-process MP3/WAV chunk concatenation
+- Single-pass markdown cleaner fidelity and throughput
+- Streaming playback while chunks are synthesized
+- Dialogue parsing and per-speaker SSML scenes
+- CLI startup import budget
+- Resident socket server with in-flight de-duplication
+- Offline local backend driving the whole synthesis pipeline
+- Quota-aware request scheduling, retries and the usage ledger
+- Inter-chunk pauses and cached loudness normalization
 - Error handling and edge cases
 """
 
@@ -19,6 +34,14 @@ from pathlib import Path
 import sys
 import os
 import hashlib
+import time
+import threading
+import wave
+import re
+import timeit
+import tracemalloc
+import subprocess
+import multiprocessing
 from unittest.mock import patch, MagicMock
 
 # Add the scripts directory to the path so we can import the module
@@ -26,12 +49,35 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 # Import the TTSReader class
 import importlib.util
-spec = importlib.util.spec_from_file_location("markdown_tts", 
-    os.path.join(os.path.dirname(__file__), '..', 'scripts', 'markdown-tts.py'))
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SCRIPT_PATH = os.path.join(REPO_ROOT, 'dev', 'scripts', 'markdown-tts.py')
+spec = importlib.util.spec_from_file_location("markdown_tts", SCRIPT_PATH)
 markdown_tts = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(markdown_tts)
 
 TTSReader = markdown_tts.TTSReader
+AudioCache = markdown_tts.AudioCache
+
+
+class FakeTTSClient:
+    """Stand-in for TextToSpeechClient with fixed latency and no network access"""
+    
+    def __init__(self, latency=0.0, failures=0):
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+        self.voices = []
+        self.lock = threading.Lock()
+    
+    def synthesize_speech(self, input, voice, audio_config):
+        with self.lock:
+            self.calls += 1
+            self.voices.append(voice.name)
+            if self.failures > 0:
+                self.failures -= 1
+                raise RuntimeError("503 Service Unavailable")
+        time.sleep(self.latency)
+        return MagicMock(audio_content=(input.ssml or input.text).encode('utf-8'))
 
 
 class TestTTSReaderConfig(unittest.TestCase):
@@ -107,6 +153,99 @@ class TestTTSReaderConfig(unittest.TestCase):
         self.assertEqual(tts.config['voice']['ssml_gender'], 'MALE')
 
 
+def fake_voice(name, gender, language_code=None):
+    """Build a list_voices() entry like the Google client returns"""
+    voice = MagicMock(
+        language_codes=[language_code or "-".join(name.split("-")[:2])],
+        natural_sample_rate_hertz=24000
+    )
+    # "name" is reserved by the MagicMock constructor
+    voice.name = name
+    voice.ssml_gender.name = gender
+    return voice
+
+
+class TestVoiceCatalogue(unittest.TestCase):
+    """Test the cached voice catalogue and config voice validation"""
+    
+    def setUp(self):
+        """Set up a temporary working directory and a fake voice listing client"""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        os.makedirs("dev/config", exist_ok=True)
+        
+        self.tts = TTSReader(init_client=False)
+        self.tts.client = MagicMock()
+        self.tts.client.list_voices.return_value = MagicMock(voices=[
+            fake_voice("en-US-Neural2-D", "MALE"),
+            fake_voice("en-US-Neural2-F", "FEMALE"),
+            fake_voice("en-US-Studio-O", "FEMALE"),
+            fake_voice("en-GB-Neural2-A", "FEMALE"),
+            fake_voice("en-US-Chirp3-HD-Puck", "MALE"),
+            fake_voice("fr-FR-Neural2-A", "FEMALE")
+        ])
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.test_dir)
+    
+    def test_catalogue_cached_until_ttl_expires(self):
+        """Test the API is only called again once the cached catalogue is stale"""
+        self.tts.get_voice_catalogue()
+        voices = self.tts.get_voice_catalogue()
+        
+        self.assertEqual(self.tts.client.list_voices.call_count, 1)
+        self.assertEqual(len(voices), 6)
+        
+        catalogue = json.loads(self.tts.voices_file.read_text())
+        catalogue["fetched"] -= self.tts.config["voices"]["cache_ttl_hours"] * 3600 + 1
+        self.tts.voices_file.write_text(json.dumps(catalogue))
+        self.tts.get_voice_catalogue()
+        self.assertEqual(self.tts.client.list_voices.call_count, 2)
+    
+    def test_stale_catalogue_used_offline(self):
+        """Test a stale catalogue is still served when the API is unreachable"""
+        self.tts.get_voice_catalogue()
+        self.tts.client.list_voices.side_effect = RuntimeError("offline")
+        
+        self.assertEqual(len(self.tts.get_voice_catalogue(refresh=True)), 6)
+    
+    def test_filter_by_language_gender_and_family(self):
+        """Test offline filtering of the catalogue"""
+        voices = self.tts.get_voice_catalogue()
+        names = lambda **filters: [v["name"] for v in markdown_tts.filter_voices(voices, **filters)]
+        
+        self.assertEqual(names(language="en-GB"), ["en-GB-Neural2-A"])
+        self.assertEqual(names(language="en", gender="female", family="neural2"), ["en-GB-Neural2-A", "en-US-Neural2-F"])
+        self.assertEqual(names(family="Chirp3"), ["en-US-Chirp3-HD-Puck"])
+        self.assertEqual(markdown_tts.voice_family("en-US-Studio-O"), "Studio")
+    
+    def test_list_voices_json(self):
+        """Test --json style output is the filtered catalogue"""
+        with patch('builtins.print') as mock_print:
+            self.tts.list_voices(language="en-US", family="Studio", as_json=True)
+        
+        listed = json.loads(mock_print.call_args_list[-1].args[0])
+        self.assertEqual([v["name"] for v in listed], ["en-US-Studio-O"])
+    
+    def test_unknown_voice_fails_at_load(self):
+        """Test load_config rejects a voice missing from the cached catalogue"""
+        self.tts.get_voice_catalogue()
+        config = {"voice": {"language_code": "en-US", "name": "en-US-Neural2-Z", "ssml_gender": "MALE"}}
+        with open("bad-config.json", 'w') as f:
+            json.dump(config, f)
+        
+        with patch('builtins.print'):
+            with self.assertRaises(SystemExit):
+                TTSReader("bad-config.json", init_client=False)
+            
+            # Without a cached catalogue there is nothing to check against
+            os.remove(self.tts.voices_file)
+            self.assertEqual(TTSReader("bad-config.json", init_client=False).config["voice"]["name"], "en-US-Neural2-Z")
+
+
 class TestCharacterFileDiscovery(unittest.TestCase):
     """Test character file discovery and scoring logic"""
     
@@ -184,6 +323,48 @@ class TestCharacterFileDiscovery(unittest.TestCase):
         
         # Should get the main character file, not the student version
         self.assertIn("content/characters/main/glove.md", result)
+    
+    def test_index_persisted_and_reused_without_walking(self):
+        """Test lookups after the first come from the saved index"""
+        TTSReader(init_client=False).find_character_file("glove")
+        self.assertTrue(os.path.exists("dev/cache/character-index.json"))
+        
+        tts = TTSReader(init_client=False)
+        with patch.object(markdown_tts.os, 'walk', side_effect=AssertionError("walked the tree")):
+            self.assertEqual(tts.find_character_file("mitten"), "content/characters/main/mitten.md")
+            self.assertIsNone(tts.find_character_file("glove-copy"))
+    
+    def test_index_rebuilt_when_directory_changes(self):
+        """Test a new profile is picked up via the directory mtime"""
+        TTSReader(init_client=False).find_character_file("glove")
+        
+        with open("content/characters/sagas/school-daze/principal-watch.md", 'w') as f:
+            f.write("# Principal Watch\n\n**Name**: Principal Watch  \n")
+        directory = "content/characters/sagas/school-daze"
+        mtime = os.stat(directory).st_mtime + 5
+        os.utime(directory, (mtime, mtime))
+        
+        tts = TTSReader(init_client=False)
+        self.assertEqual(tts.find_character_file("Principal Watch"), "content/characters/sagas/school-daze/principal-watch.md")
+    
+    def test_prefix_and_fuzzy_matching(self):
+        """Test prefix, substring and misspelled lookups"""
+        tts = TTSReader(init_client=False)
+        
+        self.assertEqual(tts.find_character_file("mitt"), "content/characters/main/mitten.md")
+        self.assertEqual(tts.find_character_file("student"), "content/characters/sagas/school-daze/glove-student.md")
+        self.assertEqual(tts.find_character_file("glvoe"), "content/characters/main/glove.md")
+    
+    def test_list_characters_reads_index(self):
+        """Test listing uses the same index as lookup"""
+        tts = TTSReader(init_client=False)
+        
+        with patch('builtins.print') as mock_print:
+            tts.list_available_characters()
+        
+        listed = [call.args[0] for call in mock_print.call_args_list]
+        self.assertIn("  glove (content/characters/main/glove.md)", listed)
+        self.assertEqual(len(listed), 4)
 
 
 class TestMarkdownCleaning(unittest.TestCase):
@@ -275,6 +456,114 @@ Regular text here."""
         self.assertIn("Text with lots", result)
 
 
+class TestMarkdownCleaningFidelity(unittest.TestCase):
+    """Test ordering-sensitive cases handled by the single-pass cleaner"""
+    
+    def setUp(self):
+        """Set up TTSReader for testing"""
+        self.tts = TTSReader(init_client=False)
+    
+    def test_code_block_contents_removed_before_inline_markup(self):
+        """Test that markup inside fenced code never leaks into speech"""
+        text = "Before.\n\n```\n**not bold** and *stars*\n```\n\nAfter."
+        
+        self.assertEqual(self.tts.clean_markdown(text), "Before.\n\nAfter.")
+    
+    def test_table_cells_read_as_phrases(self):
+        """Test that table rows become comma-separated cells"""
+        text = "| Name | Role |\n|:-----|-----:|\n| **Glove** | Security   Specialist |\n\nEnd."
+        
+        self.assertEqual(self.tts.clean_markdown(text), "Name, Role\nGlove, Security Specialist\n\nEnd.")
+    
+    def test_nested_inline_markup(self):
+        """Test markup nested inside links and bold text"""
+        text = "See **[the *guide*](guide.md)** now."
+        
+        self.assertEqual(self.tts.clean_markdown(text), "See the guide now.")
+    
+    def test_bold_italic_markup_removed(self):
+        """Test that triple asterisks and underscores leave no markup behind"""
+        self.assertEqual(self.tts.clean_markdown("A ***bold italic*** word."), "A bold italic word.")
+        self.assertEqual(self.tts.clean_markdown("A ___bold italic___ word."), "A bold italic word.")
+        self.assertEqual(self.tts.clean_markdown("***[the guide](guide.md)*** and *more*"), "the guide and more")
+    
+    def test_removed_lines_leave_single_paragraph_break(self):
+        """Test that removed images and rules don't stack blank lines"""
+        text = "### Overview\n![Portrait](glove.png)\n\n**Name**: Glove  \n\n---\n\n- Item"
+        
+        self.assertEqual(self.tts.clean_markdown(text), "Overview\n\nName: Glove\n\nItem")
+    
+    def test_unclosed_code_fence_keeps_text(self):
+        """Test that an unclosed fence doesn't swallow the rest of the file"""
+        result = self.tts.clean_markdown("Intro.\n```\nStill spoken.")
+        
+        self.assertIn("Still spoken", result)
+
+
+def legacy_clean_markdown(text):
+    """Sequential multi-pass cleaner used as the benchmark baseline"""
+    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
+    text = re.sub(r'`([^`]*)`', r'\1', text)
+    text = re.sub(r'^---+$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\|[^|\n]*\|', '', text)
+    return text.strip()
+
+
+class TestMarkdownCleaningPerformance(unittest.TestCase):
+    """Micro-benchmark of the markdown cleaner on large generated profiles"""
+    
+    def setUp(self):
+        """Generate a large character-profile-style markdown document"""
+        self.tts = TTSReader(init_client=False)
+        section = (
+            "## Character {i}\n"
+            "![Portrait {i}](../assets/images/character-{i}.png)\n\n"
+            "**Name**: Character {i}  \n"
+            "**Role**: School helper with a [case file](cases/{i}.md)  \n\n"
+            "### Background Story\n\n"
+            "From a very young age, Character {i} insisted on perfect order. Toys were sorted by "
+            "type and color, and books were organized by genre, author, and title. This natural "
+            "instinct was not just about neatness; it was about seeing patterns others missed.\n\n"
+            "### Core Traits\n"
+            "- **Professional**: Approaches every problem like an official investigation\n"
+            "- **Methodical**: Follows systematic procedures for everything\n"
+            "- *Protective*: Genuinely wants to help and solve problems for others\n\n"
+            "---\n\n"
+        )
+        self.document = "".join(section.format(i=i) for i in range(2000))
+    
+    def test_cleaner_throughput_and_peak_memory(self):
+        """Benchmark: single pass matches the sequential passes in time and lowers peak memory"""
+        self.assertGreater(len(self.document), 1_000_000)
+        
+        # Alternate the runs so bursts of machine load hit both implementations
+        legacy_times, cleaner_times = [], []
+        for _ in range(7):
+            legacy_times.append(timeit.timeit(lambda: legacy_clean_markdown(self.document), number=1))
+            cleaner_times.append(timeit.timeit(lambda: self.tts.clean_markdown(self.document), number=1))
+        legacy_time, cleaner_time = min(legacy_times), min(cleaner_times)
+        
+        tracemalloc.start()
+        legacy_clean_markdown(self.document)
+        legacy_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        self.tts.clean_markdown(self.document)
+        cleaner_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        
+        # Timing is noisy on shared machines, so only require parity there;
+        # the peak-memory saving is deterministic
+        self.assertLess(cleaner_time, legacy_time * 1.25)
+        self.assertLess(cleaner_peak, legacy_peak)
+
+
 class TestTextChunking(unittest.TestCase):
     """Test text chunking for TTS byte limits"""
     
@@ -313,6 +602,46 @@ class TestTextChunking(unittest.TestCase):
             if not chunk.endswith('.'):
                 # If not ending with period, should be the last chunk
                 self.assertEqual(chunk, chunks[-1])
+    
+    def test_oversized_sentence_splits_at_clauses_then_words(self):
+        """Test a sentence over the limit falls back to clause and word boundaries"""
+        clauses = ", ".join(f"clause number {i} keeps going" for i in range(20)) + "."
+        chunks = self.tts.split_text_into_chunks(clauses, max_bytes=100)
+        
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertTrue(chunk.endswith(","))
+        self.assertEqual(" ".join(chunks), clauses)
+        
+        words = " ".join(["word"] * 100)
+        chunks = self.tts.split_text_into_chunks(words, max_bytes=32)
+        self.assertTrue(all(len(chunk.encode('utf-8')) <= 32 for chunk in chunks))
+        self.assertEqual(" ".join(chunks), words)
+    
+    def test_hard_split_never_breaks_multibyte_characters(self):
+        """Test unbroken text is split by bytes on character boundaries"""
+        text = "é" * 30 + "日本語" * 20 + "🎙️" * 10
+        chunks = self.tts.split_text_into_chunks(text, max_bytes=16)
+        
+        self.assertEqual("".join(chunks), text)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.encode('utf-8')), 16)
+    
+    def test_iter_text_chunks_is_lazy(self):
+        """Test chunks are yielded before the whole text is packed"""
+        chunks = self.tts.iter_text_chunks("First sentence. " * 10000, max_bytes=100)
+        
+        self.assertFalse(isinstance(chunks, list))
+        self.assertEqual(next(chunks), " ".join(["First sentence."] * 6))
+    
+    def test_chunking_scales_linearly(self):
+        """Test packing time grows linearly with chunk size"""
+        text = "A short sentence here. " * 20000
+        small = min(timeit.repeat(lambda: self.tts.split_text_into_chunks(text, max_bytes=500), number=1, repeat=3))
+        large = min(timeit.repeat(lambda: self.tts.split_text_into_chunks(text, max_bytes=50000), number=1, repeat=3))
+        
+        # Quadratic packing would make 100x larger chunks far slower
+        self.assertLess(large, small * 3)
 
 
 class TestCacheManagement(unittest.TestCase):
@@ -363,6 +692,57 @@ class TestCacheManagement(unittest.TestCase):
         
         self.assertNotEqual(filename1, filename2)
     
+    def test_cache_filename_audio_config_sensitivity(self):
+        """Test that every audio setting is part of the cache key"""
+        text = "Same text content"
+        voice_name = "en-US-Neural2-D"
+        base = self.tts.get_cache_filename(text, voice_name)
+        
+        for key, value in [('speaking_rate', 1.25), ('pitch', -2.0)]:
+            original = self.tts.config['audio_config'][key]
+            self.tts.config['audio_config'][key] = value
+            self.assertNotEqual(self.tts.get_cache_filename(text, voice_name), base)
+            self.tts.config['audio_config'][key] = original
+        
+        self.tts.config['voice']['language_code'] = 'en-GB'
+        self.assertNotEqual(self.tts.get_cache_filename(text, voice_name), base)
+    
+    def test_cache_key_number_normalization(self):
+        """Test that integer and float config values share a cache key"""
+        self.tts.config['audio_config']['speaking_rate'] = 1
+        key_int = self.tts.get_cache_key("Text")
+        self.tts.config['audio_config']['speaking_rate'] = 1.0
+        
+        self.assertEqual(self.tts.get_cache_key("Text"), key_int)
+    
+    def test_cache_filename_versioned_full_hash(self):
+        """Test versioned filenames with an untruncated blake2b hash"""
+        filename = self.tts.get_cache_filename("Hello", "en-US-Neural2-D")
+        
+        self.assertTrue(filename.name.startswith(f"tts-v{markdown_tts.CACHE_KEY_VERSION}-"))
+        self.assertEqual(len(filename.stem.split('-')[-1]), 64)
+    
+    def test_cache_extension_follows_encoding(self):
+        """Test that the file extension follows the audio encoding"""
+        self.tts.config['audio_config']['audio_encoding'] = 'LINEAR16'
+        self.assertEqual(self.tts.get_cache_filename("Hi", "en-US-Neural2-D").suffix, '.wav')
+        
+        self.tts.config['audio_config']['audio_encoding'] = 'OGG_OPUS'
+        self.assertEqual(self.tts.get_chunk_cache_filename("Hi").suffix, '.ogg')
+    
+    def test_legacy_cache_entries_pruned(self):
+        """Test that files from older key schemes are evicted cleanly"""
+        legacy_file = self.tts.cache_dir / "tts-0123456789ab.mp3"
+        legacy_file.write_bytes(b"old audio")
+        current_file = self.tts.get_cache_filename("Hello", "en-US-Neural2-D")
+        current_file.write_bytes(b"new audio")
+        
+        removed, _ = self.tts.cache.prune()
+        
+        self.assertEqual(removed, 1)
+        self.assertFalse(legacy_file.exists())
+        self.assertTrue(self.tts.cache.contains(current_file))
+    
     def test_cache_filename_voice_sensitivity(self):
         """Test that different voices generate different cache filenames"""
         text = "Same text content"
@@ -373,11 +753,979 @@ class TestCacheManagement(unittest.TestCase):
         self.assertNotEqual(filename1, filename2)
 
 
+class TestConcurrentSynthesis(unittest.TestCase):
+    """Test concurrent chunk synthesis with a fake TTS client"""
+    
+    def setUp(self):
+        """Set up TTSReader with a fake client and temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+        self.tts.config['synthesis']['retry_backoff'] = 0
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_chunks_returned_in_order(self):
+        """Test that concurrent results keep the original chunk order"""
+        self.tts.client = FakeTTSClient(latency=0.01)
+        chunks = [f"Chunk number {i}." for i in range(10)]
+        
+        chunk_files = self.tts.synthesize_chunks(chunks)
+        
+        self.assertEqual([f.read_bytes().decode('utf-8') for f in chunk_files], chunks)
+    
+    def test_retry_transient_failure(self):
+        """Test that a failed request is retried before giving up"""
+        self.tts.client = FakeTTSClient(failures=2)
+        
+        result = self.tts.synthesize_single_chunk("Retry me please.", "001")
+        
+        self.assertIsNotNone(result)
+        self.assertEqual(self.tts.client.calls, 3)
+    
+    def test_retry_gives_up(self):
+        """Test that persistent failures return None after max retries"""
+        self.tts.client = FakeTTSClient(failures=10)
+        self.tts.config['synthesis']['max_retries'] = 1
+        
+        result = self.tts.synthesize_single_chunk("Never works.", "001")
+        
+        self.assertIsNone(result)
+        self.assertEqual(self.tts.client.calls, 2)
+    
+    def test_concurrent_speedup_benchmark(self):
+        """Benchmark: wall-clock time scales with ceil(N/workers) round-trips"""
+        latency = 0.05
+        chunks = [f"Benchmark sentence {i}." for i in range(12)]
+        
+        self.tts.client = FakeTTSClient(latency=latency)
+        self.tts.config['synthesis']['max_workers'] = 1
+        start_time = time.time()
+        self.tts.synthesize_chunks(chunks)
+        sequential_time = time.time() - start_time
+        
+        self.tts.client = FakeTTSClient(latency=latency)
+        self.tts.config['synthesis']['max_workers'] = 4
+        start_time = time.time()
+        self.tts.synthesize_chunks(chunks)
+        concurrent_time = time.time() - start_time
+        
+        # 12 chunks at 4 workers is 3 round-trips instead of 12
+        self.assertGreaterEqual(sequential_time, 12 * latency)
+        self.assertLess(concurrent_time, sequential_time / 2.5)
+
+
+class TestChunkCache(unittest.TestCase):
+    """Test per-chunk content-addressed caching"""
+    
+    def setUp(self):
+        """Set up TTSReader with a fake client and temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+        self.tts.client = FakeTTSClient()
+        self.sentences = [f"This is sentence number {i} of the profile." for i in range(300)]
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_chunk_cache_key_includes_audio_config(self):
+        """Test that audio settings change the chunk cache key"""
+        filename1 = self.tts.get_chunk_cache_filename("Same text")
+        self.tts.config['audio_config']['speaking_rate'] = 1.5
+        filename2 = self.tts.get_chunk_cache_filename("Same text")
+        
+        self.assertNotEqual(filename1, filename2)
+    
+    def test_edit_only_resynthesizes_changed_chunk(self):
+        """Test that editing one sentence only re-synthesizes its chunk"""
+        text = " ".join(self.sentences)
+        self.assertIsNotNone(self.tts.synthesize_speech(text))
+        first_run_calls = self.tts.stats['api_calls']
+        self.assertGreater(first_run_calls, 1)
+        
+        self.sentences[-1] = "This final sentence has a fixed typo."
+        self.assertIsNotNone(self.tts.synthesize_speech(" ".join(self.sentences)))
+        
+        self.assertEqual(self.tts.stats['api_calls'], first_run_calls + 1)
+        self.assertEqual(self.tts.stats['chunk_cache_hits'], first_run_calls - 1)
+
+
+class TestAudioCacheIndex(unittest.TestCase):
+    """Test the audio cache index and LRU eviction"""
+    
+    def setUp(self):
+        """Create a cache directory with a few audio files"""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = Path(self.test_dir)
+        self.cache = AudioCache(self.cache_dir)
+        for i in range(4):
+            path = self.cache_dir / f"tts-v2-file-{i}.mp3"
+            path.write_bytes(b"x" * 1000)
+            self.cache.add(path, kind="chunk")
+            self.cache.entries[path.name]["last_access"] = 1000 + i
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_prune_evicts_least_recently_used(self):
+        """Test that pruning by entry count removes the oldest files first"""
+        self.cache.touch(self.cache_dir / "tts-v2-file-0.mp3")
+        
+        removed, freed = self.cache.prune(max_entries=2)
+        
+        self.assertEqual((removed, freed), (2, 2000))
+        self.assertTrue(self.cache.contains(self.cache_dir / "tts-v2-file-0.mp3"))
+        self.assertFalse((self.cache_dir / "tts-v2-file-1.mp3").exists())
+        self.assertFalse((self.cache_dir / "tts-v2-file-2.mp3").exists())
+    
+    def test_prune_by_size_respects_protected_files(self):
+        """Test size-bounded pruning never removes protected files"""
+        protected = self.cache_dir / "tts-v2-file-0.mp3"
+        
+        self.cache.prune(max_bytes=1500, protect=[protected])
+        
+        self.assertEqual(list(self.cache.entries), ["tts-v2-file-0.mp3"])
+        self.assertLessEqual(self.cache.total_size(), 1500)
+    
+    def test_index_persists_access_times(self):
+        """Test that a saved index is reloaded without rescanning"""
+        self.cache.save()
+        
+        reloaded = AudioCache(self.cache_dir)
+        
+        self.assertEqual(reloaded.entries["tts-v2-file-3.mp3"]["last_access"], 1003)
+        self.assertEqual(reloaded.stats()["kinds"], {"chunk": 4})
+    
+    def test_index_rebuilt_after_external_changes(self):
+        """Test that files removed outside the cache drop out of the index"""
+        self.cache.save()
+        (self.cache_dir / "tts-v2-file-1.mp3").unlink()
+        os.utime(self.cache_dir, (time.time() + 10, time.time() + 10))
+        
+        reloaded = AudioCache(self.cache_dir)
+        
+        self.assertFalse(reloaded.contains(self.cache_dir / "tts-v2-file-1.mp3"))
+        self.assertEqual(reloaded.entries["tts-v2-file-2.mp3"]["last_access"], 1002)
+    
+    def test_synthesis_enforces_entry_limit(self):
+        """Test that synthesis keeps the cache within its configured limit"""
+        tts = TTSReader(init_client=False)
+        tts.cache_dir = self.cache_dir
+        tts.client = FakeTTSClient()
+        tts.config['cache']['max_entries'] = 3
+        
+        audio_file = tts.synthesize_speech("A brand new short document.")
+        
+        self.assertTrue(audio_file.exists())
+        self.assertEqual(len(tts.cache.entries), 3)
+        self.assertTrue(tts.cache.contains(audio_file))
+
+
+class TestBatchMode(unittest.TestCase):
+    """Test batch synthesis across many markdown files"""
+    
+    def setUp(self):
+        """Create a small tree of markdown files and a fake client"""
+        self.test_dir = tempfile.mkdtemp()
+        self.content_dir = Path(self.test_dir) / "characters"
+        (self.content_dir / "main").mkdir(parents=True)
+        (self.content_dir / "main" / "glove.md").write_text("# Glove\nGlove is serious.")
+        (self.content_dir / "main" / "mitten.md").write_text("# Mitten\nMitten is happy.")
+        (self.content_dir / "main" / "mitten-copy.md").write_text("# Mitten\nMitten is happy.")
+        (self.content_dir / "main" / "notes.txt").write_text("Not markdown")
+        long_text = " ".join(f"Saga sentence number {i} goes here." for i in range(300))
+        (self.content_dir / "saga.md").write_text(long_text)
+        
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir) / "cache"
+        self.tts.cache_dir.mkdir()
+        self.tts.client = FakeTTSClient()
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_discover_directory_and_glob(self):
+        """Test discovering markdown files from a directory or a glob"""
+        from_dir = self.tts.discover_batch_files(str(self.content_dir))
+        from_glob = self.tts.discover_batch_files(str(self.content_dir / "**" / "m*.md"))
+        
+        self.assertEqual([f.name for f in from_dir], ["glove.md", "mitten-copy.md", "mitten.md", "saga.md"])
+        self.assertEqual([f.name for f in from_glob], ["mitten-copy.md", "mitten.md"])
+    
+    def test_batch_deduplicates_identical_documents(self):
+        """Test that identical cleaned texts are synthesized once"""
+        files = self.tts.discover_batch_files(str(self.content_dir / "main"))
+        
+        results = self.tts.synthesize_batch(files)
+        
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(results.values()))
+        self.assertEqual(self.tts.client.calls, 2)
+        mitten_files = [audio for path, audio in results.items() if "mitten" in path]
+        self.assertEqual(mitten_files[0], mitten_files[1])
+    
+    def test_batch_rerun_served_from_cache(self):
+        """Test that a second batch run makes no API calls"""
+        files = self.tts.discover_batch_files(str(self.content_dir))
+        self.tts.synthesize_batch(files)
+        first_run_calls = self.tts.client.calls
+        self.assertGreater(first_run_calls, 3)
+        
+        results = self.tts.synthesize_batch(files)
+        
+        self.assertTrue(all(results.values()))
+        self.assertEqual(self.tts.client.calls, first_run_calls)
+        self.assertEqual(self.tts.stats['document_cache_hits'], 3)
+
+
+def mp3_frame(fill=0, xing=False):
+    """Build one 96-byte MPEG-2 Layer III frame (24 kHz, 32 kbps, mono)"""
+    header = bytes([0xFF, 0xF3, 0x44, 0xC0])
+    if xing:
+        body = bytes(9) + b"Xing" + bytes(96 - 4 - 9 - 4)
+    else:
+        body = bytes([fill]) * (96 - 4)
+    return header + body
+
+
+def id3v2_tag(payload_size=20):
+    """Build an ID3v2.3 tag with a payload of the given size"""
+    return b"ID3" + bytes([3, 0, 0, 0, 0, 0, payload_size]) + bytes(payload_size)
+
+
+class TestAudioConcatenation(unittest.TestCase):
+    """Test pure-Python concatenation of audio chunks"""
+    
+    def setUp(self):
+        """Set up TTSReader with a temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_parse_mp3_frame_header(self):
+        """Test decoding of an MPEG-2 Layer III frame header"""
+        info = markdown_tts.parse_mp3_frame_header(mp3_frame())
+        
+        self.assertEqual(info['sample_rate'], 24000)
+        self.assertEqual(info['bitrate'], 32000)
+        self.assertEqual(info['frame_length'], 96)
+        self.assertIsNone(markdown_tts.parse_mp3_frame_header(b"ID3\x03"))
+    
+    def test_combine_mp3_strips_tags_and_xing(self):
+        """Test that ID3 tags and Xing frames are removed between chunks"""
+        frames = [mp3_frame(1) + mp3_frame(2), mp3_frame(3) * 3]
+        chunk_files = []
+        for i, audio in enumerate(frames):
+            chunk_file = Path(self.test_dir) / f"chunk{i}.mp3"
+            trailer = b"TAG" + bytes(125)
+            chunk_file.write_bytes(id3v2_tag() + mp3_frame(xing=True) + audio + trailer)
+            chunk_files.append(chunk_file)
+        
+        output_file = Path(self.test_dir) / "combined.mp3"
+        result = self.tts.combine_audio_chunks(chunk_files, output_file)
+        
+        self.assertEqual(result, output_file)
+        self.assertEqual(output_file.read_bytes(), b"".join(frames))
+    
+    def test_combine_wav_rewrites_header(self):
+        """Test that WAV chunks share one header with correct sizes"""
+        chunk_files = []
+        for i, frame_count in enumerate([100, 251]):
+            chunk_file = Path(self.test_dir) / f"chunk{i}.wav"
+            with wave.open(str(chunk_file), 'wb') as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(24000)
+                w.writeframes(bytes([i + 1]) * (frame_count * 2))
+            chunk_files.append(chunk_file)
+        
+        output_file = Path(self.test_dir) / "combined.wav"
+        self.tts.combine_audio_chunks(chunk_files, output_file)
+        
+        with wave.open(str(output_file), 'rb') as w:
+            self.assertEqual(w.getframerate(), 24000)
+            self.assertEqual(w.getnframes(), 351)
+            self.assertEqual(w.readframes(351), b"\x01" * 200 + b"\x02" * 502)
+        riff_size = int.from_bytes(output_file.read_bytes()[4:8], 'little')
+        self.assertEqual(riff_size, output_file.stat().st_size - 8)
+    
+    def test_combine_wav_format_mismatch(self):
+        """Test that chunks with different WAV formats are rejected"""
+        chunk_files = []
+        for i, rate in enumerate([24000, 16000]):
+            chunk_file = Path(self.test_dir) / f"chunk{i}.wav"
+            with wave.open(str(chunk_file), 'wb') as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(rate)
+                w.writeframes(bytes(10))
+            chunk_files.append(chunk_file)
+        
+        output_file = Path(self.test_dir) / "combined.wav"
+        
+        self.assertIsNone(self.tts.combine_audio_chunks(chunk_files, output_file))
+        self.assertFalse(output_file.exists())
+
+
+class FakeStreamPlayer:
+    """Stand-in for a player process reading audio from stdin"""
+    
+    class Stdin:
+        def __init__(self, events):
+            self.events = events
+            self.data = bytearray()
+            self.closed = False
+        
+        def write(self, block):
+            self.events.append("play")
+            self.data.extend(block)
+        
+        def flush(self):
+            pass
+        
+        def close(self):
+            self.closed = True
+    
+    def __init__(self, events):
+        self.stdin = self.Stdin(events)
+        self.waited = False
+    
+    def wait(self):
+        self.waited = True
+    
+    def terminate(self):
+        pass
+
+
+class TestStreamingPlayback(unittest.TestCase):
+    """Test progressive playback while chunks are synthesized"""
+    
+    def setUp(self):
+        """Set up TTSReader with a fake client, fake player and temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+        self.tts.config['synthesis']['max_workers'] = 1
+        self.events = []
+        self.player = FakeStreamPlayer(self.events)
+        
+        client = FakeTTSClient(latency=0.01)
+        synthesize = client.synthesize_speech
+        def recording_synthesize(**kwargs):
+            self.events.append("synthesize")
+            return synthesize(**kwargs)
+        client.synthesize_speech = recording_synthesize
+        self.tts.client = client
+        
+        self.text = " ".join(f"Sentence {i} of a long profile." for i in range(400))
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_playback_starts_before_synthesis_finishes(self):
+        """Test the first chunk reaches the player while later chunks are pending"""
+        with patch.object(self.tts, '_open_stream_player', return_value=self.player):
+            self.assertTrue(self.tts.stream_speech(self.text))
+        
+        first_play = self.events.index("play")
+        self.assertIn("synthesize", self.events[first_play:])
+        self.assertIsNotNone(self.tts.time_to_first_audio)
+        self.assertTrue(self.player.stdin.closed)
+        self.assertTrue(self.player.waited)
+    
+    def test_combined_file_cached_after_streaming(self):
+        """Test the streamed audio is also cached as the combined document"""
+        with patch.object(self.tts, '_open_stream_player', return_value=self.player):
+            self.tts.stream_speech(self.text)
+        
+        cache_file = self.tts.get_cache_filename(self.text, self.tts.config['voice']['name'])
+        self.assertEqual(cache_file.read_bytes(), bytes(self.player.stdin.data))
+        self.assertTrue(self.tts.cache.contains(cache_file))
+        
+        # A second read plays the cached document without synthesizing
+        with patch.object(self.tts, 'play_audio', return_value=True) as play_audio:
+            self.assertTrue(self.tts.stream_speech(self.text))
+        play_audio.assert_called_once_with(cache_file)
+        self.assertEqual(self.tts.stats['document_cache_hits'], 1)
+
+
+class TestDialogueScenes(unittest.TestCase):
+    """Test speaker-tagged dialogue voiced with per-character voices"""
+    
+    SCRIPT = """# Scene One
+
+The playground was quiet after the bell.
+
+**Glove:** Mitten, I think we have a *case*!
+**Mitten:** A case? Of static & sparks?
+MITTEN: Count me in,
+whatever it is.
+
+Note: the lights flickered.
+**Glove:** Then let's go.
+"""
+    
+    def setUp(self):
+        """Set up TTSReader with speaker voices, a fake client and temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+        self.tts.config['dialogue']['speaker_voices'] = {
+            "Glove": "en-US-Neural2-D",
+            "Mitten": {"name": "en-GB-Neural2-A", "ssml_gender": "FEMALE"},
+            "Narrator": "en-US-Neural2-J"
+        }
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_parse_dialogue_speakers_and_narration(self):
+        """Test tagged, plain and wrapped lines are attributed to the right speaker"""
+        passages = self.tts.parse_dialogue(self.SCRIPT)
+        
+        self.assertEqual(passages, [
+            (None, "Scene One\n\nThe playground was quiet after the bell."),
+            ("Glove", "Mitten, I think we have a case!"),
+            ("Mitten", "A case? Of static & sparks?"),
+            ("Mitten", "Count me in,\nwhatever it is."),
+            (None, "Note: the lights flickered."),
+            ("Glove", "Then let's go.")
+        ])
+    
+    def test_voice_for_speaker(self):
+        """Test speaker voice lookup, including derived language codes"""
+        mitten = self.tts.voice_for_speaker("MITTEN")
+        self.assertEqual(mitten['name'], "en-GB-Neural2-A")
+        self.assertEqual(mitten['language_code'], "en-GB")
+        self.assertEqual(mitten['ssml_gender'], "FEMALE")
+        
+        self.assertEqual(self.tts.voice_for_speaker(None)['name'], "en-US-Neural2-J")
+        self.assertEqual(self.tts.voice_for_speaker("Zipper"), self.tts.config['voice'])
+    
+    def test_requests_grouped_by_voice_and_escaped(self):
+        """Test consecutive passages in one voice share an SSML request"""
+        requests = self.tts.build_dialogue_requests(self.tts.parse_dialogue(self.SCRIPT))
+        
+        self.assertEqual([voice['name'] for _, voice in requests], [
+            "en-US-Neural2-J", "en-US-Neural2-D", "en-GB-Neural2-A", "en-US-Neural2-J", "en-US-Neural2-D"
+        ])
+        self.assertIn("<p>A case? Of static &amp; sparks?</p><p>Count me in,\nwhatever it is.</p>", requests[2][0])
+        for ssml, _ in requests:
+            self.assertTrue(ssml.startswith("<speak>") and ssml.endswith("</speak>"))
+        
+        long_passages = [("Glove", "Word after word. " * 1000)]
+        for ssml, _ in self.tts.build_dialogue_requests(long_passages, max_bytes=1000):
+            self.assertLessEqual(len(ssml.encode('utf-8')), 1000)
+    
+    def test_synthesize_dialogue_assembles_one_scene(self):
+        """Test the scene is synthesized per voice and cached as one track"""
+        self.tts.client = FakeTTSClient()
+        
+        scene = self.tts.synthesize_dialogue(self.SCRIPT)
+        
+        self.assertTrue(scene.name.startswith("tts-v2-scene-"))
+        self.assertEqual(self.tts.client.calls, 5)
+        self.assertEqual(sorted(set(self.tts.client.voices)), ["en-GB-Neural2-A", "en-US-Neural2-D", "en-US-Neural2-J"])
+        self.assertIn(b"Then let's go.", scene.read_bytes())
+        
+        # The whole scene is reused on the next run
+        self.assertEqual(self.tts.synthesize_dialogue(self.SCRIPT), scene)
+        self.assertEqual(self.tts.client.calls, 5)
+
+
+def import_times(*args):
+    """Run Python with -X importtime, returning top-level module -> cumulative microseconds"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Keep generated indexes out of the working tree's dev/cache
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            capture_output=True, text=True, cwd=REPO_ROOT,
+            env={**os.environ, "TTS_CACHE_DIR": cache_dir}
+        )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$", line)
+        if match and not match.group(2):
+            times[match.group(3)] = int(match.group(1))
+    return result, times
+
+
+class TestStartupTime(unittest.TestCase):
+    """Benchmark: CLI startup avoids the Google Cloud client library"""
+    
+    # Cumulative import time allowed for the script's own imports, in microseconds
+    IMPORT_BUDGET_US = 150_000
+    
+    def test_light_commands_skip_google_import(self):
+        """Test --help, --list-characters and --test-mode never import google.cloud"""
+        for args in (["--help"], ["--list-characters"], ["--test-mode", "--no-editor", "glove"]):
+            result, _ = import_times(SCRIPT_PATH, *args)
+            self.assertEqual(result.returncode, 0, result.stderr[-500:])
+            self.assertNotIn("google.cloud", result.stderr, args)
+    
+    def test_import_budget(self):
+        """Test the script's imports stay within the startup budget"""
+        _, baseline = import_times("-c", "pass")
+        _, script = import_times(SCRIPT_PATH, "--help")
+        
+        own_imports = {name: us for name, us in script.items() if name not in baseline}
+        self.assertLess(sum(own_imports.values()), self.IMPORT_BUDGET_US, own_imports)
+
+
+class TestTTSServer(unittest.TestCase):
+    """Test the resident Unix socket server with a fake TTS client"""
+    
+    def setUp(self):
+        """Start a server on a temporary socket"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+        self.tts.client = FakeTTSClient(latency=0.2)
+        self.socket_path = os.path.join(self.test_dir, "tts.sock")
+        
+        self.server = markdown_tts.TTSServer(self.socket_path, self.tts)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def tearDown(self):
+        """Stop the server and clean up"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.test_dir)
+    
+    def request(self, **request):
+        return markdown_tts.send_server_request(self.socket_path, request, timeout=10)
+    
+    def test_identical_requests_share_one_synthesis(self):
+        """Test concurrent requests for the same text call the API once"""
+        responses = []
+        def call():
+            responses.append(self.request(op="synthesize", text="Glove checks the playground."))
+        
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(self.tts.client.calls, 1)
+        self.assertTrue(all(response["ok"] for response in responses))
+        self.assertEqual(len({response["audio"] for response in responses}), 1)
+        self.assertEqual(sorted(response["shared"] for response in responses), [False, True, True])
+        
+        # Finished requests are served from the cache, not the in-flight table
+        self.assertFalse(self.request(op="synthesize", text="Glove checks the playground.")["shared"])
+        self.assertEqual(self.tts.client.calls, 1)
+        self.assertEqual(self.server.in_flight, {})
+    
+    def test_read_file_and_ping(self):
+        """Test read requests clean the markdown and ping reports stats"""
+        profile = Path(self.test_dir) / "glove.md"
+        profile.write_text("# Glove\n\n**Role**: Security specialist")
+        
+        response = self.request(op="read", input=str(profile), voice="en-US-Neural2-J")
+        self.assertTrue(response["ok"])
+        self.assertEqual(Path(response["audio"]).read_bytes(), b"Glove\n\nRole: Security specialist")
+        self.assertEqual(self.tts.client.voices, ["en-US-Neural2-J"])
+        self.assertEqual(self.tts.config["voice"]["name"], "en-US-Neural2-D")
+        
+        status = self.request(op="ping")
+        self.assertEqual(status["stats"]["api_calls"], 1)
+        self.assertFalse(self.request(op="explode")["ok"])
+    
+    def test_refuses_second_server_on_live_socket(self):
+        """Test a live socket is not taken over by a second server"""
+        with self.assertRaises(RuntimeError):
+            markdown_tts.TTSServer(self.socket_path, self.tts)
+
+
+class TestLocalBackend(unittest.TestCase):
+    """Test the full pipeline offline with the deterministic local backend"""
+    
+    def setUp(self):
+        """Set up TTSReader with the local backend and a temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False, backend=markdown_tts.LocalTTSBackend())
+        self.tts.cache_dir = Path(self.test_dir)
+        self.text = " ".join(f"Sentence {i} of a long profile about Glove." for i in range(300))
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_long_mp3_document_end_to_end(self):
+        """Test chunking, caching and MP3 concatenation without a network"""
+        audio_file = self.tts.synthesize_speech(self.text)
+        
+        self.assertGreater(self.tts.stats['api_calls'], 1)
+        frame = markdown_tts.LocalTTSBackend.MP3_FRAME
+        data = audio_file.read_bytes()
+        self.assertEqual(len(data) % len(frame), 0)
+        self.assertEqual(data[:len(frame)], frame)
+        
+        # Roughly 15 characters per second of 32 kbps audio
+        expected_bytes = len(self.text) / 15 * 4000
+        self.assertAlmostEqual(len(data) / expected_bytes, 1.0, delta=0.05)
+        
+        self.assertEqual(self.tts.synthesize_speech(self.text), audio_file)
+        self.assertEqual(self.tts.stats['document_cache_hits'], 1)
+    
+    def test_long_wav_document_end_to_end(self):
+        """Test LINEAR16 chunks combine into one valid WAV file"""
+        self.tts.config['audio_config']['audio_encoding'] = 'LINEAR16'
+        audio_file = self.tts.synthesize_speech(self.text)
+        
+        with wave.open(str(audio_file), 'rb') as wav:
+            self.assertEqual(wav.getframerate(), 24000)
+            seconds = wav.getnframes() / wav.getframerate()
+        self.assertAlmostEqual(seconds, len(self.text) / 15, delta=2)
+    
+    def test_local_audio_never_shares_google_cache_keys(self):
+        """Test offline audio is cached separately from real speech"""
+        google = TTSReader(init_client=False)
+        self.assertNotEqual(self.tts.get_cache_key("Hello"), google.get_cache_key("Hello"))
+    
+    def test_concurrency_benchmark(self):
+        """Benchmark: parallel workers hide per-request latency"""
+        self.tts.backend.latency = 0.05
+        chunks = [f"Chunk {i} of the benchmark document." for i in range(8)]
+        
+        self.tts.config['synthesis']['max_workers'] = 1
+        serial = timeit.timeit(lambda: self.tts.synthesize_chunks(chunks), number=1)
+        
+        self.tts.cache_dir = Path(self.test_dir) / "parallel"
+        self.tts.cache_dir.mkdir()
+        self.tts.config['synthesis']['max_workers'] = 4
+        parallel = timeit.timeit(lambda: self.tts.synthesize_chunks(chunks), number=1)
+        
+        self.assertLess(parallel, serial / 2)
+
+
+class FakeClock:
+    """Monotonic clock whose sleep() just advances time"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """Test rate limiting, retry classification and quota accounting"""
+    
+    def setUp(self):
+        """Set up a scheduler with a fake clock and a temporary ledger"""
+        self.test_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.ledger = markdown_tts.QuotaLedger(Path(self.test_dir) / "quota-ledger.json")
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def scheduler(self, requests_per_minute=1000, characters_per_minute=150000, max_retries=3):
+        return markdown_tts.RequestScheduler(
+            {"requests_per_minute": requests_per_minute, "characters_per_minute": characters_per_minute},
+            {"max_retries": max_retries, "retry_backoff": 1.0},
+            self.ledger, clock=self.clock, sleep=self.clock.sleep
+        )
+    
+    def test_token_bucket_waits_for_refill(self):
+        """Test a drained bucket blocks for exactly the refill time"""
+        bucket = markdown_tts.TokenBucket(60, 10, clock=self.clock, sleep=self.clock.sleep)
+        
+        self.assertEqual(bucket.acquire(10), 0)
+        self.assertAlmostEqual(bucket.acquire(5), 5.0)
+        self.assertAlmostEqual(self.clock.now, 1005.0)
+    
+    def test_character_quota_never_exceeded(self):
+        """Test paced requests stay under the per-minute character quota at full speed"""
+        scheduler = self.scheduler(characters_per_minute=10000)
+        sent = []
+        for _ in range(40):
+            scheduler.run(lambda: sent.append(self.clock.now), 1000)
+        
+        # No sliding 60-second window carries more than the quota
+        for start in sent:
+            window = [t for t in sent if start <= t < start + 60]
+            self.assertLessEqual(len(window) * 1000, 10000)
+        
+        # ...while running close to the sustainable rate
+        self.assertLess(sent[-1] - sent[0], 40 * 1000 / 9000 * 60)
+        self.assertEqual(self.ledger.month_to_date(), {"characters": 40000, "requests": 40})
+    
+    def test_oversized_requests_pay_full_cost(self):
+        """Test chunks larger than the burst go into debt instead of being undercounted"""
+        scheduler = self.scheduler(characters_per_minute=5000)
+        sent = []
+        for _ in range(12):
+            scheduler.run(lambda: sent.append(self.clock.now), 4500)
+        
+        for start in sent:
+            window = [t for t in sent if start <= t < start + 60]
+            self.assertLessEqual(len(window) * 4500, 5000)
+    
+    def test_quota_below_one_rejected(self):
+        """Test a per-minute limit that cannot refill is a clear error, not a division by zero"""
+        with self.assertRaises(ValueError):
+            self.scheduler(requests_per_minute=0.5)
+        
+        config_file = Path(self.test_dir) / "tts-config.json"
+        config_file.write_text(json.dumps({"quota": {"requests_per_minute": 0}}))
+        with patch('builtins.print') as mock_print, self.assertRaises(SystemExit):
+            TTSReader(str(config_file), init_client=False, validate_voices=False)
+        self.assertIn("quota.requests_per_minute", mock_print.call_args[0][0])
+    
+    def test_scheduler_shared_across_worker_threads(self):
+        """Test concurrent first use builds one scheduler, so workers share one set of buckets"""
+        tts = TTSReader(init_client=False)
+        tts.cache_dir = Path(self.test_dir)
+        original_init = markdown_tts.RequestScheduler.__init__
+        
+        def slow_init(scheduler, *args, **kwargs):
+            time.sleep(0.001)
+            original_init(scheduler, *args, **kwargs)
+        
+        with patch.object(markdown_tts.RequestScheduler, '__init__', slow_init):
+            with markdown_tts.ThreadPoolExecutor(max_workers=8) as executor:
+                schedulers = list(executor.map(lambda _: tts.scheduler, range(32)))
+        self.assertEqual(len({id(scheduler) for scheduler in schedulers}), 1)
+    
+    def test_ledger_merges_concurrent_processes(self):
+        """Test processes recording at once never overwrite each other's counts"""
+        def record():
+            for _ in range(50):
+                self.ledger.record(10)
+            os._exit(0)
+        
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=record) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        
+        self.assertEqual(self.ledger.month_to_date(), {"characters": 2000, "requests": 200})
+    
+    def test_retryable_errors(self):
+        """Test rate limits and server errors are retried but bad requests are not"""
+        class TooManyRequests(Exception):
+            pass
+        
+        is_retryable = markdown_tts.RequestScheduler.is_retryable
+        self.assertTrue(is_retryable(TooManyRequests("Quota exceeded")))
+        self.assertTrue(is_retryable(RuntimeError("503 Service Unavailable")))
+        self.assertTrue(is_retryable(TimeoutError()))
+        self.assertFalse(is_retryable(ValueError("400 Invalid voice name")))
+    
+    def test_backoff_jittered_and_fails_fast(self):
+        """Test retries sleep a jittered exponential delay and bad requests raise at once"""
+        scheduler = self.scheduler(max_retries=3)
+        attempts = []
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 4:
+                raise RuntimeError("429 Too Many Requests")
+            return b"audio"
+        
+        with patch('builtins.print'):
+            self.assertEqual(scheduler.run(flaky, 10, metered=False), b"audio")
+        for attempt, delay in enumerate(self.clock.sleeps):
+            self.assertLessEqual(delay, 2 ** attempt)
+        
+        attempts.clear()
+        def invalid():
+            attempts.append(1)
+            raise ValueError("400 Invalid voice name")
+        with self.assertRaises(ValueError):
+            scheduler.run(invalid, 10)
+        self.assertEqual(len(attempts), 1)
+    
+    def test_ledger_records_only_google_usage(self):
+        """Test the ledger counts API characters but not offline engine output"""
+        tts = TTSReader(init_client=False)
+        tts.cache_dir = Path(self.test_dir)
+        tts.client = FakeTTSClient()
+        tts.synthesize_speech("Glove checks the playground.")
+        
+        offline = TTSReader(init_client=False, backend=markdown_tts.LocalTTSBackend())
+        offline.cache_dir = Path(self.test_dir)
+        offline.synthesize_speech("Mitten checks the lights.")
+        
+        self.assertEqual(self.ledger.month_to_date()["characters"], len("Glove checks the playground."))
+
+
+def write_wav(path, frame_count, sample=0, rate=24000):
+    """Write a mono 16-bit WAV file holding one repeated sample value"""
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(sample.to_bytes(2, 'little', signed=True) * frame_count)
+    return path
+
+
+LOUDNORM_STDERR = """[Parsed_loudnorm_4 @ 0x5581] 
+{
+	"input_i" : "-27.61",
+	"input_tp" : "-9.02",
+	"input_lra" : "3.20",
+	"input_thresh" : "-37.90",
+	"output_i" : "-16.12",
+	"output_tp" : "-1.50",
+	"output_lra" : "2.90",
+	"output_thresh" : "-26.40",
+	"normalization_type" : "dynamic",
+	"target_offset" : "0.12"
+}
+"""
+
+
+class TestAudioPostprocess(unittest.TestCase):
+    """Test inter-chunk pauses and the loudness normalization stage"""
+    
+    def setUp(self):
+        """Set up TTSReader with a temporary cache"""
+        self.test_dir = tempfile.mkdtemp()
+        self.tts = TTSReader(init_client=False)
+        self.tts.cache_dir = Path(self.test_dir)
+        self.ffmpeg_calls = []
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.test_dir)
+    
+    def fake_ffmpeg(self, cmd, **kwargs):
+        """Answer the measuring pass with loudnorm JSON and write output for the second pass"""
+        self.ffmpeg_calls.append(cmd)
+        if cmd[-1] == "-":
+            return subprocess.CompletedProcess(cmd, 0, "", LOUDNORM_STDERR)
+        Path(cmd[-1]).write_bytes(b"normalized")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+    
+    def test_mp3_pause_between_chunks(self):
+        """Test that silent frames matching the chunk format separate MP3 chunks"""
+        self.tts.config["postprocess"]["chunk_pause_ms"] = 48
+        chunk_files = []
+        for i in range(2):
+            chunk_file = Path(self.test_dir) / f"chunk{i}.mp3"
+            chunk_file.write_bytes(mp3_frame(i + 1) * 2)
+            chunk_files.append(chunk_file)
+        
+        output_file = Path(self.test_dir) / "combined.mp3"
+        self.tts.combine_audio_chunks(chunk_files, output_file)
+        
+        # 576 samples per MPEG-2 frame at 24 kHz is 24 ms, so two silent frames
+        self.assertEqual(output_file.read_bytes(), mp3_frame(1) * 2 + mp3_frame(0) * 2 + mp3_frame(2) * 2)
+    
+    def test_wav_pause_between_chunks(self):
+        """Test that WAV chunks are separated by zeroed sample frames"""
+        self.tts.config["postprocess"]["chunk_pause_ms"] = 100
+        chunk_files = [write_wav(Path(self.test_dir) / f"chunk{i}.wav", 50, sample=i + 1) for i in range(2)]
+        
+        output_file = Path(self.test_dir) / "combined.wav"
+        self.tts.combine_audio_chunks(chunk_files, output_file)
+        
+        with wave.open(str(output_file), 'rb') as w:
+            self.assertEqual(w.getnframes(), 50 + 2400 + 50)
+            self.assertEqual(w.readframes(w.getnframes()), b"\x01\x00" * 50 + bytes(4800) + b"\x02\x00" * 50)
+    
+    def test_pause_only_changes_combined_cache_keys(self):
+        """Test that chunk files stay reusable when the pause length changes"""
+        chunk_before = self.tts.get_chunk_cache_filename("Glove waves.")
+        document_before = self.tts.get_cache_filename("Glove waves.", "en-US-Neural2-F")
+        
+        self.tts.config["postprocess"]["chunk_pause_ms"] = 250
+        
+        self.assertEqual(self.tts.get_chunk_cache_filename("Glove waves."), chunk_before)
+        self.assertNotEqual(self.tts.get_cache_filename("Glove waves.", "en-US-Neural2-F"), document_before)
+    
+    def test_normalize_two_passes_then_cache_hit(self):
+        """Test that measurements feed the second pass and repeat runs skip ffmpeg"""
+        audio_file = write_wav(Path(self.test_dir) / "scene.wav", 240, sample=1000)
+        
+        with patch.object(markdown_tts.shutil, 'which', return_value="/usr/bin/ffmpeg"), \
+             patch.object(markdown_tts.subprocess, 'run', side_effect=self.fake_ffmpeg), \
+             patch('builtins.print'):
+            first = self.tts.normalize_audio(audio_file)
+            second = self.tts.normalize_audio(audio_file)
+        
+        self.assertEqual(first, second)
+        self.assertTrue(first.name.startswith("tts-v2-norm-"))
+        self.assertEqual(first.read_bytes(), b"normalized")
+        self.assertEqual(len(self.ffmpeg_calls), 2)
+        
+        measure_filters = self.ffmpeg_calls[0][self.ffmpeg_calls[0].index("-af") + 1]
+        apply_filters = self.ffmpeg_calls[1][self.ffmpeg_calls[1].index("-af") + 1]
+        self.assertIn("silenceremove", measure_filters)
+        self.assertIn("print_format=json", measure_filters)
+        self.assertIn("measured_I=-27.61", apply_filters)
+        self.assertIn("offset=0.12", apply_filters)
+        self.assertIn("24000", self.ffmpeg_calls[1])
+        self.assertEqual(self.tts.stats["normalized"], 1)
+        self.assertEqual(self.tts.stats["normalize_cache_hits"], 1)
+        
+        # Different loudness settings must not reuse the cached result
+        self.tts.config["postprocess"]["target_lufs"] = -23.0
+        self.assertNotEqual(self.tts.get_normalized_cache_filename(audio_file), first)
+    
+    def test_normalize_without_ffmpeg_returns_input(self):
+        """Test that a missing ffmpeg leaves the audio untouched"""
+        audio_file = write_wav(Path(self.test_dir) / "scene.wav", 240)
+        
+        with patch.object(markdown_tts.shutil, 'which', return_value=None), patch('builtins.print'):
+            self.assertEqual(self.tts.normalize_audio(audio_file), audio_file)
+    
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg not installed")
+    def test_normalize_with_ffmpeg(self):
+        """Test a real two-pass normalization of a quiet tone padded with silence"""
+        audio_file = Path(self.test_dir) / "quiet.wav"
+        with wave.open(str(audio_file), 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(24000)
+            tone = [int(800 * ((i % 48) / 24 - 1)) for i in range(24000)]
+            w.writeframes(bytes(24000) + b"".join(v.to_bytes(2, 'little', signed=True) for v in tone) + bytes(24000))
+        
+        with patch('builtins.print'):
+            normalized = self.tts.normalize_audio(audio_file)
+        
+        self.assertNotEqual(normalized, audio_file)
+        with wave.open(str(normalized), 'rb') as w:
+            self.assertEqual(w.getframerate(), 24000)
+            # Leading and trailing silence are trimmed away
+            self.assertLess(w.getnframes(), 36000)
+
+
 class TestTTSIntegration(unittest.TestCase):
     """Test TTS integration points and error handling"""
     
     def setUp(self):
-        """Set up TTSReader without client initialization"""
+        """Set up TTSReader without client initialization, caching in a temporary directory"""
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        cache_root = patch.object(markdown_tts, 'CACHE_ROOT', Path(self.test_dir))
+        cache_root.start()
+        self.addCleanup(cache_root.stop)
         self.tts = TTSReader(init_client=False)
     
     def test_synthesize_speech_without_client(self):
@@ -387,27 +1735,42 @@ class TestTTSIntegration(unittest.TestCase):
         # Should return None when client is not initialized
         self.assertIsNone(result)
     
-    @patch('glob.glob')
-    def test_list_available_characters(self, mock_glob):
-        """Test character listing functionality"""
-        # Mock glob results
-        mock_glob.return_value = [
-            'content/characters/main/glove.md',
-            'content/characters/main/mitten.md',
-            'content/characters/sagas/school-daze/student.md'
-        ]
-        
-        characters = self.tts.list_available_characters()
-        
-        # Should return a list or None - handle both cases
-        if characters is not None:
-            # Should extract character names from file paths
-            self.assertIn('glove', characters)
-            self.assertIn('mitten', characters)
-            self.assertIn('student', characters)
-        else:
-            # If None, that's also acceptable behavior
-            self.assertIsNone(characters)
+    def test_list_available_characters(self):
+        """Test character listing from the persistent index, rebuilt when profiles are added"""
+        original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        self.addCleanup(os.chdir, original_cwd)
+        os.makedirs("dev/config", exist_ok=True)
+        for path in ("content/characters/main/glove.md", "content/characters/main/mitten.md",
+                     "content/characters/sagas/school-daze/student.md"):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            Path(path).write_text("# Profile\n")
+        
+        def listed(tts):
+            with patch('builtins.print') as mock_print:
+                tts.list_available_characters()
+            return [call.args[0] for call in mock_print.call_args_list]
+        
+        def fresh_reader():
+            with patch('builtins.print'):
+                return TTSReader(init_client=False)
+        
+        self.assertEqual(listed(self.tts), [
+            "  glove (content/characters/main/glove.md)",
+            "  mitten (content/characters/main/mitten.md)",
+            "  student (content/characters/sagas/school-daze/student.md)"
+        ])
+        index = json.loads((Path(self.test_dir) / "character-index.json").read_text())
+        self.assertEqual(sorted(c["name"] for c in index["characters"]), ["glove", "mitten", "student"])
+        
+        # A fresh reader reuses the index without walking the profiles again
+        with patch.object(markdown_tts.CharacterIndex, '_build') as build:
+            self.assertEqual(len(listed(fresh_reader())), 3)
+        build.assert_not_called()
+        
+        # A new profile changes its directory, so the next reader rebuilds the index
+        Path("content/characters/main/zipper.md").write_text("# Profile\n")
+        self.assertIn("  zipper (content/characters/main/zipper.md)", listed(fresh_reader()))
     
     def test_read_nonexistent_file(self):
         """Test handling of nonexistent file reading"""
@@ -6,6 +6,14 @@ Tests the critical functionality of chat session parsing, including:
 - JSON parsing and validation
 - Date filtering logic
 - Workspace directory discovery
+- Incremental parsing through the sidecar session index
+- Streaming JSON parsing of large session files
+- Parallel multi-file parsing with a process pool
+- Compiled, early-stopping insight extraction
+- Lazily scanned per-conversation insight candidates and their per-day cache
+- Bundled output of several formats from one parse
+- Date-range backfill that reads each session file once
+- SQLite conversation store with full-text search
 - Error handling and edge cases
 """
 
@@ -17,6 +25,12 @@ from datetime import datetime, timezone, date
 from pathlib import Path
 import sys
 import os
+import re
+import random
+import time
+import io
+from contextlib import ExitStack, contextmanager, redirect_stdout, redirect_stderr
+from unittest.mock import patch
 
 # Add the scripts directory to the path so we can import the module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
@@ -35,10 +49,14 @@ spec = importlib.util.spec_from_file_location("parse_chat_sessions",
 parse_chat_sessions = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(parse_chat_sessions)
 
+# Worker processes unpickle task functions by module name
+sys.modules["parse_chat_sessions"] = parse_chat_sessions
+
 # Extract the functions we want to test (only those that actually exist)
 find_workspace_chat_dir = parse_chat_sessions.find_workspace_chat_dir
 parse_chat_session = parse_chat_sessions.parse_chat_session
 extract_daily_conversations = parse_chat_sessions.extract_daily_conversations
+extract_range_conversations = parse_chat_sessions.extract_range_conversations
 analyze_conversations_for_structure = parse_chat_sessions.analyze_conversations_for_structure
 format_conversations_for_summary = parse_chat_sessions.format_conversations_for_summary
 
@@ -256,32 +274,80 @@ class TestChatSessionParsing(unittest.TestCase):
             Path.home = original_home
     
     def test_large_session_file_performance(self):
-        """Test performance with large session files"""
-        # Create a large session with many requests using numeric timestamps
+        """Benchmark: streaming parse keeps peak memory far below json.load"""
+        # Sessions with tool calls embed large outputs the summaries never use
         base_time = datetime(2025, 8, 8, 10, 30, 0)
+        tool_output = "line of tool output with \"quotes\" and \\backslashes\\\n" * 1000
         large_data = {
+            "version": 3,
             "requests": [
                 {
-                    "message": {"text": f"Question {i}"},
+                    "message": {"text": f"Question {i}", "parts": [{"text": f"Question {i}"}]},
                     "timestamp": int((base_time.replace(minute=30 + i % 30)).timestamp() * 1000),
-                    "response": [{"value": f"Response {i} " * 10}],  # Make responses longer
+                    "response": [
+                        {"value": f"Response {i} " * 10},
+                        {"kind": "toolInvocation", "toolOutput": tool_output}
+                    ],
+                    "result": {"metadata": {"toolCallResults": [tool_output]}},
                     "requestId": f"perf-test-{i:04d}"
                 }
-                for i in range(100)  # 100 requests for reasonable test time
+                for i in range(100)
             ]
         }
         
         session_file = self.create_test_session_file(large_data, "large_session.json")
+        self.assertGreater(session_file.stat().st_size, 10_000_000)
+        
+        def load_whole_file():
+            with open(session_file) as f:
+                return json.load(f)
         
-        # Test that it completes in reasonable time
         import time
+        import tracemalloc
         start_time = time.time()
         conversations = parse_chat_session(session_file, date(2025, 8, 8))
-        end_time = time.time()
+        elapsed = time.time() - start_time
+        
+        tracemalloc.start()
+        load_whole_file()
+        load_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        parse_chat_session(session_file, date(2025, 8, 8))
+        stream_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
         
-        # Should complete in under 1 second for 100 requests
-        self.assertLess(end_time - start_time, 1.0)
         self.assertEqual(len(conversations), 100)
+        self.assertEqual(conversations[99]['copilot_response'], ("Response 99 " * 10).strip())
+        self.assertLess(elapsed, 2.0)
+        # Only a few read blocks are ever held, never the decoded document
+        self.assertLess(stream_peak, load_peak / 5)
+        self.assertLess(stream_peak, 8 * parse_chat_sessions.STREAM_BLOCK_SIZE)
+    
+    def test_streaming_matches_json_load(self):
+        """Test that tiny read blocks still reproduce the decoded fields exactly"""
+        data = {
+            "requesterUsername": "rbilter",
+            "requests": [
+                {
+                    "requestId": "edge-001",
+                    "message": {"text": "Quote \" brace { bracket ] émoji 😀", "parts": [[{"x": "]"}]]},
+                    "variableData": {"variables": [{"value": "\\\"}"}]},
+                    "timestamp": 1754663400000,
+                    "response": [{"value": "Line\nbreak", "kind": None}, "stray", {"value": {"uri": "a.md"}}]
+                }
+            ],
+            "trailing": [1, 2.5e3, True, False, None]
+        }
+        session_file = self.create_test_session_file(data)
+        
+        requests = list(parse_chat_sessions.iter_session_requests(session_file, block_size=3))
+        
+        self.assertEqual(requests, [{
+            "requestId": "edge-001",
+            "message": {"text": "Quote \" brace { bracket ] émoji 😀"},
+            "timestamp": 1754663400000,
+            "response": [{"value": "Line\nbreak"}, {"value": {"uri": "a.md"}}]
+        }])
 
 
 class TestChatSessionIntegration(unittest.TestCase):
@@ -342,6 +408,711 @@ class TestChatSessionIntegration(unittest.TestCase):
         self.assertIn("session 2", conversations2[0]['user_message'])
 
 
+def session_request(text, when, request_id):
+    """Build one VS Code chat request at a local datetime"""
+    return {
+        "message": {"text": text},
+        "timestamp": int(when.timestamp() * 1000),
+        "response": [{"value": f"Answer to {text}"}],
+        "requestId": request_id
+    }
+
+
+class TestSessionIndex(unittest.TestCase):
+    """Test incremental, index-driven extraction of daily conversations"""
+    
+    def setUp(self):
+        """Create an old session and a session from the target day"""
+        self.test_dir = tempfile.mkdtemp()
+        self.chat_dir = Path(self.test_dir) / "chatSessions"
+        self.chat_dir.mkdir(parents=True)
+        self.index_file = Path(self.test_dir) / "cache" / "chat-session-index.json"
+        self.target = date(2025, 8, 8)
+        
+        self.old_session = self.write_session("old.json", [
+            session_request("Old question", datetime(2025, 7, 1, 9, 0), "old-001")
+        ])
+        self.today_session = self.write_session("today.json", [
+            session_request("Yesterday's question", datetime(2025, 8, 7, 23, 30), "today-001"),
+            session_request("Morning question", datetime(2025, 8, 8, 9, 15), "today-002")
+        ])
+    
+    def tearDown(self):
+        """Clean up test fixtures after each test"""
+        shutil.rmtree(self.test_dir)
+    
+    def write_session(self, filename, requests):
+        """Write a session file with the given requests"""
+        session_file = self.chat_dir / filename
+        with open(session_file, 'w') as f:
+            json.dump({"requests": requests}, f)
+        return session_file
+    
+    def extract(self, index_file="default"):
+        """Extract the target day's conversations, recording which files were opened"""
+        opened = []
+        
+        def parse(session_file, target_date=None):
+            opened.append(Path(session_file).name)
+            return parse_chat_session(session_file, target_date)
+        
+        index_file = self.index_file if index_file == "default" else index_file
+        with patch.object(parse_chat_sessions, 'parse_chat_session', side_effect=parse):
+            conversations = extract_daily_conversations(self.target, self.chat_dir, index_file)
+        return conversations, sorted(opened)
+    
+    def test_index_records_timestamp_ranges(self):
+        """Test that the first run indexes every file with per-day counts"""
+        conversations, opened = self.extract()
+        
+        self.assertEqual([c['request_id'] for c in conversations], ["today-002"])
+        self.assertEqual(opened, ["old.json", "today.json"])
+        
+        with open(self.index_file) as f:
+            files = json.load(f)['files']
+        entry = files[str(self.today_session.resolve())]
+        self.assertEqual(entry['day_counts'], {"2025-08-07": 1, "2025-08-08": 1})
+        self.assertEqual(entry['min_ts'], int(datetime(2025, 8, 7, 23, 30).timestamp() * 1000))
+        self.assertEqual(entry['max_ts'], int(datetime(2025, 8, 8, 9, 15).timestamp() * 1000))
+    
+    def test_unchanged_sessions_outside_target_day_not_opened(self):
+        """Test that a second run only opens sessions with requests on the target day"""
+        self.extract()
+        conversations, opened = self.extract()
+        
+        self.assertEqual(opened, ["today.json"])
+        self.assertEqual([c['request_id'] for c in conversations], ["today-002"])
+    
+    def test_changed_and_removed_sessions_refresh_index(self):
+        """Test that modified files are re-parsed and deleted files leave the index"""
+        self.extract()
+        self.write_session("old.json", [
+            session_request("Old question", datetime(2025, 7, 1, 9, 0), "old-001"),
+            session_request("Resumed question", datetime(2025, 8, 8, 16, 0), "old-002")
+        ])
+        self.today_session.unlink()
+        
+        conversations, opened = self.extract()
+        
+        self.assertEqual(opened, ["old.json"])
+        self.assertEqual([c['request_id'] for c in conversations], ["old-002"])
+        with open(self.index_file) as f:
+            files = json.load(f)['files']
+        self.assertEqual(list(files), [str(self.old_session.resolve())])
+    
+    def test_index_matches_full_scan(self):
+        """Test that indexed and unindexed extraction agree"""
+        self.extract()
+        indexed, _ = self.extract()
+        full, opened = self.extract(index_file=None)
+        
+        self.assertEqual(indexed, full)
+        self.assertEqual(opened, ["old.json", "today.json"])
+
+
+class TestParallelParsing(unittest.TestCase):
+    """Test spreading session parsing over worker processes"""
+    
+    def setUp(self):
+        """Create several sessions with interleaved requests"""
+        self.test_dir = tempfile.mkdtemp()
+        self.chat_dir = Path(self.test_dir) / "chatSessions"
+        self.chat_dir.mkdir(parents=True)
+        for n in range(6):
+            requests = [
+                session_request(f"Session {n} question {i}", datetime(2025, 8, 8, 9 + i, n), f"s{n}-{i:03d}")
+                for i in range(5)
+            ]
+            with open(self.chat_dir / f"session{n}.json", 'w') as f:
+                json.dump({"requests": requests}, f)
+    
+    def tearDown(self):
+        """Clean up test fixtures after each test"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_parallel_matches_sequential(self):
+        """Test that a process pool yields the same conversations in the same order"""
+        sequential = extract_daily_conversations(date(2025, 8, 8), self.chat_dir, index_file=None, jobs=1)
+        
+        with patch.object(parse_chat_sessions, 'PARALLEL_MIN_BYTES', 0), \
+             patch.object(parse_chat_sessions, 'ProcessPoolExecutor',
+                          wraps=parse_chat_sessions.ProcessPoolExecutor) as pool:
+            parallel = extract_daily_conversations(date(2025, 8, 8), self.chat_dir, index_file=None, jobs=3)
+        
+        pool.assert_called_once_with(max_workers=3)
+        self.assertEqual(len(sequential), 30)
+        self.assertEqual(parallel, sequential)
+    
+    def test_small_inputs_parse_in_process(self):
+        """Test that small inputs skip the worker pool entirely"""
+        tasks = [(session_file, None) for session_file in sorted(self.chat_dir.glob("*.json"))]
+        
+        with patch.object(parse_chat_sessions, 'ProcessPoolExecutor', side_effect=AssertionError("pool started")):
+            results = parse_chat_sessions.parse_session_files(tasks, jobs=4)
+        
+        self.assertEqual([len(conversations) for conversations in results], [5] * 6)
+        self.assertEqual(results[2][0]['request_id'], "s2-000")
+
+
+def legacy_extract_category(text, rule):
+    """Reference implementation: scan the whole text once per pattern with IGNORECASE"""
+    items = []
+    processed = set()
+    for pattern in rule['patterns']:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            item = re.sub(r'\s+', ' ', match.group(1).strip()).rstrip('.,;:')
+            if (rule['min_length'] <= len(item) <= rule['max_length'] and
+                    item.lower() not in processed and
+                    not (rule['skip_markdown'] and any(a in item for a in ['```', '##', '**', '- [']))):
+                processed.add(item.lower())
+                items.append(f"- {item}")
+    return items[:rule['limit']]
+
+
+def chat_text(lines, seed=0):
+    """Build chat-like text from a vocabulary rich in insight keywords"""
+    rng = random.Random(seed)
+    words = ("the Glove Mitten story character profile we should implement Added fixed error: problem idea: "
+             "could Next decided to script workflow automation vs code copilot folder structure render "
+             "audio test cache index session parse todo: consider approach: İstanbul ```code``` **bold**").split()
+    return "\n".join(
+        ("User: " if i % 2 == 0 else "Assistant: ") +
+        " ".join(rng.choice(words) for _ in range(rng.randint(3, 30))) + rng.choice([".", "?", "!", ""])
+        for i in range(lines)
+    )
+
+
+class CountingPattern:
+    """Compiled insight pattern that counts the matches taken from it"""
+    
+    def __init__(self, pattern, counts, key):
+        self.pattern = pattern
+        self.counts = counts
+        self.key = key
+    
+    def finditer(self, string, *args):
+        self.counts.setdefault(self.key, 0)
+        for match in self.pattern.finditer(string, *args):
+            self.counts[self.key] += 1
+            yield match
+
+
+@contextmanager
+def counted_matches():
+    """Count the matches taken from each insight pattern, keyed by (category, pattern index)"""
+    counts = {}
+    with ExitStack() as stack:
+        for category, rule in parse_chat_sessions.INSIGHT_RULES.items():
+            stack.enter_context(patch.dict(rule, compiled=[
+                CountingPattern(pattern, counts, (category, index)) for index, pattern in enumerate(rule['compiled'])
+            ]))
+        yield counts
+
+
+class TestInsightExtraction(unittest.TestCase):
+    """Test the compiled insight extraction engine"""
+    
+    def test_matches_reference_extraction(self):
+        """Test that early-stopping extraction keeps the original order, dedup and caps"""
+        for seed in range(20):
+            text = chat_text(200, seed)
+            insights = parse_chat_sessions.extract_insights(text)
+            for category, rule in parse_chat_sessions.INSIGHT_RULES.items():
+                self.assertEqual(insights[category], legacy_extract_category(text, rule), (seed, category))
+    
+    def test_sparse_categories_and_notes(self):
+        """Test categories that do not fill their cap and the notable context themes"""
+        text = ("User: We decided to keep the series bible in one folder for now.\n"
+                "Assistant: ERROR: the Git commit seemed to hang after the hook ran.\n"
+                "User: parse-chat-sessions needs a heartbeat for the automation job")
+        
+        insights = analyze_conversations_for_structure([
+            {'user_message': line.split(": ", 1)[1], 'copilot_response': ''} for line in text.split("\n")
+        ])
+        
+        self.assertEqual(insights['decisions_made'], ["- keep the series bible in one folder for now"])
+        self.assertEqual(insights['problems_solved'], ["- the Git commit seemed to hang after the hook ran"])
+        self.assertEqual(insights['notes'], [
+            "- Git commit hanging issue identified and addressed",
+            "- Creative project development and character work",
+            "- Chat session parsing and integration developed",
+            "- Heartbeat logging for automation monitoring implemented"
+        ])
+    
+    def test_large_day_stops_at_caps(self):
+        """Test that a megabyte-sized day matches the reference while each category stops at its cap"""
+        text = chat_text(10000, seed=1)
+        self.assertGreater(len(text), 1_000_000)
+        
+        with counted_matches() as counts:
+            insights = parse_chat_sessions.extract_insights(text)
+        
+        folded = parse_chat_sessions.fold_case(text)
+        for category, rule in parse_chat_sessions.INSIGHT_RULES.items():
+            self.assertEqual(insights[category], legacy_extract_category(text, rule))
+            self.assertEqual(len(insights[category]), rule['limit'])
+            
+            # Every category has thousands of matches; only the first few are taken, and
+            # patterns after the one that filled the cap never run
+            available = sum(1 for pattern in rule['compiled'] for _ in pattern.finditer(folded))
+            taken = [counts.get((category, index)) for index in range(len(rule['compiled']))]
+            self.assertGreater(available, 1000, category)
+            self.assertLessEqual(sum(count or 0 for count in taken), 4 * rule['limit'], category)
+            self.assertIsNone(taken[-1], category)
+
+
+def chat_conversations(count, lines_per_conversation=2, seed=0, day=date(2025, 8, 8), ending="."):
+    """Build conversations from chat_text: one user line, the remaining lines as the response"""
+    lines = [line.split(": ", 1)[1] for line in chat_text(count * lines_per_conversation, seed).split("\n")]
+    return [
+        {
+            'timestamp': datetime.combine(day, datetime.min.time()).replace(hour=9).isoformat(),
+            'user_message': lines[i] + ending,
+            'copilot_response': " ".join(lines[i + 1:i + lines_per_conversation]) + ending,
+            'request_id': f"{day.isoformat()}-{i:04d}"
+        }
+        for i in range(0, len(lines), lines_per_conversation)
+    ]
+
+
+def day_text(conversations):
+    """The day's combined text, as analyzed without the cache"""
+    return "\n".join(parse_chat_sessions.conversation_text(conv) for conv in conversations)
+
+
+class TestInsightCache(unittest.TestCase):
+    """Test lazily scanned per-conversation insight candidates and their per-day cache"""
+    
+    def setUp(self):
+        """Build a day of conversations from keyword-rich text"""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = Path(self.test_dir) / "cache" / "chat-insights"
+        self.conversations = chat_conversations(200, seed=3)
+    
+    def tearDown(self):
+        """Clean up test fixtures after each test"""
+        shutil.rmtree(self.test_dir)
+    
+    def analyze(self, conversations=None):
+        """Analyze with the cache, recording which conversations had to be scanned"""
+        scanned = []
+        fold = parse_chat_sessions.ConversationCandidates.fold
+        
+        def record(candidates):
+            if candidates.folded is None:
+                scanned.append(candidates.conv['request_id'])
+            return fold(candidates)
+        
+        with patch.object(parse_chat_sessions.ConversationCandidates, 'fold', record):
+            insights = analyze_conversations_for_structure(conversations or self.conversations, self.cache_dir)
+        return insights, scanned
+    
+    def test_merged_candidates_match_whole_day_extraction(self):
+        """Test that cold, warm and uncached analysis all match the day-level insights"""
+        # Also without closing punctuation, so captures run to the end of each conversation
+        for ending in (".", ""):
+            with self.subTest(ending=ending):
+                conversations = chat_conversations(200, seed=3, ending=ending)
+                expected = parse_chat_sessions.extract_insights(day_text(conversations))
+                
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+                self.assertEqual(analyze_conversations_for_structure(conversations), expected)
+                self.assertEqual(self.analyze(conversations)[0], expected)
+                self.assertEqual(self.analyze(conversations)[0], expected)
+    
+    def test_reruns_only_scan_new_or_edited_conversations(self):
+        """Test that cached candidates are reused and edits invalidate only their entry"""
+        first, scanned = self.analyze()
+        self.assertTrue(scanned)
+        
+        second, scanned = self.analyze()
+        self.assertEqual(second, first)
+        self.assertEqual(scanned, [])
+        
+        self.conversations[5]['copilot_response'] = "We decided to render every profile with the narrator voice."
+        self.conversations.append({
+            'timestamp': datetime(2025, 8, 8, 23, 0).isoformat(),
+            'user_message': "Next we should publish the rendered audio to the drive.",
+            'copilot_response': "",
+            'request_id': "day-late"
+        })
+        third, scanned = self.analyze()
+        
+        # The conversation before an edit is rescanned across its new seam; other unchanged
+        # conversations are only scanned further if the edit moved a cap past them
+        self.assertEqual(scanned[:2], ["2025-08-08-0008", "2025-08-08-0010"])
+        self.assertIn("day-late", scanned)
+        self.assertLess(len(scanned), 10)
+        self.assertEqual(third, analyze_conversations_for_structure(self.conversations))
+    
+    def test_rule_changes_invalidate_cache(self):
+        """Test that candidates cached under different rules are discarded"""
+        _, cold = self.analyze()
+        
+        with patch.object(parse_chat_sessions, 'INSIGHT_RULES_VERSION', "changed"):
+            _, scanned = self.analyze()
+        
+        self.assertEqual(scanned, cold)
+    
+    def test_trailing_unpunctuated_final_line(self):
+        """Test that only the day's last line is captured without closing punctuation, as at baseline"""
+        conversations = [
+            {'timestamp': datetime(2025, 8, 8, 9, 0).isoformat(), 'copilot_response': '', 'request_id': 'tail-001',
+             'user_message': "We implemented the chapter audio pipeline for every episode"},
+            {'timestamp': datetime(2025, 8, 8, 10, 0).isoformat(), 'copilot_response': '', 'request_id': 'tail-002',
+             'user_message': "Then we decided to keep the narrator voice for every chapter"}
+        ]
+        
+        def reference(conversations):
+            text = day_text(conversations)
+            return {category: legacy_extract_category(text, rule)
+                    for category, rule in parse_chat_sessions.INSIGHT_RULES.items()}
+        
+        expected = reference(conversations)
+        self.assertEqual(expected['decisions_made'], ["- keep the narrator voice for every chapter"])
+        self.assertEqual(expected['tasks_worked_on'], [])
+        for insights in (analyze_conversations_for_structure(conversations),
+                         self.analyze(conversations)[0], self.analyze(conversations)[0]):
+            self.assertEqual({category: insights[category] for category in expected}, expected)
+        
+        # Once another conversation follows, the cached line no longer ends the day; the first
+        # conversation is rescanned too, as a match from it could run as far as that end
+        conversations.append({'timestamp': datetime(2025, 8, 8, 11, 0).isoformat(), 'copilot_response': '',
+                              'request_id': 'tail-003', 'user_message': "Thanks."})
+        insights, scanned = self.analyze(conversations)
+        self.assertEqual(scanned, ['tail-001', 'tail-002', 'tail-003'])
+        self.assertEqual(insights['decisions_made'], reference(conversations)['decisions_made'])
+        self.assertEqual(insights['decisions_made'], [])
+    
+    def test_matches_across_conversation_boundaries(self):
+        """Test that a keyword ending one conversation captures the start of the next, as at baseline"""
+        conversations = [
+            {'timestamp': datetime(2025, 8, 8, 9, 0).isoformat(), 'request_id': 'seam-001',
+             'user_message': "The build keeps failing", 'copilot_response': "I found the problem."},
+            {'timestamp': datetime(2025, 8, 8, 10, 0).isoformat(), 'request_id': 'seam-002',
+             'user_message': "Great, now update the character index for Mitten", 'copilot_response': "Done."}
+        ]
+        text = day_text(conversations)
+        expected = {category: legacy_extract_category(text, rule)
+                    for category, rule in parse_chat_sessions.INSIGHT_RULES.items()}
+        self.assertEqual(expected['problems_solved'], ["- User: Great, now update the character index for Mitten"])
+        
+        runs = [analyze_conversations_for_structure(conversations), self.analyze(conversations)[0],
+                self.analyze(conversations)[0]]
+        
+        # Inserting a conversation moves both seams: the first conversation now runs into the
+        # new one, and the match that ran into the second no longer does
+        conversations.insert(1, {'timestamp': datetime(2025, 8, 8, 9, 30).isoformat(), 'request_id': 'seam-003',
+                                 'user_message': "Is the bug fixed", 'copilot_response': "Fixed"})
+        insights, scanned = self.analyze(conversations)
+        self.assertEqual(scanned, ['seam-001', 'seam-003', 'seam-002'])
+        self.assertEqual(insights, parse_chat_sessions.extract_insights(day_text(conversations)))
+        
+        for insights in runs:
+            self.assertEqual({category: insights[category] for category in expected}, expected)
+    
+    def test_cache_sharded_by_day_and_pruned(self):
+        """Test one capped file per day that drops vanished conversations and is rewritten only on change"""
+        conversations = self.conversations[:100] + chat_conversations(100, seed=4, day=date(2025, 8, 9))
+        self.analyze(conversations)
+        self.assertEqual(sorted(p.name for p in self.cache_dir.iterdir()), ["2025-08-08.json", "2025-08-09.json"])
+        
+        with patch.object(parse_chat_sessions, 'write_json_atomic') as write:
+            self.analyze(conversations)
+        write.assert_not_called()
+        
+        del conversations[3]
+        self.analyze(conversations)
+        entries = parse_chat_sessions.load_insight_cache(self.cache_dir, "2025-08-08")
+        self.assertEqual(sorted(entries), sorted(c['request_id'] for c in conversations[:99]))
+        
+        for entry in entries.values():
+            for (category, rule), patterns in zip(parse_chat_sessions.INSIGHT_RULES.items(), entry['categories']):
+                self.assertLessEqual(sum(len(items) for items, _, _ in patterns), rule['limit'], category)
+    
+    def test_cold_and_uncached_runs_scan_no_more_than_whole_day_engine(self):
+        """Test that a megabyte-sized day takes about the matches of one extract_insights pass
+        when analyzed cold or without the cache, and none once the cache is warm"""
+        conversations = chat_conversations(200, lines_per_conversation=50, seed=1)
+        text = day_text(conversations)
+        self.assertGreater(len(text), 1_000_000)
+        
+        with counted_matches() as engine:
+            expected = parse_chat_sessions.extract_insights(text)
+        with counted_matches() as uncached, \
+                patch.object(parse_chat_sessions, 'ConversationCandidates') as candidates:
+            self.assertEqual(analyze_conversations_for_structure(conversations), expected)
+        candidates.assert_not_called()
+        self.assertEqual(uncached, engine)
+        
+        # Cold scans stop with the conversation that fills each cap, taking at most the rest
+        # of that conversation's matches beyond what the whole-day pass takes
+        with counted_matches() as cold:
+            insights, _ = self.analyze(conversations)
+        self.assertEqual(insights, expected)
+        self.assertEqual(cold.keys(), engine.keys())
+        self.assertLessEqual(sum(cold.values()), 2 * sum(engine.values()))
+        
+        with counted_matches() as warm:
+            insights, scanned = self.analyze(conversations)
+        self.assertEqual(insights, expected)
+        self.assertEqual((scanned, warm), ([], {}))
+        
+        # Only capped candidates are kept, a small fraction of the day's text
+        cache_size = sum(p.stat().st_size for p in self.cache_dir.iterdir())
+        self.assertLess(cache_size, len(text) / 20)
+
+
+class TestBundleOutput(unittest.TestCase):
+    """Test --format bundle, which renders several outputs from one parse"""
+    
+    def setUp(self):
+        """Prepare conversations returned in place of a real chat directory"""
+        self.conversations = [
+            {
+                'timestamp': datetime(2025, 8, 8, 10, 30).isoformat(),
+                'user_message': 'We decided to keep every episode script in one folder.',
+                'copilot_response': 'Sounds good, the folder structure stays simple.',
+                'request_id': 'bundle-001'
+            }
+        ]
+    
+    def run_main(self, *argv):
+        """Run the CLI with stubbed conversations, returning stdout and the extraction calls"""
+        stdout = io.StringIO()
+        with patch.object(sys, 'argv', ['parse-chat-sessions.py', *argv]), \
+             patch.object(parse_chat_sessions, 'extract_daily_conversations',
+                          return_value=self.conversations) as extract, \
+             redirect_stdout(stdout):
+            parse_chat_sessions.main()
+        return stdout.getvalue(), extract
+    
+    def test_bundle_sections_from_one_parse(self):
+        """Test that every requested section comes from a single extraction"""
+        output, extract = self.run_main('--date', '2025-08-08', '--format', 'bundle',
+                                        '--sections', 'summary,insights,json', '--no-cache')
+        bundle = json.loads(output)
+        
+        extract.assert_called_once()
+        self.assertEqual(bundle['date'], '2025-08-08')
+        self.assertEqual(bundle['summary'], format_conversations_for_summary(self.conversations))
+        self.assertEqual(bundle['insights'], analyze_conversations_for_structure(self.conversations))
+        self.assertEqual(bundle['json'], self.conversations)
+    
+    def test_single_formats_unchanged(self):
+        """Test that --format insights prints the same data as the bundle section"""
+        insights, _ = self.run_main('--date', '2025-08-08', '--format', 'insights', '--no-cache')
+        bundle, _ = self.run_main('--date', '2025-08-08', '--format', 'bundle', '--no-cache')
+        
+        self.assertEqual(json.loads(insights), json.loads(bundle)['insights'])
+        self.assertNotIn('json', json.loads(bundle))
+    
+    def test_unknown_section_rejected(self):
+        """Test that a misspelled section name fails before parsing"""
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self.run_main('--format', 'bundle', '--sections', 'summary,insight')
+
+
+
+class TestDateRange(unittest.TestCase):
+    """Test --from/--to range extraction and session file backfill"""
+    
+    def setUp(self):
+        """Create sessions spanning several days around the range"""
+        self.test_dir = tempfile.mkdtemp()
+        self.chat_dir = Path(self.test_dir) / "chatSessions"
+        self.chat_dir.mkdir(parents=True)
+        self.index_file = Path(self.test_dir) / "cache" / "chat-session-index.json"
+        self.output_dir = Path(self.test_dir) / "conversation-summaries"
+        self.start, self.end = date(2025, 8, 7), date(2025, 8, 9)
+        
+        sessions = {
+            "old.json": [session_request("Old question", datetime(2025, 7, 1, 9, 0), "old-001")],
+            "week.json": [
+                session_request("Before the range", datetime(2025, 8, 6, 22, 0), "week-001"),
+                session_request("We decided to keep one folder per episode.", datetime(2025, 8, 7, 23, 30), "week-002"),
+                session_request("Fixed the broken audio chunking.", datetime(2025, 8, 9, 8, 0), "week-003")
+            ],
+            "late.json": [session_request("Late question", datetime(2025, 8, 9, 7, 0), "late-001")]
+        }
+        for filename, requests in sessions.items():
+            with open(self.chat_dir / filename, 'w') as f:
+                json.dump({"requests": requests}, f)
+    
+    def tearDown(self):
+        """Clean up test fixtures after each test"""
+        shutil.rmtree(self.test_dir)
+    
+    def extract(self):
+        """Extract the range, recording which files were opened"""
+        opened = []
+        
+        def parse(session_file, target_date=None):
+            opened.append(Path(session_file).name)
+            return parse_chat_session(session_file, target_date)
+        
+        with patch.object(parse_chat_sessions, 'parse_chat_session', side_effect=parse):
+            days = extract_range_conversations(self.start, self.end, self.chat_dir, self.index_file)
+        return days, opened
+    
+    def test_range_matches_daily_extraction(self):
+        """Test that one range pass buckets requests the same as per-day runs"""
+        days, opened = self.extract()
+        
+        self.assertEqual(sorted(opened), ["late.json", "old.json", "week.json"])
+        self.assertEqual(list(days), [date(2025, 8, 7), date(2025, 8, 8), date(2025, 8, 9)])
+        for day, conversations in days.items():
+            self.assertEqual(conversations, extract_daily_conversations(day, self.chat_dir, None))
+        self.assertEqual([c['request_id'] for c in days[date(2025, 8, 9)]], ["late-001", "week-003"])
+        
+        # Indexed files outside the range are skipped, the rest opened once
+        days_again, opened = self.extract()
+        self.assertEqual(sorted(opened), ["late.json", "week.json"])
+        self.assertEqual(days_again, days)
+    
+    def test_backfill_writes_monthly_session_files(self):
+        """Test that --output-dir writes one session file per active day and keeps existing ones"""
+        existing = self.output_dir / "2025-08" / "2025-08-09-session.md"
+        existing.parent.mkdir(parents=True)
+        existing.write_text("manual notes")
+        
+        argv = ['parse-chat-sessions.py', '--from', '2025-08-07', '--to', '2025-08-09',
+                '--output-dir', str(self.output_dir), '--no-index', '--no-cache']
+        with patch.object(sys, 'argv', argv), \
+             patch.object(parse_chat_sessions, 'find_workspace_chat_dir', return_value=self.chat_dir), \
+             redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            parse_chat_sessions.main()
+        
+        self.assertEqual(sorted(p.name for p in (self.output_dir / "2025-08").iterdir()),
+                         ["2025-08-07-session.md", "2025-08-09-session.md"])
+        self.assertEqual(existing.read_text(), "manual notes")
+        
+        document = (self.output_dir / "2025-08" / "2025-08-07-session.md").read_text()
+        self.assertIn("# Session Summary - 2025-08-07", document)
+        self.assertIn("We decided to keep one folder per episode.", document)
+        self.assertIn("- *Add problems encountered and how they were resolved*", document)
+        self.assertIn("### 💬 Chat Conversations (1 exchanges)", document)
+        
+        with patch.object(sys, 'argv', argv + ['--overwrite']), \
+             patch.object(parse_chat_sessions, 'find_workspace_chat_dir', return_value=self.chat_dir), \
+             redirect_stdout(io.StringIO()):
+            parse_chat_sessions.main()
+        self.assertIn("Late question", existing.read_text())
+    
+    def test_range_json_output_keyed_by_date(self):
+        """Test that a range without --output-dir prints each day's output by date"""
+        stdout = io.StringIO()
+        argv = ['parse-chat-sessions.py', '--from', '2025-08-07', '--to', '2025-08-08',
+                '--format', 'bundle', '--sections', 'json', '--no-index', '--no-cache']
+        with patch.object(sys, 'argv', argv), \
+             patch.object(parse_chat_sessions, 'find_workspace_chat_dir', return_value=self.chat_dir), \
+             redirect_stdout(stdout):
+            parse_chat_sessions.main()
+        
+        days = json.loads(stdout.getvalue())
+        self.assertEqual(list(days), ["2025-08-07", "2025-08-08"])
+        self.assertEqual([c['request_id'] for c in days["2025-08-07"]['json']], ["week-002"])
+        self.assertEqual(days["2025-08-08"]['json'], [])
+    
+    def test_invalid_range_rejected(self):
+        """Test that a reversed range or --date with --from fails before parsing"""
+        for argv in (['--from', '2025-08-09', '--to', '2025-08-07'],
+                     ['--date', '2025-08-08', '--from', '2025-08-07']):
+            with patch.object(sys, 'argv', ['parse-chat-sessions.py', *argv]), \
+                 redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                parse_chat_sessions.main()
+
+
+class TestChatStore(unittest.TestCase):
+    """Test the append-only conversation store and its queries"""
+    
+    def setUp(self):
+        """Create two sessions and an empty store"""
+        self.test_dir = tempfile.mkdtemp()
+        self.chat_dir = Path(self.test_dir) / "chatSessions"
+        self.chat_dir.mkdir(parents=True)
+        self.store_file = Path(self.test_dir) / "cache" / "chat-history.db"
+        
+        self.write_session("first.json", [
+            session_request("How should the loudness normalization work?", datetime(2025, 8, 7, 9, 0), "first-001"),
+            session_request("Let's cache the character index", datetime(2025, 8, 8, 10, 0), "first-002")
+        ])
+        self.write_session("second.json", [
+            session_request("Normalization clips on loud chapters", datetime(2025, 8, 8, 14, 0), "second-001")
+        ])
+        self.conn = parse_chat_sessions.open_chat_store(self.store_file)
+    
+    def tearDown(self):
+        """Clean up test fixtures after each test"""
+        self.conn.close()
+        shutil.rmtree(self.test_dir)
+    
+    def write_session(self, filename, requests):
+        """Write a session file with the given requests"""
+        with open(self.chat_dir / filename, 'w') as f:
+            json.dump({"requests": requests}, f)
+    
+    def test_ingest_only_parses_new_or_changed_files(self):
+        """Test that re-ingesting skips unchanged files and keeps one row per request"""
+        self.assertEqual(parse_chat_sessions.ingest_sessions(self.conn, self.chat_dir), (2, 3))
+        self.assertEqual(parse_chat_sessions.ingest_sessions(self.conn, self.chat_dir), (0, 0))
+        
+        self.write_session("second.json", [
+            session_request("Normalization clips on loud chapters, even at -16 LUFS",
+                            datetime(2025, 8, 8, 14, 0), "second-001"),
+            session_request("Add a limiter", datetime(2025, 8, 9, 8, 0), "second-002")
+        ])
+        (self.chat_dir / "first.json").unlink()
+        self.assertEqual(parse_chat_sessions.ingest_sessions(self.conn, self.chat_dir), (1, 2))
+        
+        # Pruned session files stay in the store; edited requests replace their row
+        stats = parse_chat_sessions.store_stats(self.conn)
+        self.assertEqual(stats['conversations'], 4)
+        self.assertEqual(stats['session_files'], 2)
+        self.assertEqual(len(parse_chat_sessions.search_conversations(self.conn, 'LUFS')), 1)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM conversations_fts").fetchone()[0], 4)
+    
+    def test_queries_match_session_files(self):
+        """Test that search and day counts agree with parsing the raw sessions"""
+        parse_chat_sessions.ingest_sessions(self.conn, self.chat_dir)
+        
+        days = extract_range_conversations(date(2025, 8, 7), date(2025, 8, 8), self.chat_dir, None)
+        self.assertEqual(parse_chat_sessions.store_day_counts(self.conn),
+                         {day.isoformat(): len(conversations) for day, conversations in days.items()})
+        self.assertEqual(parse_chat_sessions.store_day_counts(self.conn, start_date=date(2025, 8, 8)),
+                         {"2025-08-08": 2})
+        
+        results = parse_chat_sessions.search_conversations(self.conn, 'normalization')
+        self.assertEqual(sorted(r['request_id'] for r in results), ["first-001", "second-001"])
+        self.assertIn('**', results[0]['snippet'])
+        self.assertEqual(parse_chat_sessions.search_conversations(self.conn, 'normal*', limit=1)[0]['session_file'],
+                         results[0]['session_file'])
+    
+    def test_timezone_change_rebuilds_store(self):
+        """Test that a store written under another timezone is rebuilt on open"""
+        parse_chat_sessions.ingest_sessions(self.conn, self.chat_dir)
+        self.conn.close()
+        
+        with patch.object(parse_chat_sessions, 'local_timezone_name', return_value='XYZ+0'):
+            self.conn = parse_chat_sessions.open_chat_store(self.store_file)
+        self.assertEqual(parse_chat_sessions.store_stats(self.conn)['conversations'], 0)
+    
+    def test_cli_search_and_invalid_query(self):
+        """Test that --search ingests first and rejects malformed FTS queries"""
+        def run(*argv):
+            stdout = io.StringIO()
+            with patch.object(sys, 'argv', ['parse-chat-sessions.py', *argv]), \
+                 patch.object(parse_chat_sessions, 'CHAT_STORE_FILE', self.store_file), \
+                 patch.object(parse_chat_sessions, 'find_workspace_chat_dir', return_value=self.chat_dir), \
+                 redirect_stdout(stdout):
+                parse_chat_sessions.main()
+            return stdout.getvalue()
+        
+        self.assertEqual([r['request_id'] for r in json.loads(run('--search', 'character'))], ["first-002"])
+        self.assertEqual(json.loads(run('--day-counts', '--from', '2025-08-08')), {"2025-08-08": 2})
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            run('--search', 'normalization AND')
+
 if __name__ == '__main__':
     # Run the tests
     unittest.main(verbosity=2)